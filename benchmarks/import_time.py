@@ -0,0 +1,122 @@
+"""
+Import-time regression benchmark for the nfcore-validator CLI
+
+Runs "<subcommand> --help" for every subcommand in a fresh interpreter with
+"python -X importtime" and checks that:
+
+- the time spent importing nfcore_validator (including everything it pulls
+  in) stays within the subcommand's budget, and
+- none of the heavy dependencies (LangChain, OpenAI, FAISS, NumPy,
+  BeautifulSoup) is imported before a command actually runs.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--scale 2.0]
+
+Exits with status 1 if any subcommand is over budget or imports a heavy
+dependency.
+"""
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Optional, Set, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import-time budget of the --help path per subcommand, in milliseconds;
+# "" is the top-level "nfcore-validator --help"
+BUDGETS_MS: Dict[str, float] = {
+    "": 150,
+    "harvest": 150,
+    "validate": 150,
+    "validate-batch": 150,
+    "build-catalog": 150,
+    "convert-store": 150,
+    "build-packs": 150,
+    "index-report": 150,
+    "chat": 150
+}
+
+# Top-level packages that must only be imported by the commands that use them
+HEAVY_MODULES = ["langchain", "openai", "faiss", "numpy", "bs4", "tiktoken"]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(subcommand: str) -> Tuple[float, Set[str]]:
+    """Run one subcommand's --help with -X importtime
+
+    Args:
+        subcommand: Subcommand name, or "" for the top-level help
+
+    Returns:
+        Tuple of (milliseconds spent importing nfcore_validator, names of
+        all imported top-level packages)
+    """
+    argv = [subcommand, "--help"] if subcommand else ["--help"]
+    code = f"import sys; from nfcore_validator.cli.main import main; sys.exit(main({argv!r}))"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"'{' '.join(argv)}' failed:\n{proc.stderr[-2000:]}")
+
+    total_us = 0
+    packages = set()
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        packages.add(name.split(".", 1)[0])
+        # Top-level entries (one space of indent) include all their imports
+        if len(indent) == 1 and name.startswith("nfcore_validator"):
+            total_us += cumulative
+    return total_us / 1000, packages
+
+
+def run(runs: int = 5, scale: float = 1.0, subcommands: Optional[List[str]] = None) -> bool:
+    """Benchmark the subcommands and print a table
+
+    Args:
+        runs: Interpreter runs per subcommand; the median is reported
+        scale: Factor applied to every budget, e.g. for slow CI machines
+        subcommands: Subcommands to benchmark (defaults to all of BUDGETS_MS)
+
+    Returns:
+        True if every subcommand is within budget and imports nothing heavy
+    """
+    ok = True
+    print(f"{'Subcommand':<16} {'Import (ms)':>12} {'Budget (ms)':>12}  Heavy imports")
+    for subcommand in subcommands if subcommands is not None else list(BUDGETS_MS):
+        timings = []
+        heavy = set()
+        for _ in range(runs):
+            milliseconds, packages = measure(subcommand)
+            timings.append(milliseconds)
+            heavy |= packages & set(HEAVY_MODULES)
+        median = statistics.median(timings)
+        budget = BUDGETS_MS.get(subcommand, BUDGETS_MS[""]) * scale
+        passed = median <= budget and not heavy
+        ok = ok and passed
+        print(f"{subcommand or '(none)':<16} {median:>12.1f} {budget:>12.0f}  "
+              f"{', '.join(sorted(heavy)) or '-'}{'' if passed else '  FAIL'}")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time regression benchmark for the nfcore-validator CLI")
+    parser.add_argument("subcommands", nargs="*", help="Subcommands to benchmark (defaults to all)")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter runs per subcommand (default: 5)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Factor applied to every budget (default: 1.0)")
+    args = parser.parse_args(argv)
+
+    return 0 if run(args.runs, args.scale, args.subcommands or None) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
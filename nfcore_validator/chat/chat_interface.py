@@ -6,32 +6,50 @@ from typing import List, Dict, Any, Optional
 
 from langchain.chat_models import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.vectorstores import FAISS
+
+from ..vectorstore.embeddings import is_local_backend
+from ..vectorstore.loader import load_vectorstore, store_embeddings
+from ..vectorstore.retrieval import GuidelineRetriever
+from ..utils.rate_limiter import RateLimitScheduler, get_scheduler
 
 class NfCoreDocChat:
     """Chat interface for querying nf-core documentation"""
     
-    def __init__(self, vectorstore_path: str = "nfcore_vectorstore", openai_api_key: str = None):
+    def __init__(self, vectorstore_path: str = "nfcore_vectorstore", openai_api_key: str = None,
+                 scheduler: Optional[RateLimitScheduler] = None, retrieval_mode: str = "vector"):
         """Initialize the chat interface
         
         Args:
             vectorstore_path: Path to the vector store with nf-core documentation
             openai_api_key: OpenAI API key for LLM and embeddings
+            scheduler: Scheduler for LLM calls (defaults to the shared "chat" scheduler)
+            retrieval_mode: How documentation is retrieved: "lexical" (BM25,
+                no query embedding), "vector" or "hybrid"
         """
         self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
         
         if not self.openai_api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it directly.")
             
+        self.scheduler = scheduler or get_scheduler("chat")
+        self.embedding_scheduler = get_scheduler("embeddings")
+        
+        # Retries are handled by the shared scheduler
         self.llm = ChatOpenAI(
             temperature=0, 
             model="gpt-4",
-            openai_api_key=self.openai_api_key
+            openai_api_key=self.openai_api_key,
+            max_retries=1
         )
         
-        self.embeddings = OpenAIEmbeddings(openai_api_key=self.openai_api_key)
-        self.vectorstore = FAISS.load_local(vectorstore_path, self.embeddings)
+        self.embeddings = store_embeddings(vectorstore_path, self.openai_api_key)
+        self.vectorstore = load_vectorstore(vectorstore_path, self.embeddings)
+        self.retriever = GuidelineRetriever(
+            self.vectorstore,
+            retrieval_mode,
+            embeddings=self.embeddings,
+            scheduler=None if is_local_backend(self.embeddings) else self.embedding_scheduler
+        )
         
         self.system_prompt = """You are an expert on nf-core pipeline guidelines and best practices. 
 Your task is to answer questions about nf-core documentation, guidelines, and requirements.
@@ -52,7 +70,7 @@ Include specific references to the documentation when possible."""
             Dictionary with answer and sources
         """
         # Retrieve relevant documents
-        docs = self.vectorstore.similarity_search(question, k=k)
+        docs = self.retriever.search(question, k)
         
         # Categorize sources by documentation section
         categorized_docs = self._categorize_sources(docs)
@@ -88,7 +106,11 @@ Include specific references to the documentation when possible."""
         messages.append(HumanMessage(content=query_with_context))
         
         # Get response
-        response = self.llm(messages)
+        response = self.scheduler.run(
+            self.llm,
+            messages,
+            prompt_text="\n".join(m.content for m in messages)
+        )
         
         # Update chat history
         self.chat_history.append(HumanMessage(content=question))
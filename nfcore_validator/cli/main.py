@@ -6,10 +6,14 @@ import sys
 import argparse
 from typing import List, Optional
 
-from ..harvester.docs_harvester import NfCoreDocsHarvester
-from ..scanner.pipeline_scanner import PipelineScanner
-from ..utils.report_generator import ReportGenerator
-from ..chat.chat_interface import NfCoreDocChat
+# Only modules without heavy dependencies are imported here, so --help and
+# argument errors are fast; each command imports what it needs (LangChain,
+# OpenAI, FAISS, BeautifulSoup) when it runs
+from ..scanner.checkpoint import FSYNC_POLICIES
+from ..validator.result_cache import DEFAULT_CACHE_DIR
+from ..validator.module_catalog import DEFAULT_CATALOG_PATH
+from ..utils.rate_limiter import configure_scheduler
+from ..vectorstore.options import EMBEDDING_BACKENDS, INDEX_TYPES, RETRIEVAL_MODES
 
 
 def harvest_command(args: argparse.Namespace) -> None:
@@ -18,8 +22,21 @@ def harvest_command(args: argparse.Namespace) -> None:
     Args:
         args: Command line arguments
     """
-    harvester = NfCoreDocsHarvester(openai_api_key=args.api_key)
-    harvester.harvest(vectorstore_path=args.output)
+    from ..harvester.docs_harvester import NfCoreDocsHarvester
+    
+    harvester = NfCoreDocsHarvester(
+        openai_api_key=args.api_key,
+        max_workers=args.max_workers,
+        embedding_backend=args.embedding_backend
+    )
+    harvester.harvest(
+        vectorstore_path=args.output,
+        incremental=not args.full,
+        mirror_dir=args.from_mirror,
+        save_mirror=args.save_mirror,
+        recursive=args.recursive,
+        index_type=args.index_type
+    )
     print(f"Documentation harvested and saved to {args.output}")
 
 
@@ -29,13 +46,30 @@ def validate_command(args: argparse.Namespace) -> None:
     Args:
         args: Command line arguments
     """
+    from ..scanner.pipeline_scanner import PipelineScanner
+    from ..utils.report_generator import ReportGenerator
+    
     scanner = PipelineScanner(
         pipeline_path=args.pipeline_path,
         vectorstore_path=args.vectorstore,
-        openai_api_key=args.api_key
+        openai_api_key=args.api_key,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        static_only=args.static_only,
+        module_catalog=args.module_catalog,
+        retrieval_mode=args.retrieval,
+        use_guideline_packs=not args.no_guideline_packs
     )
     
-    report_path = scanner.generate_report(output_path=args.output)
+    report_path = scanner.generate_report(
+        output_path=args.output,
+        incremental=args.incremental,
+        since=args.since,
+        max_workers=args.max_workers,
+        engine=args.engine,
+        resume=args.resume,
+        fsync=args.fsync
+    )
     
     if args.format == 'markdown':
         md_path = os.path.splitext(report_path)[0] + '.md'
@@ -44,15 +78,139 @@ def validate_command(args: argparse.Namespace) -> None:
         print(f"Markdown report saved to {md_path}")
 
 
+def validate_batch_command(args: argparse.Namespace) -> None:
+    """Handle the validate-batch command
+    
+    Args:
+        args: Command line arguments
+    """
+    from ..scanner.batch import BatchScanner
+    from ..utils.report_generator import ReportGenerator
+    
+    scanner = BatchScanner(
+        pipeline_paths=args.pipeline_paths,
+        vectorstore_path=args.vectorstore,
+        openai_api_key=args.api_key,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        static_only=args.static_only,
+        module_catalog=args.module_catalog,
+        retrieval_mode=args.retrieval,
+        use_guideline_packs=not args.no_guideline_packs
+    )
+    
+    fleet = scanner.generate_reports(
+        output_dir=args.output_dir,
+        incremental=args.incremental,
+        since=args.since,
+        max_workers=args.max_workers,
+        engine=args.engine,
+        resume=args.resume,
+        fsync=args.fsync
+    )
+    
+    if args.format == 'markdown':
+        report_gen = ReportGenerator()
+        for pipeline in fleet["pipelines"]:
+            md_path = os.path.splitext(pipeline["report"])[0] + '.md'
+            report_gen.json_to_markdown(pipeline["report"], md_path)
+            print(f"Markdown report saved to {md_path}")
+
+
+def build_catalog_command(args: argparse.Namespace) -> None:
+    """Handle the build-catalog command
+    
+    Args:
+        args: Command line arguments
+    """
+    from ..validator.llm_validator import NfCoreValidator
+    from ..validator.module_catalog import ModuleCatalog, build_catalog
+    
+    validator = NfCoreValidator(
+        args.vectorstore,
+        args.api_key,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        static_only=args.static_only,
+        retrieval_mode=args.retrieval,
+        use_guideline_packs=not args.no_guideline_packs
+    )
+    catalog = ModuleCatalog.load(args.output) if os.path.exists(args.output) else None
+    catalog = build_catalog(args.modules_repo, validator, catalog, max_workers=args.max_workers)
+    catalog.save(args.output)
+    print(f"Module catalog with {len(catalog)} modules saved to {args.output}")
+
+
+def convert_store_command(args: argparse.Namespace) -> None:
+    """Handle the convert-store command
+    
+    Args:
+        args: Command line arguments
+    """
+    from ..vectorstore.chunk_store import convert_vectorstore
+    
+    count = convert_vectorstore(args.vectorstore, remove_pickle=args.remove_pickle)
+    print(f"Converted {count} chunks of {args.vectorstore} to the chunk store format")
+
+
+def build_packs_command(args: argparse.Namespace) -> None:
+    """Handle the build-packs command
+    
+    Args:
+        args: Command line arguments
+    """
+    from ..validator.guideline_packs import build_guideline_packs, save_guideline_packs
+    from ..vectorstore.chunk_store import ChunkStore, CHUNK_DB_NAME
+    
+    db_path = os.path.join(args.vectorstore, CHUNK_DB_NAME)
+    if not os.path.exists(db_path):
+        raise ValueError(f"{args.vectorstore} has no chunk store; convert it with convert-store first")
+    store = ChunkStore(db_path)
+    try:
+        packs = build_guideline_packs(store.entries(), max_tokens=args.max_tokens)
+    finally:
+        store.close()
+    save_guideline_packs(packs, args.vectorstore)
+    for component_type, pack in packs.items():
+        print(f"{component_type}: {len(pack['chunks'])} chunks, {len(pack['requirements'])} requirements")
+    print(f"Guideline packs saved to {args.vectorstore}")
+
+
+def index_report_command(args: argparse.Namespace) -> None:
+    """Handle the index-report command
+    
+    Args:
+        args: Command line arguments
+    """
+    from ..vectorstore.index_factory import index_vectors, recall_report
+    from ..vectorstore.loader import read_index, read_store_metadata
+    
+    stored_type = read_store_metadata(args.vectorstore).get("index_type", "flat")
+    if stored_type != "flat":
+        print(f"Warning: {args.vectorstore} has a {stored_type} index; its vectors are approximate")
+    
+    vectors = index_vectors(read_index(os.path.join(args.vectorstore, "index.faiss"), mmap=False))
+    report = recall_report(vectors, args.index_types, k=args.k, holdout=args.holdout)
+    
+    print(f"\nRecall@{args.k} against the flat index ({len(vectors)} vectors, {args.holdout:.0%} held out as queries)\n")
+    print(f"{'Index':<8} {'Factory':<20} {'Recall':>8} {'Latency (ms)':>13} {'Build (s)':>10} {'Size (MB)':>10}")
+    for row in report:
+        print(f"{row['index_type']:<8} {row['factory']:<20} {row['recall_at_k']:>8.3f} {row['latency_ms']:>13.3f} "
+              f"{row['build_seconds']:>10.2f} {row['size_bytes'] / 1e6:>10.2f}")
+
+
 def chat_command(args: argparse.Namespace) -> None:
     """Handle the chat command
     
     Args:
         args: Command line arguments
     """
+    from ..chat.chat_interface import NfCoreDocChat
+    
     chat = NfCoreDocChat(
         vectorstore_path=args.vectorstore,
-        openai_api_key=args.api_key
+        openai_api_key=args.api_key,
+        retrieval_mode=args.retrieval
     )
     
     print("\nNf-core Documentation Chat")
@@ -133,6 +291,16 @@ def main(argv: Optional[List[str]] = None) -> int:
         "--api-key", 
         help="OpenAI API key (defaults to OPENAI_API_KEY environment variable)"
     )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        help="Requests-per-minute budget for LLM calls (defaults to 500)"
+    )
+    parser.add_argument(
+        "--tpm",
+        type=float,
+        help="Tokens-per-minute budget for LLM calls (defaults to 40000)"
+    )
     
     # Subcommands
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
@@ -147,6 +315,44 @@ def main(argv: Optional[List[str]] = None) -> int:
         default="nfcore_vectorstore",
         help="Output path for vector store"
     )
+    harvest_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild the vector store from scratch instead of only updating changed pages"
+    )
+    harvest_parser.add_argument(
+        "--from-mirror",
+        metavar="DIR",
+        help="Build the vector store from the saved HTML files in this directory instead of fetching pages"
+    )
+    harvest_parser.add_argument(
+        "--save-mirror",
+        metavar="DIR",
+        help="Save every fetched page to this directory for later offline harvests"
+    )
+    harvest_parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Recursively discover guideline pages linked from the known ones"
+    )
+    harvest_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum number of pages fetched concurrently"
+    )
+    harvest_parser.add_argument(
+        "--index-type",
+        choices=INDEX_TYPES,
+        default="flat",
+        help="Vector index type: exact flat float32, HNSW graph, IVF-PQ, 8-bit or float16 scalar quantization"
+    )
+    harvest_parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default="openai",
+        help="Embedding backend: OpenAI, or local hashed text features (offline, deterministic, no API key)"
+    )
     
     # Validate command
     validate_parser = subparsers.add_parser(
@@ -172,6 +378,279 @@ def main(argv: Optional[List[str]] = None) -> int:
         default="json",
         help="Report format"
     )
+    validate_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of components validated concurrently"
+    )
+    validate_parser.add_argument(
+        "--engine",
+        choices=["thread", "async"],
+        default="thread",
+        help="Scan engine: a thread pool, or an asyncio event loop with async LLM and embedding calls"
+    )
+    validate_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted scan from its checkpoint, skipping components that already have a result"
+    )
+    validate_parser.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        default="interval",
+        help="How often checkpointed results are synced to disk: after every result, about once a second, or never"
+    )
+    validate_parser.add_argument(
+        "--static-only",
+        action="store_true",
+        help="Only run the built-in static rules; no LLM calls or API key needed"
+    )
+    validate_parser.add_argument(
+        "--no-guideline-packs",
+        action="store_true",
+        help="Retrieve guidelines per component instead of using the precomputed guideline packs"
+    )
+    validate_parser.add_argument(
+        "--retrieval",
+        choices=RETRIEVAL_MODES,
+        default="vector",
+        help="Guideline retrieval: BM25 keyword search without query embeddings, embeddings, or both fused"
+    )
+    validate_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-validate every component instead of reusing cached results"
+    )
+    validate_parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Directory of the persistent validation result cache"
+    )
+    validate_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-validate components that changed since the manifest next to the report was written"
+    )
+    validate_parser.add_argument(
+        "--since",
+        metavar="REF",
+        help="Only re-validate components changed in this git ref or range (e.g. main..HEAD); implies --incremental"
+    )
+    
+    validate_parser.add_argument(
+        "--module-catalog",
+        metavar="PATH",
+        help="Module catalog built with build-catalog; unmodified nf-core modules found in it are not re-validated"
+    )
+    
+    # Validate-batch command
+    batch_parser = subparsers.add_parser(
+        "validate-batch",
+        help="Validate many pipelines in one run"
+    )
+    batch_parser.add_argument(
+        "pipeline_paths",
+        nargs="+",
+        help="Paths or glob patterns of the pipelines to validate (e.g. 'pipelines/*')"
+    )
+    batch_parser.add_argument(
+        "--vectorstore",
+        default="nfcore_vectorstore",
+        help="Path to the vector store"
+    )
+    batch_parser.add_argument(
+        "--output-dir",
+        default="",
+        help="Directory for the per-pipeline reports and fleet_summary.json (defaults to the working directory)"
+    )
+    batch_parser.add_argument(
+        "--format",
+        choices=["json", "markdown"],
+        default="json",
+        help="Report format"
+    )
+    batch_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum number of components validated concurrently, across all pipelines"
+    )
+    batch_parser.add_argument(
+        "--engine",
+        choices=["thread", "async"],
+        default="thread",
+        help="Scan engine: a thread pool, or an asyncio event loop with async LLM and embedding calls"
+    )
+    batch_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted scan from its checkpoint, skipping components that already have a result"
+    )
+    batch_parser.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        default="interval",
+        help="How often checkpointed results are synced to disk: after every result, about once a second, or never"
+    )
+    batch_parser.add_argument(
+        "--static-only",
+        action="store_true",
+        help="Only run the built-in static rules; no LLM calls or API key needed"
+    )
+    batch_parser.add_argument(
+        "--no-guideline-packs",
+        action="store_true",
+        help="Retrieve guidelines per component instead of using the precomputed guideline packs"
+    )
+    batch_parser.add_argument(
+        "--retrieval",
+        choices=RETRIEVAL_MODES,
+        default="vector",
+        help="Guideline retrieval: BM25 keyword search without query embeddings, embeddings, or both fused"
+    )
+    batch_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-validate every component instead of reusing cached results"
+    )
+    batch_parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Directory of the persistent validation result cache"
+    )
+    batch_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-validate components that changed since each pipeline's previous report"
+    )
+    batch_parser.add_argument(
+        "--since",
+        metavar="REF",
+        help="Only re-validate components changed in this git ref or range; implies --incremental"
+    )
+    batch_parser.add_argument(
+        "--module-catalog",
+        metavar="PATH",
+        help="Module catalog built with build-catalog; unmodified nf-core modules found in it are not re-validated"
+    )
+    
+    # Build-catalog command
+    catalog_parser = subparsers.add_parser(
+        "build-catalog",
+        help="Validate a checkout of nf-core/modules into a module catalog"
+    )
+    catalog_parser.add_argument(
+        "modules_repo",
+        help="Path to a checkout of the nf-core/modules repository"
+    )
+    catalog_parser.add_argument(
+        "--output",
+        default=DEFAULT_CATALOG_PATH,
+        help="Path of the catalog; an existing catalog is updated with modules it does not contain yet"
+    )
+    catalog_parser.add_argument(
+        "--vectorstore",
+        default="nfcore_vectorstore",
+        help="Path to the vector store"
+    )
+    catalog_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of modules validated concurrently"
+    )
+    catalog_parser.add_argument(
+        "--static-only",
+        action="store_true",
+        help="Only run the built-in static rules; no LLM calls or API key needed"
+    )
+    catalog_parser.add_argument(
+        "--no-guideline-packs",
+        action="store_true",
+        help="Retrieve guidelines per component instead of using the precomputed guideline packs"
+    )
+    catalog_parser.add_argument(
+        "--retrieval",
+        choices=RETRIEVAL_MODES,
+        default="vector",
+        help="Guideline retrieval: BM25 keyword search without query embeddings, embeddings, or both fused"
+    )
+    catalog_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-validate every module instead of reusing cached results"
+    )
+    catalog_parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Directory of the persistent validation result cache"
+    )
+    
+    # Convert-store command
+    convert_parser = subparsers.add_parser(
+        "convert-store",
+        help="Convert a vector store to the current chunk store format, with a lexical index"
+    )
+    convert_parser.add_argument(
+        "vectorstore",
+        nargs="?",
+        default="nfcore_vectorstore",
+        help="Path to the vector store"
+    )
+    convert_parser.add_argument(
+        "--remove-pickle",
+        action="store_true",
+        help="Delete index.pkl after converting"
+    )
+    
+    # Build-packs command
+    packs_parser = subparsers.add_parser(
+        "build-packs",
+        help="Precompute the guideline pack and requirement catalog of each component type"
+    )
+    packs_parser.add_argument(
+        "vectorstore",
+        nargs="?",
+        default="nfcore_vectorstore",
+        help="Path to the vector store"
+    )
+    packs_parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=1000,
+        help="Token budget of each pack's guideline text"
+    )
+    
+    # Index-report command
+    index_report_parser = subparsers.add_parser(
+        "index-report",
+        help="Compare recall and latency of the index types on a vector store"
+    )
+    index_report_parser.add_argument(
+        "vectorstore",
+        nargs="?",
+        default="nfcore_vectorstore",
+        help="Path to the vector store"
+    )
+    index_report_parser.add_argument(
+        "--index-types",
+        nargs="+",
+        choices=INDEX_TYPES,
+        help="Index types to compare (defaults to all)"
+    )
+    index_report_parser.add_argument(
+        "--k",
+        type=int,
+        default=5,
+        help="Number of neighbours per query"
+    )
+    index_report_parser.add_argument(
+        "--holdout",
+        type=float,
+        default=0.1,
+        help="Share of the stored vectors held out as queries"
+    )
     
     # Chat command
     chat_parser = subparsers.add_parser(
@@ -194,6 +673,12 @@ def main(argv: Optional[List[str]] = None) -> int:
         action="store_true",
         help="Show sources for the answer"
     )
+    chat_parser.add_argument(
+        "--retrieval",
+        choices=RETRIEVAL_MODES,
+        default="vector",
+        help="Documentation retrieval: BM25 keyword search without query embeddings, embeddings, or both fused"
+    )
     
     args = parser.parse_args(argv)
     
@@ -203,16 +688,35 @@ def main(argv: Optional[List[str]] = None) -> int:
         return 1
     
     # Check for OpenAI API key
-    if not args.api_key and not os.environ.get("OPENAI_API_KEY"):
+    needs_api_key = args.command not in ("convert-store", "build-packs", "index-report") and not (
+        args.command in ("validate", "validate-batch", "build-catalog") and args.static_only
+    ) and not (
+        args.command == "harvest" and args.embedding_backend != "openai"
+    )
+    if needs_api_key and not args.api_key and not os.environ.get("OPENAI_API_KEY"):
         print("Error: OpenAI API key is required. Set OPENAI_API_KEY environment variable or use --api-key.")
         return 1
     
+    # Apply the org's API quota to all LLM calls
+    if args.rpm or args.tpm:
+        configure_scheduler("chat", requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    
     # Handle commands
     try:
         if args.command == "harvest":
             harvest_command(args)
         elif args.command == "validate":
             validate_command(args)
+        elif args.command == "validate-batch":
+            validate_batch_command(args)
+        elif args.command == "build-catalog":
+            build_catalog_command(args)
+        elif args.command == "convert-store":
+            convert_store_command(args)
+        elif args.command == "build-packs":
+            build_packs_command(args)
+        elif args.command == "index-report":
+            index_report_command(args)
         elif args.command == "chat":
             chat_command(args)
     except Exception as e:
@@ -0,0 +1,133 @@
+"""
+Boilerplate stripping and duplicate chunk detection for harvested pages
+"""
+import re
+import zlib
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from bs4 import BeautifulSoup
+
+# Page elements that carry site chrome rather than guideline text
+BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "header", "footer", "aside", "form", "button", "svg"]
+BOILERPLATE_ROLES = ["navigation", "banner", "contentinfo", "complementary", "search"]
+
+# Mersenne prime used as the modulus of the MinHash permutations
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def extract_main_content(soup: BeautifulSoup) -> str:
+    """Extract the article text of a documentation page
+
+    Navigation, headers, footers, sidebars and scripts are removed, and the
+    text is taken from the ``<main>``/``<article>`` element when the page
+    has one. Note that this modifies the soup.
+
+    Args:
+        soup: Parsed page
+
+    Returns:
+        Article text with one block per line
+    """
+    for tag in soup.find_all(BOILERPLATE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(attrs={"role": BOILERPLATE_ROLES}):
+        tag.decompose()
+
+    main = soup.find("main") or soup.find("article") or soup.find(attrs={"role": "main"}) or soup.body or soup
+    text = main.get_text("\n")
+
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+class ChunkDeduplicator:
+    """Detects exact and near-duplicate chunks before they are embedded
+
+    Exact duplicates are found by hashing the whitespace- and
+    case-normalized text. Near duplicates are found with MinHash signatures
+    over word shingles, bucketed with locality-sensitive hashing so each
+    chunk is only compared against likely candidates.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 64, bands: int = 16, shingle_size: int = 5):
+        """Initialize the deduplicator
+
+        Args:
+            threshold: Estimated Jaccard similarity above which a chunk
+                counts as a near duplicate
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands; must divide num_perm
+            shingle_size: Number of words per shingle
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+
+        self._exact = set()
+        self._signatures: List[np.ndarray] = []
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self.exact_removed = 0
+        self.near_removed = 0
+
+    def check(self, text: str) -> Optional[str]:
+        """Check a chunk against all chunks seen so far and remember it
+
+        Args:
+            text: Chunk text
+
+        Returns:
+            "exact" or "near" if the chunk duplicates a previous one,
+            None if it is new
+        """
+        words = text.lower().split()
+        exact_key = hashlib.sha1(" ".join(words).encode("utf-8")).digest()
+        if exact_key in self._exact:
+            self.exact_removed += 1
+            return "exact"
+        self._exact.add(exact_key)
+
+        signature = self._signature(words)
+        band_keys = [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+        candidates = {i for key in band_keys for i in self._buckets.get(key, [])}
+        for i in candidates:
+            if np.mean(self._signatures[i] == signature) >= self.threshold:
+                self.near_removed += 1
+                return "near"
+
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(index)
+        return None
+
+    def add(self, text: str) -> None:
+        """Remember a chunk that is kept regardless of duplicates
+
+        Args:
+            text: Chunk text
+        """
+        removed = (self.exact_removed, self.near_removed)
+        self.check(text)
+        self.exact_removed, self.near_removed = removed
+
+    def _signature(self, words: List[str]) -> np.ndarray:
+        """Compute the MinHash signature of a word sequence"""
+        size = self.shingle_size
+        shingles = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+        hashes = np.array([zlib.crc32(s.encode("utf-8")) for s in shingles], dtype=np.uint64)
+        hashes %= np.uint64(_MERSENNE_PRIME)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % np.uint64(_MERSENNE_PRIME)
+        return permuted.min(axis=1)
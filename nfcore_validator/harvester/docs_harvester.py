@@ -2,36 +2,69 @@
 Documentation harvester for nf-core guidelines
 """
 import os
-import requests
+import json
+import hashlib
 from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from langchain.document_loaders import WebBaseLoader
+from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.embeddings import OpenAIEmbeddings
+from langchain.embeddings.base import Embeddings
 from langchain.vectorstores import FAISS
 
+from ..utils.rate_limiter import RateLimitScheduler, get_scheduler
+from ..validator.guideline_packs import build_guideline_packs, save_guideline_packs
+from ..vectorstore.chunk_store import docstore_rows
+from ..vectorstore.embeddings import create_embeddings, embedding_backend_name, is_local_backend
+from ..vectorstore.index_factory import INDEX_TYPES
+from ..vectorstore.loader import load_writable_vectorstore, read_store_metadata, save_vectorstore
+from .embedding_cache import EmbeddingCache
+from .fetcher import DocsFetcher, list_mirror, load_mirror, save_to_mirror
+from .pipeline import StreamingPipeline
+from .cleaning import ChunkDeduplicator, extract_main_content
+
+# URL path prefixes of the guideline pages followed by recursive discovery
+GUIDELINE_PREFIXES = [
+    "/docs/guidelines/components",
+    "/docs/guidelines/pipelines",
+    "/docs/contributing/pipelines"
+]
+
 class NfCoreDocsHarvester:
     """Harvests nf-core documentation and creates a vector store for retrieval"""
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, scheduler: Optional[RateLimitScheduler] = None,
+                 max_workers: int = 8, embedding_backend: str = "openai"):
         """Initialize the harvester
         
         Args:
             openai_api_key: OpenAI API key for embeddings
+            scheduler: Scheduler for embedding calls (defaults to the shared "embeddings" scheduler)
+            max_workers: Maximum number of pages fetched concurrently
+            embedding_backend: Embedding backend, "openai" or the local
+                "hashing" backend, which needs no API key
         """
         self.base_url = "https://nf-co.re/docs/guidelines/components"
         self.docs_dir = "nfcore_docs"
         self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
+        self.scheduler = scheduler or get_scheduler("embeddings")
+        self.embedding_batch_size = 100
+        self.fetcher = DocsFetcher(max_workers=max_workers)
+        self.embedding_backend = embedding_backend
         
-        if not self.openai_api_key:
+        if not self.openai_api_key and embedding_backend.startswith("openai"):
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it directly.")
             
         os.makedirs(self.docs_dir, exist_ok=True)
 
-    def _get_all_doc_urls(self) -> List[str]:
-        """Extract all guideline URLs from the overview page"""
-        response = requests.get(f"{self.base_url}/overview")
+    def _get_all_doc_urls(self, recursive: bool = False) -> List[str]:
+        """Extract all guideline URLs from the overview page
+        
+        Args:
+            recursive: Also follow links from every found page, limited to
+                the guideline path prefixes
+        """
+        response = self.fetcher.get(f"{self.base_url}/overview")
         soup = BeautifulSoup(response.text, 'html.parser')
         
         urls = []
@@ -58,7 +91,7 @@ class NfCoreDocsHarvester:
         
         # Also crawl pipeline guidelines section
         try:
-            pipeline_response = requests.get("https://nf-co.re/docs/guidelines/pipelines/overview")
+            pipeline_response = self.fetcher.get("https://nf-co.re/docs/guidelines/pipelines/overview")
             pipeline_soup = BeautifulSoup(pipeline_response.text, 'html.parser')
             for link in pipeline_soup.find_all('a', href=True):
                 href = link['href']
@@ -70,52 +103,340 @@ class NfCoreDocsHarvester:
             print(f"Warning: Could not crawl pipeline guidelines: {str(e)}")
         
         # Combine all URLs
-        all_urls = urls + core_urls
+        all_urls = list(set(urls + core_urls))  # Remove duplicates
+        
+        if recursive:
+            all_urls = self.fetcher.discover(all_urls, GUIDELINE_PREFIXES)
         
-        return list(set(all_urls))  # Remove duplicates
+        return all_urls
 
-    def harvest(self, vectorstore_path: str = "nfcore_vectorstore") -> FAISS:
+    def harvest(self, vectorstore_path: str = "nfcore_vectorstore", incremental: bool = True,
+                mirror_dir: Optional[str] = None, save_mirror: Optional[str] = None,
+                recursive: bool = False, index_type: str = "flat") -> FAISS:
         """Harvest documentation and create vector store
         
+        Pages stream through fetch, split, embed and index stages that run
+        concurrently, so only a bounded number of pages and chunks are held
+        in memory at once.
+        
+        Per-page content hashes and HTTP validators (ETag/Last-Modified) are
+        recorded next to the vector store. On an incremental harvest, pages
+        are fetched with conditional GETs and only changed pages are split
+        and embedded; the existing index is updated in place by deleting
+        stale chunks and adding new ones.
+        
         Args:
             vectorstore_path: Path to save the vector store
+            incremental: Update an existing vector store instead of rebuilding it
+            mirror_dir: Build from the saved HTML files in this offline mirror
+                instead of fetching pages
+            save_mirror: Save every fetched page to this offline mirror
+            recursive: Discover pages recursively from the guideline pages
+            index_type: Index type to save (flat, hnsw, ivfpq, sq8 or fp16);
+                the store is built with a flat index and converted on save
             
         Returns:
             FAISS vector store with document embeddings
         """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type: {index_type}. Choose from {', '.join(INDEX_TYPES)}")
+        
         print("Harvesting nf-core documentation...")
-        urls = self._get_all_doc_urls()
+        if mirror_dir:
+            urls = list(list_mirror(mirror_dir))
+        else:
+            urls = self._get_all_doc_urls(recursive=recursive)
         print(f"Found {len(urls)} documentation pages to process")
         
-        # Use WebBaseLoader with metadata
-        loader = WebBaseLoader(urls)
-        loader.requests_kwargs = {'timeout': 10}
+        embeddings = create_embeddings(self.embedding_backend, self.openai_api_key)
+        backend_name = embedding_backend_name(embeddings)
+        # OpenAI caches and states are keyed by the bare model name
+        model_name = getattr(embeddings, "model", None) or backend_name
         
-        # Add metadata to documents
-        docs = loader.load()
-        for doc in docs:
-            if not doc.metadata.get('source'):
-                doc.metadata['source'] = doc.metadata.get('url', 'Unknown')
+        state_path = os.path.join(vectorstore_path, "harvest_state.json")
+        previous_pages = {}
+        vectorstore = None
+        if incremental and os.path.exists(os.path.join(vectorstore_path, "index.faiss")):
+            state = self._load_state(state_path)
+            stored_type = read_store_metadata(vectorstore_path).get("index_type", "flat")
+            if stored_type != "flat":
+                # Compressed indexes cannot be updated in place; the embedding
+                # cache makes the rebuild cheap
+                print(f"Rebuilding the {stored_type} index from scratch")
+            elif state.get("embedding_model") == model_name and state.get("pages"):
+                previous_pages = state["pages"]
+                vectorstore = load_writable_vectorstore(vectorstore_path, embeddings)
         
-        print(f"Loaded {len(docs)} documents")
+        # Fetch pages, skipping the ones that did not change
+        if mirror_dir:
+            fetched = (
+                (url, self._parse_page(url, html, previous_pages.get(url)))
+                for url, html in load_mirror(mirror_dir)
+            )
+        else:
+            fetched = self.fetcher.map(
+                lambda url: self._fetch_page(url, previous_pages.get(url), save_mirror),
+                urls
+            )
         
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200
         )
-        splits = text_splitter.split_documents(docs)
+        cache = EmbeddingCache(os.path.join(self.docs_dir, "embeddings.sqlite"), model_name)
+        old_ids = {chunk_id for page in previous_pages.values() for chunk_id in page["chunk_ids"]}
+        pages = {}
+        pending = []
+        # Best effort on incremental runs: new chunks are only compared
+        # against retained chunks of pages that were seen before them
+        deduplicator = ChunkDeduplicator()
+        
+        def split_page(fetched_page):
+            """Split a changed page into new chunks with stable content-derived IDs"""
+            url, page = fetched_page
+            previous = previous_pages.get(url)
+            if page is None or page["document"] is None:
+                if previous:
+                    pages[url] = previous  # Unchanged, or unreachable and kept as it was
+                    if page is not None and "etag" in page:
+                        # Fetched in full but unchanged: keep the new validators
+                        # so the next run can get a 304
+                        pages[url] = dict(previous, etag=page["etag"], last_modified=page["last_modified"])
+                    for chunk_id in previous["chunk_ids"]:
+                        doc = vectorstore.docstore.search(chunk_id)
+                        if not isinstance(doc, str):
+                            deduplicator.add(doc.page_content)
+                return []
+            
+            chunk_ids = []
+            new_chunks = []
+            for split in text_splitter.split_documents([page["document"]]):
+                # Ensure each split has source metadata
+                if not split.metadata.get('source'):
+                    split.metadata['source'] = split.metadata.get('url', url)
+                chunk_id = self._chunk_id(url, split.page_content)
+                if chunk_id in old_ids:
+                    # Chunks kept from the previous harvest are never dropped
+                    deduplicator.add(split.page_content)
+                elif deduplicator.check(split.page_content):
+                    continue
+                else:
+                    new_chunks.append((chunk_id, split))
+                chunk_ids.append(chunk_id)
+            pages[url] = {
+                "etag": page["etag"],
+                "last_modified": page["last_modified"],
+                "content_hash": page["content_hash"],
+                "chunk_ids": chunk_ids
+            }
+            return new_chunks
+        
+        def embed_pending():
+            """Embed the buffered chunks as one batch"""
+            if not pending:
+                return []
+            chunk_ids = [chunk_id for chunk_id, _ in pending]
+            texts = [split.page_content for _, split in pending]
+            metadatas = [split.metadata for _, split in pending]
+            pending.clear()
+            return [(chunk_ids, texts, self._embed_texts(embeddings, texts, cache), metadatas)]
+        
+        def embed_chunk(chunk):
+            """Buffer a chunk and embed once a full batch is ready"""
+            pending.append(chunk)
+            if len(pending) < self.embedding_batch_size:
+                return []
+            return embed_pending()
+        
+        def index_batch(batch):
+            """Append an embedded batch to the vector store"""
+            nonlocal vectorstore
+            chunk_ids, texts, vectors, metadatas = batch
+            text_embeddings = list(zip(texts, vectors))
+            if vectorstore is None:
+                vectorstore = FAISS.from_embeddings(text_embeddings, embeddings, metadatas=metadatas, ids=chunk_ids)
+            else:
+                vectorstore.add_embeddings(text_embeddings, metadatas=metadatas, ids=chunk_ids)
         
-        # Ensure each split has source metadata
-        for split in splits:
-            if not split.metadata.get('source'):
-                split.metadata['source'] = split.metadata.get('url', 'Unknown')
+        # Pages are split, embedded and indexed while later pages are still being fetched
+        print("Fetching, splitting and embedding pages (this may take a while)...")
+        pipeline = StreamingPipeline(queue_size=self.embedding_batch_size)
+        pipeline.source("fetch", fetched)
+        pipeline.stage("split", split_page)
+        pipeline.stage("embed", embed_chunk, flush=embed_pending)
+        try:
+            pipeline.run("index", index_batch)
+        finally:
+            cache.close()
+        pipeline.print_summary()
+        print(f"Removed {deduplicator.exact_removed} exact and {deduplicator.near_removed} "
+              f"near-duplicate chunks before embedding")
+        print(f"Embedding cache: {cache.hits} hits, {cache.misses} misses")
         
-        print(f"Split into {len(splits)} chunks")
+        if vectorstore is None:
+            raise ValueError("No documentation pages could be harvested")
         
-        print("Creating vector embeddings (this may take a while)...")
-        embeddings = OpenAIEmbeddings(openai_api_key=self.openai_api_key)
-        vectorstore = FAISS.from_documents(splits, embeddings)
+        # Remove chunks of changed or vanished pages from the index
+        new_ids = {chunk_id for page in pages.values() for chunk_id in page["chunk_ids"]}
+        stored_ids = set(vectorstore.index_to_docstore_id.values())
+        stale_ids = [chunk_id for chunk_id in old_ids - new_ids if chunk_id in stored_ids]
+        if stale_ids:
+            vectorstore.delete(stale_ids)
+        print(f"Vector store has {len(new_ids)} chunks from {len(pages)} pages "
+              f"({len(stale_ids)} stale chunks removed)")
         
         print(f"Saving vector store to {vectorstore_path}")
-        vectorstore.save_local(vectorstore_path)
+        save_vectorstore(vectorstore, vectorstore_path, index_type=index_type, embedding_backend=backend_name)
+        packs = build_guideline_packs(docstore_rows(vectorstore.docstore, vectorstore.index_to_docstore_id))
+        save_guideline_packs(packs, vectorstore_path)
+        print(f"Built guideline packs with {sum(len(p['requirements']) for p in packs.values())} requirements "
+              f"for {len(packs)} component types")
+        with open(state_path, "w") as f:
+            json.dump({"embedding_model": model_name, "pages": pages}, f, indent=2)
         return vectorstore
+
+    def _fetch_page(self, url: str, previous: Optional[Dict[str, Any]] = None,
+                    save_mirror: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a documentation page, conditionally if it was fetched before
+        
+        Args:
+            url: Page URL
+            previous: Harvest state of the page from the last run
+            save_mirror: Offline mirror directory to save the page to; pages
+                are then always fetched in full
+            
+        Returns:
+            Page dictionary from _parse_page, or None if the page could not
+            be fetched
+        """
+        headers = {}
+        if previous and not save_mirror:
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+        
+        try:
+            response = self.fetcher.get(url, headers=headers)
+            if response.status_code == 304:
+                return {"url": url, "document": None}
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Warning: Could not fetch {url}: {str(e)}")
+            return None
+        
+        if save_mirror:
+            save_to_mirror(save_mirror, url, response.text)
+        
+        return self._parse_page(
+            url,
+            response.text,
+            previous,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
+
+    def _parse_page(self, url: str, html: str, previous: Optional[Dict[str, Any]] = None,
+                    etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict[str, Any]:
+        """Turn page HTML into a document of its main article text
+        
+        Args:
+            url: Page URL
+            html: Page HTML
+            previous: Harvest state of the page from the last run
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            
+        Returns:
+            Dictionary with url, document, etag, last_modified and
+            content_hash; document is None if the page did not change, in
+            which case only the url and the fresh etag and last_modified
+            are given
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        metadata = self._page_metadata(soup, url)
+        text = extract_main_content(soup)
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if previous and previous.get("content_hash") == content_hash:
+            return {"url": url, "document": None, "etag": etag, "last_modified": last_modified}
+        
+        return {
+            "url": url,
+            "document": Document(page_content=text, metadata=metadata),
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash
+        }
+
+    def _page_metadata(self, soup: BeautifulSoup, url: str) -> Dict[str, str]:
+        """Build document metadata the same way WebBaseLoader does
+        
+        Args:
+            soup: Parsed page
+            url: Page URL
+            
+        Returns:
+            Metadata dictionary with source, title, description and language
+        """
+        metadata = {"source": url}
+        title = soup.find("title")
+        if title:
+            metadata["title"] = title.get_text()
+        description = soup.find("meta", attrs={"name": "description"})
+        if description:
+            metadata["description"] = description.get("content", "No description found.")
+        html = soup.find("html")
+        if html:
+            metadata["language"] = html.get("lang", "No language found.")
+        return metadata
+
+    def _chunk_id(self, url: str, text: str) -> str:
+        """Get the stable ID of a chunk from its page URL and text"""
+        return hashlib.sha1(f"{url}\0{text}".encode("utf-8")).hexdigest()
+
+    def _load_state(self, state_path: str) -> Dict[str, Any]:
+        """Load the harvest state of a previous run
+        
+        Args:
+            state_path: Path to the state file
+            
+        Returns:
+            State dictionary, empty if there is no usable state
+        """
+        try:
+            with open(state_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _embed_texts(self, embeddings: Embeddings, texts: List[str],
+                     cache: Optional[EmbeddingCache] = None) -> List[List[float]]:
+        """Embed texts in batches, through the rate limit scheduler for API backends
+        
+        Args:
+            embeddings: Embedding model
+            texts: Texts to embed
+            cache: Embedding cache to reuse and store vectors in
+            
+        Returns:
+            List of embedding vectors in the same order as texts
+        """
+        vectors = cache.get_many(texts) if cache is not None else [None] * len(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        
+        for start in range(0, len(missing), self.embedding_batch_size):
+            batch_indices = missing[start:start + self.embedding_batch_size]
+            batch = [texts[i] for i in batch_indices]
+            if is_local_backend(embeddings):
+                batch_vectors = embeddings.embed_documents(batch)
+            else:
+                batch_vectors = self.scheduler.run(
+                    embeddings.embed_documents,
+                    batch,
+                    prompt_text="".join(batch)
+                )
+            for i, vector in zip(batch_indices, batch_vectors):
+                vectors[i] = vector
+            if cache is not None:
+                cache.put_many(batch, batch_vectors)
+        return vectors
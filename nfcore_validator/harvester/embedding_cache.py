@@ -0,0 +1,107 @@
+"""
+Persistent embedding cache for harvested documentation chunks
+"""
+import os
+import sqlite3
+import hashlib
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Stores embedding vectors keyed by chunk text hash and embedding model
+
+    Vectors are kept as float32 blobs in a SQLite database, so re-harvesting
+    unchanged documentation does not need any embedding API calls.
+    """
+
+    def __init__(self, cache_path: str, model_name: str):
+        """Initialize the cache
+
+        Args:
+            cache_path: Path to the SQLite database file
+            model_name: Name of the embedding model the vectors come from
+        """
+        self.cache_path = cache_path
+        self.model_name = model_name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def key(self, text: str) -> str:
+        """Get the cache key of a text
+
+        Args:
+            text: Chunk text
+
+        Returns:
+            Hex digest of the embedding model and the text
+        """
+        digest = hashlib.sha256()
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8", errors="replace"))
+        return digest.hexdigest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Look up the vectors of several texts
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            List with a vector for every cached text and None for misses
+        """
+        keys = [self.key(text) for text in texts]
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's limit on bound parameters
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                found.update(rows)
+
+            vectors = []
+            for key in keys:
+                blob = found.get(key)
+                if blob is None:
+                    self.misses += 1
+                    vectors.append(None)
+                else:
+                    self.hits += 1
+                    vectors.append(np.frombuffer(blob, dtype=np.float32).tolist())
+        return vectors
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]) -> None:
+        """Store the vectors of several texts
+
+        Args:
+            texts: Chunk texts
+            vectors: Embedding vectors in the same order as texts
+        """
+        rows = [
+            (self.key(text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
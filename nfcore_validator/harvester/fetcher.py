@@ -0,0 +1,229 @@
+"""
+Concurrent documentation fetcher and offline HTML mirror
+"""
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urldefrag, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class DocsFetcher:
+    """Fetches pages concurrently over a pooled, retrying HTTP session
+
+    Connections are reused across requests, each host gets at most
+    ``per_host_limit`` concurrent requests, and connection errors as well as
+    429/5xx responses are retried with backoff.
+    """
+
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 4, retries: int = 3, timeout: float = 10):
+        """Initialize the fetcher
+
+        Args:
+            max_workers: Maximum number of concurrent requests
+            per_host_limit: Maximum number of concurrent requests per host
+            retries: Number of retries for failed requests
+            timeout: Request timeout in seconds
+        """
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_limits: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Fetch a URL within the per-host concurrency limit
+
+        Args:
+            url: URL to fetch
+            headers: Extra request headers
+
+        Returns:
+            HTTP response
+        """
+        with self._host_limit(urlparse(url).netloc):
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def map(self, fn: Callable[[str], Any], urls: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+        """Apply a fetching function to URLs concurrently
+
+        At most max_workers URLs are in flight at a time; the next one is
+        submitted as each finishes, so results that the caller has not
+        consumed yet never pile up and urls may be a lazy iterable.
+
+        Args:
+            fn: Function taking a URL, typically calling get()
+            urls: URLs to process
+
+        Yields:
+            (url, result) tuples in completion order
+        """
+        urls = iter(urls)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = {}
+            for url in urls:
+                in_flight[executor.submit(fn, url)] = url
+                if len(in_flight) >= self.max_workers:
+                    break
+            try:
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url = in_flight.pop(future)
+                        next_url = next(urls, None)
+                        if next_url is not None:
+                            in_flight[executor.submit(fn, next_url)] = next_url
+                        yield url, future.result()
+            finally:
+                # Stopping early must not wait for URLs that were never needed
+                for future in in_flight:
+                    future.cancel()
+
+    def discover(self, seed_urls: List[str], prefixes: List[str], max_pages: int = 500) -> List[str]:
+        """Recursively discover pages linked from the seed URLs
+
+        Only links on the same host whose path starts with one of the given
+        prefixes are followed.
+
+        Args:
+            seed_urls: URLs to start from
+            prefixes: Allowed URL path prefixes
+            max_pages: Maximum number of pages to discover
+
+        Returns:
+            List of discovered URLs, including the seeds
+        """
+        seen = {self._normalize(url) for url in seed_urls}
+        frontier = deque(seen)
+
+        while frontier and len(seen) < max_pages:
+            batch = [frontier.popleft() for _ in range(min(len(frontier), self.max_workers * 4))]
+            for url, links in self.map(self._extract_links, batch):
+                for link in links:
+                    parsed = urlparse(link)
+                    if parsed.netloc != urlparse(url).netloc:
+                        continue
+                    if not any(parsed.path.startswith(prefix) for prefix in prefixes):
+                        continue
+                    if link not in seen and len(seen) < max_pages:
+                        seen.add(link)
+                        frontier.append(link)
+
+        return sorted(seen)
+
+    def _extract_links(self, url: str) -> List[str]:
+        """Fetch a page and return the absolute URLs it links to"""
+        try:
+            response = self.get(url)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Warning: Could not crawl {url}: {str(e)}")
+            return []
+
+        soup = BeautifulSoup(response.text, 'html.parser')
+        return [self._normalize(urljoin(url, link['href'])) for link in soup.find_all('a', href=True)]
+
+    def _normalize(self, url: str) -> str:
+        """Strip fragments, query strings and trailing slashes from a URL"""
+        url = urldefrag(url)[0].split("?", 1)[0]
+        return url.rstrip("/") if urlparse(url).path not in ("", "/") else url
+
+    def _host_limit(self, host: str) -> threading.Semaphore:
+        """Get the concurrency limit of a host"""
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.Semaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+
+def mirror_path(mirror_dir: str, url: str) -> str:
+    """Get the file that holds a page in an offline HTML mirror
+
+    Pages are stored as ``<mirror_dir>/<host>/<path>/index.html``.
+
+    Args:
+        mirror_dir: Mirror root directory
+        url: Page URL
+
+    Returns:
+        Path to the HTML file
+    """
+    parsed = urlparse(url)
+    return os.path.join(mirror_dir, parsed.netloc, *[p for p in parsed.path.split("/") if p], "index.html")
+
+
+def save_to_mirror(mirror_dir: str, url: str, html: str) -> None:
+    """Save a fetched page to an offline HTML mirror
+
+    Args:
+        mirror_dir: Mirror root directory
+        url: Page URL
+        html: Page HTML
+    """
+    path = mirror_path(mirror_dir, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+
+
+def list_mirror(mirror_dir: str) -> Dict[str, str]:
+    """List the pages of an offline HTML mirror without reading them
+
+    Args:
+        mirror_dir: Mirror root directory
+
+    Returns:
+        Dictionary mapping page URL to HTML file, in sorted order
+    """
+    if not os.path.isdir(mirror_dir):
+        raise ValueError(f"Mirror directory does not exist: {mirror_dir}")
+
+    files = {}
+    for root, dirs, names in os.walk(mirror_dir):
+        dirs.sort()
+        for f in sorted(names):
+            if not f.endswith(".html"):
+                continue
+            path = os.path.join(root, f)
+            parts = os.path.relpath(path, mirror_dir).split(os.sep)
+            if f == "index.html":
+                parts = parts[:-1]
+            else:
+                parts[-1] = f[:-len(".html")]
+            files["https://" + "/".join(parts)] = path
+    return files
+
+
+def load_mirror(mirror_dir: str) -> Iterator[Tuple[str, str]]:
+    """Load the pages of an offline HTML mirror one at a time
+
+    Only one page is held in memory at a time, however large the mirror.
+
+    Args:
+        mirror_dir: Mirror root directory
+
+    Yields:
+        (url, html) tuples in the order of list_mirror
+    """
+    for url, path in list_mirror(mirror_dir).items():
+        with open(path, "r", encoding="utf-8", errors="replace") as fh:
+            yield url, fh.read()
@@ -0,0 +1,200 @@
+"""
+Streaming stage pipeline for documentation harvesting
+"""
+import time
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class StageStats:
+    """Item count and busy time of one pipeline stage"""
+
+    def __init__(self, name: str):
+        """Initialize the stats
+
+        Args:
+            name: Stage name
+        """
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.busy = 0.0
+
+    def summary(self) -> str:
+        """Get a one-line throughput summary
+
+        Returns:
+            Summary string
+        """
+        rate = self.items_in / self.busy if self.busy > 0 else 0.0
+        return (f"{self.name}: {self.items_in} in, {self.items_out} out, "
+                f"{self.busy:.2f}s busy ({rate:.1f} items/s)")
+
+
+class StreamingPipeline:
+    """Runs stages in their own threads, connected by bounded queues
+
+    Each stage starts working on an item as soon as the previous stage
+    emits it, so network, CPU and API work overlap, and the bounded
+    queues cap how many items are held in memory at once.
+    """
+
+    def __init__(self, queue_size: int = 16):
+        """Initialize the pipeline
+
+        Args:
+            queue_size: Maximum number of items waiting between two stages
+        """
+        self.queue_size = queue_size
+        self.stats: Dict[str, StageStats] = {}
+        self._threads: List[threading.Thread] = []
+        self._errors: List[BaseException] = []
+        self._output: Optional[queue.Queue] = None
+        self._started = time.monotonic()
+
+    def source(self, name: str, items: Iterable[Any]) -> "StreamingPipeline":
+        """Add the first stage, which emits the items of an iterable
+
+        Args:
+            name: Stage name
+            items: Iterable producing the items, consumed in a thread
+
+        Returns:
+            The pipeline, for chaining
+        """
+        stats = self.stats.setdefault(name, StageStats(name))
+        output = queue.Queue(maxsize=self.queue_size)
+
+        def run():
+            try:
+                iterator = iter(items)
+                while True:
+                    started = time.monotonic()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                    finally:
+                        stats.busy += time.monotonic() - started
+                    stats.items_in += 1
+                    stats.items_out += 1
+                    output.put(item)
+            except BaseException as e:
+                self._errors.append(e)
+            finally:
+                output.put(_DONE)
+
+        self._start(name, run)
+        self._output = output
+        return self
+
+    def stage(self, name: str, fn: Callable[[Any], Iterable[Any]],
+              flush: Optional[Callable[[], Iterable[Any]]] = None) -> "StreamingPipeline":
+        """Add a stage that turns each input item into zero or more outputs
+
+        Args:
+            name: Stage name
+            fn: Function taking an item and returning an iterable of outputs
+            flush: Function called after the last input, returning any
+                outputs still buffered by the stage
+
+        Returns:
+            The pipeline, for chaining
+        """
+        stats = self.stats.setdefault(name, StageStats(name))
+        source = self._output
+        output = queue.Queue(maxsize=self.queue_size)
+
+        def run():
+            failed = False
+            while True:
+                item = source.get()
+                if item is _DONE:
+                    break
+                if failed:
+                    continue  # Keep draining so upstream stages can finish
+                stats.items_in += 1
+                try:
+                    self._emit(stats, output, fn, item)
+                except BaseException as e:
+                    self._errors.append(e)
+                    failed = True
+            if flush is not None and not failed:
+                try:
+                    self._emit(stats, output, lambda _: flush(), None)
+                except BaseException as e:
+                    self._errors.append(e)
+            output.put(_DONE)
+
+        self._start(name, run)
+        self._output = output
+        return self
+
+    def run(self, name: str, fn: Callable[[Any], None], progress_every: float = 5.0) -> None:
+        """Consume the last stage's output in the calling thread
+
+        Args:
+            name: Name of the consuming stage
+            fn: Function called with every output item
+            progress_every: Seconds between progress reports
+
+        Raises:
+            The first exception raised by any stage
+        """
+        stats = self.stats.setdefault(name, StageStats(name))
+        last_report = time.monotonic()
+        failed = False
+        while True:
+            item = self._output.get()
+            if item is _DONE:
+                break
+            if failed:
+                continue
+            stats.items_in += 1
+            started = time.monotonic()
+            try:
+                fn(item)
+            except BaseException as e:
+                self._errors.append(e)
+                failed = True
+            stats.busy += time.monotonic() - started
+
+            if time.monotonic() - last_report >= progress_every:
+                last_report = time.monotonic()
+                self.print_progress()
+
+        for thread in self._threads:
+            thread.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def print_progress(self) -> None:
+        """Print how many items each stage has processed so far"""
+        elapsed = time.monotonic() - self._started
+        progress = ", ".join(f"{stats.name} {stats.items_in}" for stats in self.stats.values())
+        print(f"[{elapsed:.0f}s] {progress}")
+
+    def print_summary(self) -> None:
+        """Print the per-stage throughput"""
+        print(f"Harvest pipeline finished in {time.monotonic() - self._started:.1f}s")
+        for stats in self.stats.values():
+            print(f"  {stats.summary()}")
+
+    def _emit(self, stats: StageStats, output: queue.Queue, fn: Callable, item: Any) -> None:
+        """Run a stage function and forward its outputs, timing only the work"""
+        started = time.monotonic()
+        results = list(fn(item) or [])
+        stats.busy += time.monotonic() - started
+        for result in results:
+            stats.items_out += 1
+            output.put(result)
+
+    def _start(self, name: str, target: Callable[[], None]) -> None:
+        """Start a daemon thread for a stage"""
+        thread = threading.Thread(target=target, name=f"harvest-{name}", daemon=True)
+        thread.start()
+        self._threads.append(thread)
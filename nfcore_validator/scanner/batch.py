@@ -0,0 +1,256 @@
+"""
+Batch validation of many pipelines in one process
+"""
+import os
+import glob
+import json
+from typing import Dict, List, Any, Optional
+
+from ..validator.llm_validator import NfCoreValidator
+from ..validator.result_cache import DEFAULT_CACHE_DIR
+from ..validator.module_catalog import ModuleCatalog
+from .checkpoint import ScanCheckpoint
+from .manifest import ScanManifest, content_hash
+from .pipeline_scanner import PipelineScanner
+
+
+def expand_pipeline_paths(patterns: List[str]) -> List[str]:
+    """Expand pipeline paths and glob patterns into pipeline roots
+
+    Args:
+        patterns: Paths or glob patterns, e.g. ``pipelines/*``
+
+    Returns:
+        Sorted, de-duplicated list of absolute directory paths
+    """
+    paths = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern) or [pattern]
+        for match in matches:
+            if not os.path.isdir(match):
+                raise ValueError(f"Pipeline path is not a directory: {match}")
+            paths.add(os.path.abspath(match))
+    return sorted(paths)
+
+
+class BatchScanner:
+    """Validates many pipelines with one validator and one concurrency pool
+
+    The vector store, LLM clients, result cache and module catalog are
+    loaded once. Components of all pipelines are retrieved in one batched
+    pre-pass and validated through a single pool, and components with the
+    same relative path and content in several pipelines are sent to the LLM
+    only once.
+    """
+
+    def __init__(self, pipeline_paths: List[str], vectorstore_path: str = "nfcore_vectorstore",
+                 openai_api_key: str = None, use_cache: bool = True, cache_dir: str = DEFAULT_CACHE_DIR,
+                 static_only: bool = False, module_catalog: Optional[str] = None, retrieval_mode: str = "vector",
+                 use_guideline_packs: bool = True):
+        """Initialize the batch scanner
+
+        Args:
+            pipeline_paths: Paths or glob patterns of the pipelines to scan
+            vectorstore_path: Path to the vector store with nf-core documentation
+            openai_api_key: OpenAI API key for LLM and embeddings
+            use_cache: Whether to reuse cached validation results
+            cache_dir: Directory of the persistent result cache
+            static_only: Only evaluate the static rules, without any LLM calls
+            module_catalog: Path to a module catalog (see build_catalog)
+            retrieval_mode: How guidelines are retrieved: "lexical", "vector" or "hybrid"
+            use_guideline_packs: Use the precomputed guideline pack of each
+                component type instead of per-component retrieval
+        """
+        paths = expand_pipeline_paths(pipeline_paths)
+        if not paths:
+            raise ValueError("No pipelines to validate")
+
+        self.validator = NfCoreValidator(
+            vectorstore_path,
+            openai_api_key,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            static_only=static_only,
+            retrieval_mode=retrieval_mode,
+            use_guideline_packs=use_guideline_packs
+        )
+        catalog = ModuleCatalog.load(module_catalog).for_validator(self.validator) if module_catalog else None
+        self.scanners = [
+            PipelineScanner(path, validator=self.validator, module_catalog=catalog)
+            for path in paths
+        ]
+
+    def generate_reports(self, output_dir: str = "", incremental: bool = False, since: Optional[str] = None,
+                         max_workers: int = 8, engine: str = "thread", resume: bool = False,
+                         fsync: str = "interval") -> Dict[str, Any]:
+        """Validate all pipelines and write per-pipeline reports and a fleet summary
+
+        Results of all pipelines are appended to one JSONL checkpoint
+        (<output_dir>/fleet.checkpoint.jsonl) as they complete, and each
+        report is assembled by streaming the checkpoint.
+
+        Args:
+            output_dir: Directory of the reports (defaults to the working
+                directory); reports are named <pipeline_name>_compliance_report.json
+            incremental: Only re-validate components that changed since each
+                pipeline's previous report
+            since: Git ref or ref range used to detect changed components
+                (implies incremental)
+            max_workers: Maximum number of components validated concurrently,
+                across all pipelines
+            engine: Scan engine, "thread" or "async"
+            resume: Continue an interrupted batch, skipping components that
+                already have a successful result in the checkpoint
+            fsync: Checkpoint fsync policy, "always", "interval" or "never"
+
+        Returns:
+            Fleet summary, also written to <output_dir>/fleet_summary.json
+        """
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        report_paths = [scanner.default_report_path(output_dir) for scanner in self.scanners]
+        if len(set(report_paths)) < len(report_paths):
+            raise ValueError("Pipelines in a batch must have distinct directory names")
+
+        incremental = incremental or bool(since)
+        manifests = []
+        plans = []
+        for scanner, report_path in zip(self.scanners, report_paths):
+            print(f"Planning {scanner.pipeline_path}")
+            manifest = scanner.load_manifest(ScanManifest.path_for_report(report_path), incremental)
+            manifests.append(manifest)
+            plans.append(scanner.plan_scan(manifest, since, incremental))
+
+        checkpoint = ScanCheckpoint(os.path.join(output_dir, "fleet.checkpoint.jsonl"), fsync)
+        checkpoint.open(resume)
+        try:
+            for scanner, plan in zip(self.scanners, plans):
+                plan["pending"] = scanner.checkpoint_plan(plan, checkpoint, resume)
+
+            hashes = {}
+            for plan in plans:
+                hashes.update(plan["hashes"])
+            unique, duplicates = self._group_duplicates(plans)
+            print(f"Validating {len(unique)} components from {len(self.scanners)} pipelines "
+                  f"({len(duplicates)} duplicates reuse their results)")
+
+            self.scanners[0].validate_components(unique, max_workers, engine, checkpoint, hashes)
+            for duplicate, original in duplicates.items():
+                result = self._copy_result(duplicate, checkpoint.result(original))
+                checkpoint.append(result, hashes.get(duplicate) or content_hash(duplicate))
+
+            pipelines = []
+            for scanner, plan, manifest, report_path in zip(self.scanners, plans, manifests, report_paths):
+                summary = scanner.write_report(plan, checkpoint, report_path, manifest)
+                manifest.save(ScanManifest.path_for_report(report_path))
+
+                pipelines.append({
+                    "pipeline_path": scanner.pipeline_path,
+                    "report": report_path,
+                    "total_components": summary["total_components"],
+                    "total_requirements": summary["total_requirements"],
+                    "passed_requirements": summary["passed_requirements"],
+                    "compliance_score": summary["compliance_score"],
+                    "errors": sum(1 for result in checkpoint.results(plan["components"]) if "error" in result)
+                })
+                print(f"Compliance report saved to {report_path} ({summary['compliance_score']}%)")
+        finally:
+            checkpoint.close()
+        checkpoint.close(remove=True)
+
+        fleet = self._fleet_summary(pipelines, len(unique), len(duplicates))
+        fleet_path = os.path.join(output_dir, "fleet_summary.json")
+        with open(fleet_path, "w") as f:
+            json.dump(fleet, f, indent=2)
+        print(f"Fleet summary saved to {fleet_path}")
+        print(f"Overall compliance score: {fleet['compliance_score']}%")
+        return fleet
+
+    def _group_duplicates(self, plans: List[Dict[str, Any]]):
+        """Find pending components that are identical across pipelines
+
+        Components count as identical if they have the same path relative to
+        their pipeline root and the same content, so they get the same prompt.
+
+        Args:
+            plans: Outputs of plan_scan, in the order of self.scanners
+
+        Returns:
+            Tuple of (components to validate, dictionary mapping each
+            duplicate to the component whose result it reuses)
+        """
+        unique = []
+        duplicates = {}
+        seen = {}
+        for scanner, plan in zip(self.scanners, plans):
+            for component in plan["pending"]:
+                try:
+                    component_hash = plan["hashes"].get(component) or content_hash(component)
+                    key = (os.path.relpath(component, scanner.pipeline_path), component_hash)
+                except OSError:
+                    unique.append(component)
+                    continue
+                if key in seen:
+                    duplicates[component] = seen[key]
+                else:
+                    seen[key] = component
+                    unique.append(component)
+        return unique, duplicates
+
+    def _copy_result(self, component: str, result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Reuse the result of an identical component from another pipeline
+
+        Static rules depend on the files around a component, so they are
+        evaluated again for copies of files.
+
+        Args:
+            component: Path of the duplicate component
+            result: Result of the original component
+
+        Returns:
+            Result for the duplicate
+        """
+        if result is None or "error" in result or os.path.isdir(component):
+            copy = dict(result or {"error": "Component was not validated"})
+            copy["path"] = component
+            return copy
+        try:
+            with open(component, "r") as f:
+                code = f.read()
+        except OSError as e:
+            return {"error": f"Failed to read file: {str(e)}", "path": component}
+        return self.validator.refresh_static_rules(component, code, result)
+
+    def _fleet_summary(self, pipelines: List[Dict[str, Any]], validated: int, shared: int) -> Dict[str, Any]:
+        """Build the fleet summary over all pipeline reports
+
+        Args:
+            pipelines: Per-pipeline summary entries
+            validated: Number of distinct components validated
+            shared: Number of components that reused the result of an
+                identical component in another pipeline
+
+        Returns:
+            Fleet summary dictionary
+        """
+        total_requirements = sum(p["total_requirements"] for p in pipelines)
+        passed_requirements = sum(p["passed_requirements"] for p in pipelines)
+        compliance_score = 0
+        if total_requirements > 0:
+            compliance_score = round((passed_requirements / total_requirements) * 100, 2)
+
+        fleet = {
+            "total_pipelines": len(pipelines),
+            "total_components": sum(p["total_components"] for p in pipelines),
+            "validated_components": validated,
+            "shared_components": shared,
+            "total_requirements": total_requirements,
+            "passed_requirements": passed_requirements,
+            "compliance_score": compliance_score,
+            "pipelines": sorted(pipelines, key=lambda p: p["compliance_score"])
+        }
+        if self.validator.cache is not None:
+            fleet["cache"] = self.validator.cache.stats()
+        fleet["rate_limits"] = self.validator.scheduler.stats()
+        return fleet
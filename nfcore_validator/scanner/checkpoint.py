@@ -0,0 +1,184 @@
+"""
+Append-only JSONL checkpoint of component results for resumable scans
+"""
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+FSYNC_POLICIES = ["always", "interval", "never"]
+
+
+class ScanCheckpoint:
+    """Appends each component result to a JSONL file as soon as it completes
+
+    Every line holds one result with the content hash of its component.
+    Only the file offset of each component's latest line is kept in memory,
+    so reports are assembled by streaming the results back from disk. A
+    scan that crashes can be resumed: components with a successful result
+    for their current content are not validated again.
+
+    The fsync policy trades durability for speed: "always" syncs after
+    every result, "interval" at most once per fsync_interval seconds, and
+    "never" leaves it to the operating system (results still survive a
+    crash of the process, but not of the machine).
+    """
+
+    def __init__(self, checkpoint_path: str, fsync: str = "interval", fsync_interval: float = 1.0):
+        """Initialize the checkpoint
+
+        Args:
+            checkpoint_path: Path to the JSONL file
+            fsync: One of FSYNC_POLICIES
+            fsync_interval: Seconds between syncs with the "interval" policy
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}. Choose from {', '.join(FSYNC_POLICIES)}")
+        self.checkpoint_path = checkpoint_path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._index: Dict[str, Tuple[int, str, bool]] = {}
+        self._file = None
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def path_for_report(report_path: str) -> str:
+        """Get the checkpoint path that belongs to a JSON report
+
+        Args:
+            report_path: Path to the JSON report
+
+        Returns:
+            Path to the checkpoint file
+        """
+        return os.path.splitext(report_path)[0] + ".checkpoint.jsonl"
+
+    def open(self, resume: bool = False) -> None:
+        """Open the checkpoint for appending
+
+        Args:
+            resume: Keep and index the results of a previous, interrupted
+                scan; otherwise any existing checkpoint is discarded
+        """
+        if resume and os.path.exists(self.checkpoint_path):
+            self._load_index()
+        else:
+            self._index = {}
+            open(self.checkpoint_path, "w").close()
+        self._file = open(self.checkpoint_path, "ab")
+
+    def completed(self, component_path: str, component_hash: str) -> bool:
+        """Check whether a component has a successful result for its current content
+
+        Args:
+            component_path: Path to the component
+            component_hash: Current content hash of the component
+
+        Returns:
+            True if the component does not need to be validated again
+        """
+        entry = self._index.get(component_path)
+        return entry is not None and entry[1] == component_hash and entry[2]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def append(self, result: Dict[str, Any], component_hash: str) -> None:
+        """Write a component result to the checkpoint
+
+        Args:
+            result: Validation result with a "path"
+            component_hash: Content hash of the component
+        """
+        line = (json.dumps({"hash": component_hash, "result": result}) + "\n").encode("utf-8")
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            now = time.monotonic()
+            if self.fsync == "always" or (self.fsync == "interval" and now - self._last_sync >= self.fsync_interval):
+                os.fsync(self._file.fileno())
+                self._last_sync = now
+            self._index[result.get("path")] = (offset, component_hash, "error" not in result)
+
+    def result(self, component_path: str) -> Optional[Dict[str, Any]]:
+        """Read the latest result of a component back from disk
+
+        Args:
+            component_path: Path to the component
+
+        Returns:
+            Validation result, or None if the component has no result
+        """
+        entry = self._index.get(component_path)
+        if entry is None:
+            return None
+        with self._lock:
+            self._file.flush()
+            with open(self.checkpoint_path, "rb") as f:
+                f.seek(entry[0])
+                return json.loads(f.readline())["result"]
+
+    def results(self, component_paths: List[str]) -> Iterator[Dict[str, Any]]:
+        """Stream the latest results of components in the given order
+
+        Args:
+            component_paths: Paths of the components; components without a
+                result are skipped
+
+        Yields:
+            Validation results
+        """
+        with self._lock:
+            self._file.flush()
+        with open(self.checkpoint_path, "rb") as f:
+            for component_path in component_paths:
+                entry = self._index.get(component_path)
+                if entry is None:
+                    continue
+                f.seek(entry[0])
+                yield json.loads(f.readline())["result"]
+
+    def close(self, remove: bool = False) -> None:
+        """Sync and close the checkpoint
+
+        Args:
+            remove: Delete the checkpoint file, e.g. once the report is written
+        """
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync != "never":
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+        if remove and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def _load_index(self) -> None:
+        """Index the lines of an existing checkpoint
+
+        A line cut off by a crash is truncated, so new results start on a
+        clean line.
+        """
+        self._index = {}
+        end = 0
+        with open(self.checkpoint_path, "rb") as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                    result = record["result"]
+                except (ValueError, KeyError):
+                    break
+                self._index[result.get("path")] = (offset, record.get("hash", ""), "error" not in result)
+                end = f.tell()
+        if end < os.path.getsize(self.checkpoint_path):
+            print(f"Warning: Discarding an incomplete line at the end of {self.checkpoint_path}")
+            with open(self.checkpoint_path, "r+b") as f:
+                f.truncate(end)
+        print(f"Resuming from {self.checkpoint_path} with {len(self._index)} recorded results")
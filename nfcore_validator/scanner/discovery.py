@@ -0,0 +1,183 @@
+"""
+Single-pass discovery of pipeline components
+"""
+import os
+import re
+import fnmatch
+from typing import List, NamedTuple, Optional, Tuple
+
+from ..utils.component_types import determine_component_type
+
+# Excluded in every pipeline, in .gitignore syntax: run outputs and caches
+DEFAULT_EXCLUDES = ["work/", "results/", ".nextflow/", ".nf-test/", ".git/"]
+
+# Files in the pipeline root whose patterns are excluded as well
+IGNORE_FILES = [".nextflowignore", ".gitignore"]
+
+# Pipeline-level files, in report order
+PIPELINE_FILES = ["nextflow.config", "nextflow_schema.json", "README.md", "CHANGELOG.md", "LICENSE", "CITATIONS.md"]
+
+# Top-level directories that contain components; nothing else is walked
+COMPONENT_DIRECTORIES = ["modules", "workflows", "subworkflows", "conf"]
+
+
+class ComponentRecord(NamedTuple):
+    """A pipeline component found by discover_components"""
+    path: str
+    component_type: str
+    size: int
+    mtime: float
+
+
+class IgnoreRules:
+    """Exclusion patterns in a subset of .gitignore syntax
+
+    Blank lines and comments are skipped, a trailing "/" matches directories
+    only, and a pattern with a "/" before its end is matched against the
+    path relative to the pipeline root instead of the name. Negated
+    ("!") patterns are not supported and are skipped.
+    """
+
+    def __init__(self, patterns: List[str]):
+        """Compile the patterns
+
+        Args:
+            patterns: Patterns in .gitignore syntax
+        """
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith(("#", "!")):
+                continue
+            directory_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            anchored = "/" in pattern
+            if pattern:
+                self.rules.append((re.compile(fnmatch.translate(pattern.lstrip("/"))), anchored, directory_only))
+
+    @classmethod
+    def for_pipeline(cls, pipeline_path: str, excludes: Optional[List[str]] = None) -> "IgnoreRules":
+        """Build the rules of a pipeline from the defaults and its ignore files
+
+        Args:
+            pipeline_path: Path to the pipeline root
+            excludes: Additional patterns
+
+        Returns:
+            IgnoreRules instance
+        """
+        patterns = list(DEFAULT_EXCLUDES) + list(excludes or [])
+        for ignore_file in IGNORE_FILES:
+            try:
+                with open(os.path.join(pipeline_path, ignore_file), "r") as f:
+                    patterns.extend(f.read().splitlines())
+            except OSError:
+                pass
+        return cls(patterns)
+
+    def excluded(self, rel_path: str, is_dir: bool) -> bool:
+        """Check whether a path is excluded
+
+        Args:
+            rel_path: Path relative to the pipeline root, with "/" separators
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if any pattern matches
+        """
+        name = rel_path.rsplit("/", 1)[-1]
+        for regex, anchored, directory_only in self.rules:
+            if directory_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                return True
+        return False
+
+
+def _record(entry: os.DirEntry, path: str, is_dir: bool) -> ComponentRecord:
+    """Build the record of a discovered component"""
+    stat = entry.stat(follow_symlinks=True)
+    return ComponentRecord(path, determine_component_type(path, is_dir), 0 if is_dir else stat.st_size, stat.st_mtime)
+
+
+def _is_component(top: str, rel_path: str, name: str) -> bool:
+    """Check whether a file below one of COMPONENT_DIRECTORIES is a component
+
+    Modules are main.nf files at any depth, subworkflows any .nf file at any
+    depth (nf-core subworkflows live in subworkflows/<source>/<name>/main.nf),
+    workflows .nf files directly in workflows/ and configs .config files
+    directly in conf/.
+    """
+    if top == "modules":
+        return name == "main.nf"
+    if top == "subworkflows":
+        return name.endswith(".nf")
+    nested = rel_path.count("/") > 1
+    if top == "workflows":
+        return name.endswith(".nf") and not nested
+    return name.endswith(".config") and not nested
+
+
+def discover_components(pipeline_path: str, excludes: Optional[List[str]] = None) -> List[ComponentRecord]:
+    """Find all components of a pipeline in one pruned directory traversal
+
+    Only the pipeline root and the component directories are read, each
+    directory once with os.scandir. Excluded directories (DEFAULT_EXCLUDES,
+    the patterns of .nextflowignore and .gitignore, and excludes) are never
+    entered, so run outputs cost nothing no matter how many files they hold.
+
+    Args:
+        pipeline_path: Path to the pipeline root
+        excludes: Additional patterns in .gitignore syntax
+
+    Returns:
+        Component records in report order: modules, workflows, subworkflows,
+        main.nf, pipeline files, conf/*.config and the tests directory
+    """
+    pipeline_path = os.path.abspath(pipeline_path)
+    rules = IgnoreRules.for_pipeline(pipeline_path, excludes)
+    found = {top: [] for top in COMPONENT_DIRECTORIES}
+    root_files = {}
+    tests = None
+
+    with os.scandir(pipeline_path) as it:
+        root_entries = sorted(it, key=lambda entry: entry.name)
+
+    stack = []
+    for entry in root_entries:
+        is_dir = entry.is_dir()
+        if rules.excluded(entry.name, is_dir):
+            continue
+        if is_dir and entry.name in found:
+            stack.append((entry.name, entry.name))
+        elif is_dir and entry.name == "tests":
+            tests = _record(entry, entry.path, True)
+        elif not is_dir and (entry.name == "main.nf" or entry.name in PIPELINE_FILES):
+            root_files[entry.name] = _record(entry, entry.path, False)
+
+    while stack:
+        top, rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(pipeline_path, rel_dir)) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}"
+            is_dir = entry.is_dir()
+            if rules.excluded(rel_path, is_dir):
+                continue
+            if is_dir:
+                stack.append((top, rel_path))
+            elif _is_component(top, rel_path, entry.name):
+                found[top].append(_record(entry, entry.path, False))
+
+    for records in found.values():
+        records.sort()
+
+    components = found["modules"] + found["workflows"] + found["subworkflows"]
+    components.extend(root_files[name] for name in ["main.nf"] + PIPELINE_FILES if name in root_files)
+    components.extend(found["conf"])
+    if tests is not None:
+        components.append(tests)
+    return components
@@ -0,0 +1,233 @@
+"""
+Component manifest for incremental pipeline scans
+"""
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from typing import Dict, Any, Optional, Set
+
+from ..validator.directory_summary import summarize_directory
+
+
+def content_hash(component_path: str) -> str:
+    """Hash the content of a pipeline component
+
+    Files are hashed by their bytes. Directories (like ``tests``) are
+    validated from their bounded summary only, so they are hashed by that
+    summary; ignored subdirectories such as ``work`` do not affect it.
+
+    Args:
+        component_path: Path to the component file or directory
+
+    Returns:
+        Hex digest of the component content
+    """
+    digest = hashlib.sha256()
+    if os.path.isdir(component_path):
+        digest.update(summarize_directory(component_path).encode("utf-8"))
+    else:
+        with open(component_path, "rb") as f:
+            for block in iter(lambda: f.read(65536), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def git_changed_files(repo_path: str, since: str) -> Set[str]:
+    """List files changed in a git ref range
+
+    Args:
+        repo_path: Path inside the git repository
+        since: Either a range like ``A..B`` or a single ref, which is
+            compared against the working tree
+
+    Returns:
+        Set of absolute paths of changed files
+    """
+    toplevel = subprocess.run(
+        ["git", "-C", repo_path, "rev-parse", "--show-toplevel"],
+        check=True, capture_output=True, text=True
+    ).stdout.strip()
+    diff = subprocess.run(
+        ["git", "-C", toplevel, "diff", "--name-only", since],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return {
+        os.path.join(toplevel, line.strip())
+        for line in diff.splitlines() if line.strip()
+    }
+
+
+class ScanManifest:
+    """Records the content hash and last result of each pipeline component
+
+    Paths are stored relative to the pipeline root so a manifest written by
+    one checkout can be reused by another (e.g. between CI runs).
+
+    The manifest file only holds the content hash of each component and the
+    offset of its result in a JSONL file next to it
+    (<report>.manifest.results.jsonl). Previous results are read from that
+    file on lookup, and recorded results are streamed to a temporary file,
+    so memory use does not grow with the size of the results.
+    """
+
+    def __init__(self, pipeline_path: str, entries: Optional[Dict[str, Dict[str, Any]]] = None,
+                 results_path: Optional[str] = None):
+        """Initialize the manifest
+
+        Args:
+            pipeline_path: Absolute path to the pipeline root
+            entries: Existing entries keyed by relative component path
+            results_path: JSONL file holding the results the entries point to
+        """
+        self.pipeline_path = pipeline_path
+        self.entries = entries or {}
+        self.results_path = results_path
+        self._results_file = None
+        self._recorded: Dict[str, Dict[str, Any]] = {}
+        self._recorded_file = None
+
+    @staticmethod
+    def path_for_report(report_path: str) -> str:
+        """Get the manifest path that belongs to a JSON report
+
+        Args:
+            report_path: Path to the JSON report
+
+        Returns:
+            Path to the manifest file
+        """
+        return os.path.splitext(report_path)[0] + ".manifest.json"
+
+    @staticmethod
+    def results_path_for(manifest_path: str) -> str:
+        """Get the path of the JSONL results file of a manifest
+
+        Args:
+            manifest_path: Path to the manifest file
+
+        Returns:
+            Path to the results file
+        """
+        return os.path.splitext(manifest_path)[0] + ".results.jsonl"
+
+    @classmethod
+    def load(cls, manifest_path: str, pipeline_path: str) -> "ScanManifest":
+        """Load a manifest, or return an empty one if it does not exist
+
+        Args:
+            manifest_path: Path to the manifest file
+            pipeline_path: Absolute path to the pipeline root
+
+        Returns:
+            ScanManifest instance
+        """
+        if not os.path.exists(manifest_path):
+            return cls(pipeline_path)
+
+        try:
+            with open(manifest_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable manifest {manifest_path}: {str(e)}")
+            return cls(pipeline_path)
+
+        return cls(pipeline_path, data.get("components", {}), cls.results_path_for(manifest_path))
+
+    def save(self, manifest_path: str) -> None:
+        """Write the components recorded since loading to disk
+
+        Components that were not recorded (e.g. because they were removed
+        from the pipeline) are dropped.
+
+        Args:
+            manifest_path: Path to the manifest file
+        """
+        results_path = self.results_path_for(manifest_path)
+        tmp_path = results_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            if self._recorded_file is not None:
+                self._recorded_file.seek(0)
+                shutil.copyfileobj(self._recorded_file, f)
+        self.close()
+        os.replace(tmp_path, results_path)
+
+        with open(manifest_path, "w") as f:
+            json.dump({"pipeline_path": self.pipeline_path, "components": self._recorded}, f, indent=2)
+        self.entries = self._recorded
+        self.results_path = results_path
+        self._recorded = {}
+
+    def close(self) -> None:
+        """Close the files holding previous and recorded results"""
+        for handle in (self._results_file, self._recorded_file):
+            if handle is not None:
+                handle.close()
+        self._results_file = None
+        self._recorded_file = None
+
+    def lookup(self, component_path: str, component_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get the stored result of an unchanged component
+
+        Args:
+            component_path: Absolute path to the component
+            component_hash: Current content hash; when None the component is
+                assumed unchanged (used when changes come from git)
+
+        Returns:
+            The previous result, or None if the component must be re-validated
+        """
+        entry = self.entries.get(self._relative(component_path))
+        if entry is None:
+            return None
+        if component_hash is not None and entry.get("content_hash") != component_hash:
+            return None
+
+        result = self._read_result(entry)
+        if not result or "error" in result:
+            return None
+
+        result = dict(result)
+        result["path"] = component_path
+        return result
+
+    def record(self, component_path: str, component_hash: str, result: Dict[str, Any]) -> None:
+        """Store the result of a component
+
+        Args:
+            component_path: Absolute path to the component
+            component_hash: Content hash of the component
+            result: Validation result
+        """
+        if self._recorded_file is None:
+            self._recorded_file = tempfile.TemporaryFile()
+        offset = self._recorded_file.tell()
+        self._recorded_file.write((json.dumps(result) + "\n").encode("utf-8"))
+        self._recorded[self._relative(component_path)] = {
+            "content_hash": component_hash,
+            "offset": offset
+        }
+
+    def _read_result(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Read the result an entry points to
+
+        Manifests written before results moved to the JSONL file hold the
+        result in the entry itself.
+        """
+        if "result" in entry:
+            return entry["result"]
+        if "offset" not in entry or not self.results_path:
+            return None
+        try:
+            if self._results_file is None:
+                self._results_file = open(self.results_path, "rb")
+            self._results_file.seek(entry["offset"])
+            return json.loads(self._results_file.readline())
+        except (OSError, ValueError):
+            return None
+
+    def _relative(self, component_path: str) -> str:
+        """Get the manifest key of a component"""
+        return os.path.relpath(component_path, self.pipeline_path)
@@ -2,28 +2,71 @@
 Pipeline scanner for nf-core compliance
 """
 import os
-import glob
 import json
-from typing import Dict, List, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
-import re
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Any, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from ..validator.llm_validator import NfCoreValidator
+from ..validator.result_cache import DEFAULT_CACHE_DIR
+from ..validator.module_catalog import ModuleCatalog
+from ..validator.directory_summary import summarize_directory
+from .manifest import ScanManifest, content_hash, git_changed_files
+from .checkpoint import ScanCheckpoint
+from .discovery import ComponentRecord, discover_components
+from .progress import ScanCancelled, ScanProgress
+
+# Seconds between checks of the cancel event while waiting for results
+CANCEL_POLL_INTERVAL = 0.1
 
 class PipelineScanner:
     """Scanner for nf-core pipeline compliance"""
     
-    def __init__(self, pipeline_path: str, vectorstore_path: str = "nfcore_vectorstore", openai_api_key: str = None):
+    def __init__(self, pipeline_path: str, vectorstore_path: str = "nfcore_vectorstore", openai_api_key: str = None,
+                 use_cache: bool = True, cache_dir: str = DEFAULT_CACHE_DIR, static_only: bool = False,
+                 module_catalog: Optional[Union[str, ModuleCatalog]] = None,
+                 validator: Optional[NfCoreValidator] = None, retrieval_mode: str = "vector",
+                 use_guideline_packs: bool = True, exclude: Optional[List[str]] = None):
         """Initialize the scanner
         
         Args:
             pipeline_path: Path to the pipeline to scan
             vectorstore_path: Path to the vector store with nf-core documentation
             openai_api_key: OpenAI API key for LLM and embeddings
+            use_cache: Whether to reuse cached validation results
+            cache_dir: Directory of the persistent result cache
+            static_only: Only evaluate the static rules, without any LLM calls
+            module_catalog: Module catalog, or the path to one (see
+                build_catalog); unmodified nf-core modules found in it are not
+                validated again. A catalog built with another model (or with
+                the static rules only) is ignored with a warning
+            validator: Validator shared with other scanners; when given, the
+                vector store, API key, cache, static_only, retrieval_mode and
+                use_guideline_packs arguments are ignored
+            retrieval_mode: How guidelines are retrieved: "lexical" (BM25, no
+                query embedding), "vector" or "hybrid"
+            use_guideline_packs: Use the precomputed guideline pack of each
+                component type instead of per-component retrieval
+            exclude: Additional .gitignore-style patterns of paths to skip
+                when finding components
         """
         self.pipeline_path = os.path.abspath(pipeline_path)
-        self.validator = NfCoreValidator(vectorstore_path, openai_api_key)
+        self.validator = validator or NfCoreValidator(
+            vectorstore_path,
+            openai_api_key,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            static_only=static_only,
+            retrieval_mode=retrieval_mode,
+            use_guideline_packs=use_guideline_packs
+        )
+        if isinstance(module_catalog, str):
+            module_catalog = ModuleCatalog.load(module_catalog)
+        if module_catalog is not None:
+            module_catalog = module_catalog.for_validator(self.validator)
+        self.catalog = module_catalog
+        self.exclude = exclude
         
         if not os.path.exists(self.pipeline_path):
             raise ValueError(f"Pipeline path does not exist: {self.pipeline_path}")
@@ -34,175 +77,717 @@ class PipelineScanner:
         Returns:
             List of component file paths
         """
-        components = []
-        
-        # Find modules
-        module_paths = glob.glob(f"{self.pipeline_path}/modules/**/main.nf", recursive=True)
-        components.extend(module_paths)
-        
-        # Find workflows
-        workflow_paths = glob.glob(f"{self.pipeline_path}/workflows/*.nf", recursive=True)
-        components.extend(workflow_paths)
-        
-        # Find subworkflows
-        subworkflow_paths = glob.glob(f"{self.pipeline_path}/subworkflows/*.nf", recursive=True)
-        components.extend(subworkflow_paths)
-        
-        # Find main workflow
-        main_workflow = f"{self.pipeline_path}/main.nf"
-        if os.path.exists(main_workflow):
-            components.append(main_workflow)
-            
-        # Add pipeline-level files for validation
-        pipeline_files = [
-            f"{self.pipeline_path}/nextflow.config",
-            f"{self.pipeline_path}/nextflow_schema.json",
-            f"{self.pipeline_path}/README.md",
-            f"{self.pipeline_path}/CHANGELOG.md",
-            f"{self.pipeline_path}/LICENSE",
-            f"{self.pipeline_path}/CITATIONS.md"
-        ]
-        
-        for file_path in pipeline_files:
-            if os.path.exists(file_path):
-                components.append(file_path)
-                
-        # Add config directory files
-        conf_dir = f"{self.pipeline_path}/conf"
-        if os.path.exists(conf_dir):
-            conf_files = glob.glob(f"{conf_dir}/*.config")
-            components.extend(conf_files)
-            
-        # Add test data directories
-        test_dir = f"{self.pipeline_path}/tests"
-        if os.path.exists(test_dir):
-            components.append(test_dir)
-            
-        return components
-    
-    def scan_pipeline(self, max_workers: int = 4) -> Dict[str, Any]:
+        return [record.path for record in self.discover_components()]
+    
+    def discover_components(self) -> List[ComponentRecord]:
+        """Find all components in the pipeline with their type, size and mtime
+        
+        See discovery.discover_components; directories excluded by the
+        defaults, .nextflowignore, .gitignore or the scanner's exclude
+        patterns are not walked.
+        
+        Returns:
+            List of component records
+        """
+        return discover_components(self.pipeline_path, self.exclude)
+    
+    def scan_pipeline(self, max_workers: int = 4, manifest: Optional[ScanManifest] = None,
+                      since: Optional[str] = None, engine: str = "thread") -> Dict[str, Any]:
         """Scan the pipeline for compliance
         
         Args:
-            max_workers: Maximum number of parallel workers
+            max_workers: Maximum number of components validated concurrently
+            manifest: Manifest of a previous scan; when given, only new or
+                changed components are re-validated and the rest is reused
+            since: Git ref or ref range; when given together with a manifest,
+                components are considered changed if git reports them changed
+            engine: "thread" to validate in a thread pool, or "async" to
+                validate on an asyncio event loop
             
         Returns:
             Dictionary with scan results
         """
+        plan = self.plan_scan(manifest, since)
+        plan["results"].extend(self.validate_components(plan["pending"], max_workers, engine))
+        return self.build_report(plan, manifest)
+        
+    def scan_iter(self, max_workers: int = 4, manifest: Optional[ScanManifest] = None,
+                  since: Optional[str] = None, progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  cancel: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """Scan the pipeline, yielding each component result as soon as it is available
+        
+        Reused results (from the manifest or the module catalog) are yielded
+        first, then the result of each validated component in completion
+        order. Components are validated in a thread pool.
+        
+        Setting cancel, or stopping the iteration early (break or close()),
+        cancels the components that have not made their LLM call yet. Calls
+        already in flight finish in the background and their results are
+        dropped.
+        
+        Args:
+            max_workers: Maximum number of components validated concurrently
+            manifest: Manifest of a previous scan; when given, only new or
+                changed components are validated
+            since: Git ref or ref range used with the manifest
+            progress: Called with a progress event dictionary for every stage
+                of every validated component (see ScanProgress); called from
+                worker threads
+            cancel: Event that cancels the scan once set
+        
+        Yields:
+            Component results
+        """
+        plan = self.plan_scan(manifest, since)
+        tracker = ScanProgress(progress, cancel)
+        yield from plan["results"]
+        
+        for component in plan["pending"]:
+            tracker.emit("queued", component)
+        if tracker.cancelled:
+            return
+        guidelines = self._prefetch_guidelines(plan["pending"])
+        yield from self._iter_threaded(plan["pending"], max_workers, guidelines, tracker)
+    
+    async def ascan_iter(self, max_workers: int = 4, manifest: Optional[ScanManifest] = None,
+                         since: Optional[str] = None, progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                         cancel: Optional[threading.Event] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Async counterpart of scan_iter
+        
+        Components are validated on the running event loop; planning and the
+        batched guideline retrieval run in the loop's default executor, so
+        the loop is never blocked. Cancelling (or closing the generator with
+        aclose()) also cancels the LLM calls in flight.
+        
+        Args:
+            max_workers: Maximum number of components validated concurrently
+            manifest: Manifest of a previous scan, if any
+            since: Git ref or ref range used with the manifest
+            progress: Progress event callback (see ScanProgress)
+            cancel: Event that cancels the scan once set
+        
+        Yields:
+            Component results
+        """
+        loop = asyncio.get_running_loop()
+        plan = await loop.run_in_executor(None, self.plan_scan, manifest, since)
+        tracker = ScanProgress(progress, cancel)
+        for result in plan["results"]:
+            yield result
+        
+        for component in plan["pending"]:
+            tracker.emit("queued", component)
+        if tracker.cancelled:
+            return
+        guidelines = await loop.run_in_executor(None, self._prefetch_guidelines, plan["pending"])
+        async for result in self._aiter_components(plan["pending"], max_workers, guidelines, tracker):
+            yield result
+    
+    def plan_scan(self, manifest: Optional[ScanManifest] = None, since: Optional[str] = None,
+                  incremental: bool = True) -> Dict[str, Any]:
+        """Find the components of the pipeline and decide which need validating
+        
+        Results of unchanged components (from the manifest) and of unmodified
+        nf-core modules (from the module catalog) are reused.
+        
+        Args:
+            manifest: Manifest of a previous scan, if any
+            since: Git ref or ref range used with the manifest
+            incremental: Whether an incremental scan was requested; False for
+                a full scan that only records its results in a fresh manifest
+            
+        Returns:
+            Dictionary with all components, the pending ones, the reused
+            results, the content hashes, the number of inherited modules and
+            whether the scan is incremental
+        """
         components = self.find_components()
         print(f"Found {len(components)} components to validate")
         
         results = []
-        total_requirements = 0
-        passed_requirements = 0
-        
-        # Process components with rate limiting
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_component = {}
-            
-            # Submit initial batch of tasks
-            batch_size = min(max_workers, len(components))
-            for i in range(batch_size):
-                component = components[i]
-                future = executor.submit(self.validator.validate_component, component)
-                future_to_component[future] = component
-                
-            # Process results and submit new tasks with rate limiting
-            component_index = batch_size
-            for future in as_completed(future_to_component):
-                component = future_to_component[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    # Update counters
-                    if "requirements" in result:
-                        for req in result["requirements"]:
-                            total_requirements += 1
-                            if req.get("status") == "passed":
-                                passed_requirements += 1
-                                
-                    print(f"Processed component: {os.path.basename(component)}")
-                    
-                    # Add a small delay to avoid rate limiting
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    print(f"Error processing {component}: {error_msg}")
-                    
-                    # If rate limited, wait and retry
-                    if "Rate limit reached" in error_msg:
-                        wait_time = 15  # Default wait time
-                        # Try to extract wait time from error message
-                        match = re.search(r"Please try again in (\d+\.\d+)s", error_msg)
-                        if match:
-                            wait_time = float(match.group(1)) + 1  # Add a buffer
-                            
-                        print(f"Rate limited. Waiting {wait_time} seconds before continuing...")
-                        time.sleep(wait_time)
-                        
-                        # Retry this component
-                        try:
-                            result = self.validator.validate_component(component)
-                            results.append(result)
-                        except Exception as retry_e:
-                            print(f"Retry failed for {component}: {str(retry_e)}")
-                            results.append({
-                                "error": str(retry_e),
-                                "path": component
-                            })
-                    else:
-                        results.append({
-                            "error": error_msg,
-                            "path": component
-                        })
-                
-                # Submit next task if available
-                if component_index < len(components):
-                    next_component = components[component_index]
-                    future = executor.submit(self.validator.validate_component, next_component)
-                    future_to_component[future] = next_component
-                    component_index += 1
+        pending = components
+        hashes = {}
+        
+        incremental = manifest is not None and (incremental or bool(since))
+        if manifest is not None:
+            # Also hashes every component, for the checkpoint and the manifest
+            pending = self._select_changed(components, manifest, since, hashes, results)
+        if incremental:
+            print(f"Incremental scan: re-validating {len(pending)} changed components, "
+                  f"reusing {len(results)} unchanged results")
+        
+        inherited = 0
+        if self.catalog is not None:
+            pending, inherited = self._inherit_modules(pending, results)
+            print(f"Inherited {inherited} unmodified nf-core modules from the module catalog")
+        
+        return {
+            "components": components,
+            "pending": pending,
+            "results": results,
+            "hashes": hashes,
+            "inherited": inherited,
+            "incremental": incremental
+        }
+    
+    def validate_components(self, components: List[str], max_workers: int = 4, engine: str = "thread",
+                            checkpoint: Optional[ScanCheckpoint] = None,
+                            hashes: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Retrieve guidelines for and validate a list of components
+        
+        Args:
+            components: Component paths, which may belong to other pipelines
+                scanned with the same validator
+            max_workers: Maximum number of components validated concurrently
+            engine: "thread" or "async"
+            checkpoint: Open checkpoint; when given, each result is appended
+                to it as soon as it completes instead of being kept in memory
+            hashes: Content hashes of the components (from plan_scan), stored
+                with their checkpointed results
+            
+        Returns:
+            List of validation results; empty when a checkpoint is given
+        """
+        if engine not in ("thread", "async"):
+            raise ValueError(f"Unknown scan engine: {engine}")
+        guidelines = self._prefetch_guidelines(components)
+        
+        if engine == "async":
+            return asyncio.run(self._validate_async(components, max_workers, guidelines, checkpoint, hashes))
+        return self._validate_threaded(components, max_workers, guidelines, checkpoint, hashes)
+    
+    def build_report(self, plan: Dict[str, Any], manifest: Optional[ScanManifest] = None) -> Dict[str, Any]:
+        """Build the report of a scan and record its results in the manifest
+        
+        Args:
+            plan: Output of plan_scan, with the new results added to "results"
+            manifest: Manifest to record the results in, if any
+            
+        Returns:
+            Dictionary with scan results
+        """
+        results = plan["results"]
+        counts = [0, 0]
+        for result in results:
+            self._record_result(plan, manifest, result, counts)
+        
+        return {
+            "pipeline_path": self.pipeline_path,
+            "components": results,
+            "summary": self._summary(plan, counts)
+        }
+    
+    def write_report(self, plan: Dict[str, Any], checkpoint: ScanCheckpoint, output_path: str,
+                     manifest: Optional[ScanManifest] = None) -> Dict[str, Any]:
+        """Write the report of a scan by streaming the results from a checkpoint
+        
+        Only one component result is held in memory at a time; the manifest
+        streams the results it records to disk as well. The report is
+        written to a temporary file first, so an interrupted write never
+        replaces a previous report.
+        
+        Args:
+            plan: Output of plan_scan
+            checkpoint: Checkpoint with the results of all components
+            output_path: Path to save the report (JSON)
+            manifest: Manifest to record the results in, if any
+            
+        Returns:
+            Report summary
+        """
+        counts = [0, 0]
+        tmp_path = output_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write('{\n  "pipeline_path": ' + json.dumps(self.pipeline_path) + ',\n  "components": [')
+            separator = "\n"
+            for result in checkpoint.results(plan["components"]):
+                self._record_result(plan, manifest, result, counts)
+                f.write(separator + self._indent(json.dumps(result, indent=2), 4))
+                separator = ",\n"
+            summary = self._summary(plan, counts)
+            f.write('\n  ],\n  "summary": ' + self._indent(json.dumps(summary, indent=2), 2).lstrip() + "\n}")
+        os.replace(tmp_path, output_path)
+        return summary
+    
+    def _record_result(self, plan: Dict[str, Any], manifest: Optional[ScanManifest],
+                       result: Dict[str, Any], counts: List[int]) -> None:
+        """Record a result in the manifest and count its requirements
+        
+        Args:
+            plan: Output of plan_scan
+            manifest: Manifest to record the result in, if any
+            result: Component result
+            counts: [total, passed] requirement counters, updated in place
+        """
+        path = result.get("path")
+        if manifest is not None and path:
+            manifest.record(path, self._hash_of(path, plan["hashes"]), result)
+        for req in result.get("requirements", []):
+            counts[0] += 1
+            if req.get("status") == "passed":
+                counts[1] += 1
+    
+    def _summary(self, plan: Dict[str, Any], counts: List[int]) -> Dict[str, Any]:
+        """Build the report summary
+        
+        Args:
+            plan: Output of plan_scan
+            counts: [total, passed] requirement counts
+            
+        Returns:
+            Summary dictionary
+        """
+        total_requirements, passed_requirements = counts
         
         # Calculate compliance score
         compliance_score = 0
         if total_requirements > 0:
             compliance_score = round((passed_requirements / total_requirements) * 100, 2)
-            
-        # Build report
-        report = {
-            "pipeline_path": self.pipeline_path,
-            "components": results,
-            "summary": {
-                "total_components": len(components),
-                "total_requirements": total_requirements,
-                "passed_requirements": passed_requirements,
-                "compliance_score": compliance_score
+        
+        summary = {
+            "total_components": len(plan["components"]),
+            "total_requirements": total_requirements,
+            "passed_requirements": passed_requirements,
+            "compliance_score": compliance_score
+        }
+        
+        if self.validator.cache is not None:
+            summary["cache"] = self.validator.cache.stats()
+        summary["rate_limits"] = self.validator.scheduler.stats()
+        
+        if self.catalog is not None:
+            summary["inherited_modules"] = plan["inherited"]
+        
+        if plan["incremental"]:
+            summary["incremental"] = {
+                "revalidated": len(plan["pending"]),
+                "reused": len(plan["components"]) - len(plan["pending"]) - plan["inherited"]
             }
+        
+        return summary
+    
+    @staticmethod
+    def _indent(text: str, width: int) -> str:
+        """Indent every line of a text"""
+        return "\n".join(" " * width + line for line in text.splitlines())
+    
+    def _inherit_modules(self, components: List[str], results: List[Dict[str, Any]]):
+        """Take the results of unmodified nf-core modules from the catalog
+        
+        Args:
+            components: Component paths to validate
+            results: Filled with the inherited results
+            
+        Returns:
+            Tuple of (components that still need to be validated, number of
+            inherited modules)
+        """
+        pending = []
+        inherited = 0
+        for component in components:
+            result = None
+            if component.endswith("main.nf"):
+                try:
+                    with open(component, "r") as f:
+                        code = f.read()
+                    result = self.catalog.lookup(component, code)
+                except OSError:
+                    pass
+            
+            if result is None:
+                pending.append(component)
+            else:
+                results.append(self.validator.refresh_static_rules(component, code, result))
+                inherited += 1
+        return pending, inherited
+    
+    def _prefetch_guidelines(self, components: List[str]) -> Dict[str, List[Any]]:
+        """Retrieve the guidelines of all components in one batched pre-pass
+        
+        Args:
+            components: Component paths to validate
+            
+        Returns:
+            Dictionary mapping component path to its guideline chunks; empty
+            if the pre-pass failed, in which case each component retrieves
+            its own guidelines
+        """
+        if not components or self.validator.static_only:
+            return {}
+        try:
+            guidelines = self.validator.prefetch_guidelines(components)
+        except Exception as e:
+            print(f"Warning: Batched guideline retrieval failed, retrieving per component: {str(e)}")
+            return {}
+        print(f"Retrieved guidelines for {len(guidelines)} components")
+        return guidelines
+    
+    def _validate_threaded(self, components: List[str], max_workers: int, guidelines: Dict[str, List[Any]],
+                           checkpoint: Optional[ScanCheckpoint] = None,
+                           hashes: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Validate components in a thread pool
+        
+        Args:
+            components: Component paths to validate
+            max_workers: Maximum number of parallel workers
+            guidelines: Prefetched guideline chunks by component path
+            checkpoint: Checkpoint to append results to instead of returning them
+            hashes: Content hashes of the components, if known
+        
+        Returns:
+            List of validation results
+        """
+        results = []
+        for result in self._iter_threaded(components, max_workers, guidelines, ScanProgress()):
+            self._collect(result, results, checkpoint, hashes)
+            print(f"Processed component: {os.path.basename(result['path'])}")
+        return results
+    
+    def _iter_threaded(self, components: List[str], max_workers: int, guidelines: Dict[str, List[Any]],
+                       tracker: ScanProgress) -> Iterator[Dict[str, Any]]:
+        """Validate components in a thread pool, yielding results as they complete
+        
+        Args:
+            components: Component paths to validate
+            max_workers: Maximum number of parallel workers
+            guidelines: Prefetched guideline chunks by component path
+            tracker: Progress tracker with the cancel event
+        
+        Yields:
+            Validation results, in completion order
+        """
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {
+            executor.submit(self._validate_safely, component, guidelines.get(component), tracker)
+            for component in components
         }
+        try:
+            while pending and not tracker.cancelled:
+                done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if not isinstance(future.exception(), ScanCancelled):
+                        yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    async def _validate_async(self, components: List[str], concurrency: int, guidelines: Dict[str, List[Any]],
+                              checkpoint: Optional[ScanCheckpoint] = None,
+                              hashes: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Validate components concurrently on the event loop
+        
+        Args:
+            components: Component paths to validate
+            concurrency: Maximum number of components validated at once
+            guidelines: Prefetched guideline chunks by component path
+            checkpoint: Checkpoint to append results to instead of returning them
+            hashes: Content hashes of the components, if known
+        
+        Returns:
+            List of validation results
+        """
+        results = []
+        async for result in self._aiter_components(components, concurrency, guidelines, ScanProgress()):
+            self._collect(result, results, checkpoint, hashes)
+            print(f"Processed component: {os.path.basename(result['path'])}")
+        return results
+    
+    async def _aiter_components(self, components: List[str], concurrency: int, guidelines: Dict[str, List[Any]],
+                                tracker: ScanProgress) -> AsyncIterator[Dict[str, Any]]:
+        """Validate components on the event loop, yielding results as they complete
+        
+        Args:
+            components: Component paths to validate
+            concurrency: Maximum number of components validated at once
+            guidelines: Prefetched guideline chunks by component path
+            tracker: Progress tracker with the cancel event
         
-        return report
+        Yields:
+            Validation results, in completion order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def validate(component: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._avalidate_safely(component, guidelines.get(component), tracker)
+        
+        tasks = [asyncio.ensure_future(validate(component)) for component in components]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                try:
+                    result = await next_result
+                except ScanCancelled:
+                    continue
+                if tracker.cancelled:
+                    break
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _collect(self, result: Dict[str, Any], results: List[Dict[str, Any]],
+                 checkpoint: Optional[ScanCheckpoint], hashes: Optional[Dict[str, str]] = None) -> None:
+        """Append a finished result to the checkpoint, or to the result list
+        
+        Args:
+            result: Validation result
+            results: Results kept in memory
+            checkpoint: Checkpoint, if any
+            hashes: Content hashes of the components, if known
+        """
+        if checkpoint is None:
+            results.append(result)
+            return
+        checkpoint.append(result, self._hash_of(result["path"], hashes))
+    
+    @staticmethod
+    def _hash_of(component: str, hashes: Optional[Dict[str, str]]) -> str:
+        """Get a component's content hash from the plan, hashing it only if missing
+        
+        Args:
+            component: Component path
+            hashes: Content hashes computed by plan_scan, if any
+            
+        Returns:
+            Content hash, or an empty string if the component cannot be read
+        """
+        if hashes and component in hashes:
+            return hashes[component]
+        try:
+            return content_hash(component)
+        except OSError:
+            return ""
+    
+    def _validate_safely(self, component: str, docs: Optional[List[Any]] = None,
+                         tracker: Optional[ScanProgress] = None) -> Dict[str, Any]:
+        """Validate a component, turning exceptions into error results
+        
+        Rate limits are retried by the validator's scheduler, so anything
+        raised here is final for this component.
+        
+        Args:
+            component: Component path
+            docs: Prefetched guideline chunks, if any
+            tracker: Progress tracker to report the component's stages to
         
-    def generate_report(self, output_path: str = None) -> str:
+        Returns:
+            Validation result, or an error dictionary
+        
+        Raises:
+            ScanCancelled: If the scan was cancelled before the LLM call
+        """
+        progress = tracker.emit if tracker is not None else None
+        try:
+            if progress is not None:
+                progress("started", component)
+            result = self.validator.validate_component(component, docs, progress)
+        except ScanCancelled:
+            raise
+        except Exception as e:
+            print(f"Error processing {component}: {str(e)}")
+            result = {"error": str(e), "path": component}
+        self._report_parsed(result, tracker)
+        return result
+    
+    async def _avalidate_safely(self, component: str, docs: Optional[List[Any]] = None,
+                                tracker: Optional[ScanProgress] = None) -> Dict[str, Any]:
+        """Async counterpart of _validate_safely
+        
+        Args:
+            component: Component path
+            docs: Prefetched guideline chunks, if any
+            tracker: Progress tracker to report the component's stages to
+        
+        Returns:
+            Validation result, or an error dictionary
+        """
+        progress = tracker.emit if tracker is not None else None
+        try:
+            if progress is not None:
+                progress("started", component)
+            result = await self.validator.avalidate_component(component, docs, progress)
+        except ScanCancelled:
+            raise
+        except Exception as e:
+            print(f"Error processing {component}: {str(e)}")
+            result = {"error": str(e), "path": component}
+        self._report_parsed(result, tracker)
+        return result
+    
+    @staticmethod
+    def _report_parsed(result: Dict[str, Any], tracker: Optional[ScanProgress]) -> None:
+        """Emit the final progress event of a component"""
+        if tracker is not None:
+            tracker.emit("parsed", result["path"], error="error" in result,
+                         requirements=len(result.get("requirements", [])))
+
+    def _select_changed(self, components: List[str], manifest: ScanManifest, since: Optional[str],
+                        hashes: Dict[str, str], reused: List[Dict[str, Any]]) -> List[str]:
+        """Split components into changed ones and reusable previous results
+        
+        Args:
+            components: All component paths
+            manifest: Manifest of the previous scan
+            since: Optional git ref or ref range to detect changes with
+            hashes: Filled with the content hash of each component
+            reused: Filled with the previous results of unchanged components
+            
+        Returns:
+            List of components that need to be validated
+        """
+        changed_files = None
+        if since:
+            changed_files = {os.path.realpath(p) for p in git_changed_files(self.pipeline_path, since)}
+        
+        pending = []
+        for component in components:
+            hashes[component] = content_hash(component)
+            
+            if changed_files is not None:
+                real_path = os.path.realpath(component)
+                touched = real_path in changed_files or any(
+                    p.startswith(real_path + os.sep) for p in changed_files
+                )
+                previous = None if touched else manifest.lookup(component)
+            else:
+                previous = manifest.lookup(component, hashes[component])
+            
+            if previous is not None:
+                reused.append(self._refresh_static_rules(component, previous))
+            else:
+                pending.append(component)
+        
+        return pending
+        
+    def _refresh_static_rules(self, component: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Re-evaluate the static rules of a reused result
+        
+        Static rules depend on sibling files (meta.yml, environment.yml,
+        CHANGELOG.md, LICENSE, ...) that can change while the component
+        itself does not.
+        
+        Args:
+            component: Component path
+            result: Result reused from the manifest
+            
+        Returns:
+            Result with fresh static rule outcomes and summary
+        """
+        try:
+            if os.path.isdir(component):
+                code = summarize_directory(component, self.validator.directory_ignore_patterns)
+            else:
+                with open(component, "r") as f:
+                    code = f.read()
+        except OSError:
+            return result
+        return self.validator.refresh_static_rules(component, code, result)
+        
+    def default_report_path(self, output_dir: str = "") -> str:
+        """Get the default report path of the pipeline
+        
+        Args:
+            output_dir: Directory of the report (defaults to the working directory)
+            
+        Returns:
+            Path to <output_dir>/<pipeline_name>_compliance_report.json
+        """
+        pipeline_name = os.path.basename(self.pipeline_path)
+        return os.path.join(output_dir, f"{pipeline_name}_compliance_report.json")
+    
+    def load_manifest(self, manifest_path: str, incremental: bool) -> ScanManifest:
+        """Get the manifest to scan with
+        
+        A fresh manifest makes every component count as changed, but still
+        records the results for the next incremental run.
+        
+        Args:
+            manifest_path: Path to the manifest of the previous scan
+            incremental: Whether to reuse the previous results
+            
+        Returns:
+            ScanManifest instance
+        """
+        if incremental:
+            return ScanManifest.load(manifest_path, self.pipeline_path)
+        return ScanManifest(self.pipeline_path)
+    
+    def generate_report(self, output_path: str = None, incremental: bool = False,
+                        since: Optional[str] = None, max_workers: int = 4, engine: str = "thread",
+                        resume: bool = False, fsync: str = "interval") -> str:
         """Generate a compliance report
         
+        Each result is appended to a JSONL checkpoint next to the report as
+        soon as it completes, and the report is assembled by streaming the
+        checkpoint. A manifest with the content hash and result of every
+        component is written next to the report, so later runs can be
+        incremental.
+        
         Args:
             output_path: Path to save the report (JSON)
+            incremental: Only re-validate components that changed since the
+                manifest next to output_path was written
+            since: Git ref or ref range used to detect changed components
+                (implies incremental)
+            max_workers: Maximum number of components validated concurrently
+            engine: Scan engine, "thread" or "async"
+            resume: Continue an interrupted scan, skipping components that
+                already have a successful result in the checkpoint
+            fsync: Checkpoint fsync policy, "always", "interval" or "never"
             
         Returns:
             Path to the saved report
         """
-        report = self.scan_pipeline()
-        
         if output_path is None:
-            pipeline_name = os.path.basename(self.pipeline_path)
-            output_path = f"{pipeline_name}_compliance_report.json"
-            
-        with open(output_path, "w") as f:
-            json.dump(report, f, indent=2)
+            output_path = self.default_report_path()
+        
+        manifest_path = ScanManifest.path_for_report(output_path)
+        incremental = incremental or bool(since)
+        manifest = self.load_manifest(manifest_path, incremental)
+        plan = self.plan_scan(manifest, since, incremental)
+        
+        checkpoint = ScanCheckpoint(ScanCheckpoint.path_for_report(output_path), fsync)
+        checkpoint.open(resume)
+        try:
+            pending = self.checkpoint_plan(plan, checkpoint, resume)
+            self.validate_components(pending, max_workers, engine, checkpoint, plan["hashes"])
+            summary = self.write_report(plan, checkpoint, output_path, manifest)
+        finally:
+            checkpoint.close()
+        manifest.save(manifest_path)
+        checkpoint.close(remove=True)
             
         print(f"Compliance report saved to {output_path}")
-        print(f"Overall compliance score: {report['summary']['compliance_score']}%")
+        print(f"Overall compliance score: {summary['compliance_score']}%")
         
         return output_path
+    
+    def checkpoint_plan(self, plan: Dict[str, Any], checkpoint: ScanCheckpoint, resume: bool) -> List[str]:
+        """Move the reused results of a plan into a checkpoint
+        
+        Args:
+            plan: Output of plan_scan; its reused results are written to the
+                checkpoint and dropped from memory
+            checkpoint: Open checkpoint
+            resume: Skip pending components with a successful result in the
+                checkpoint
+            
+        Returns:
+            Pending components that still need to be validated
+        """
+        for result in plan["results"]:
+            path = result.get("path")
+            checkpoint.append(result, self._hash_of(path, plan["hashes"]))
+        plan["results"] = []
+        
+        if not resume:
+            return plan["pending"]
+        pending = []
+        for component in plan["pending"]:
+            if not checkpoint.completed(component, self._hash_of(component, plan["hashes"])):
+                pending.append(component)
+        print(f"Resumed {len(plan['pending']) - len(pending)} components from the checkpoint, "
+              f"{len(pending)} left to validate")
+        return pending
@@ -0,0 +1,91 @@
+"""
+Structured progress events and cooperative cancellation for scans
+"""
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Stages of a component, in order; "llm_done" is skipped for static-only
+# scans and reports cached=True when the result came from the result cache
+PROGRESS_EVENTS = ["queued", "started", "retrieved", "llm_done", "parsed"]
+
+# Events after which a cancelled scan stops the component, before the
+# expensive LLM call is made
+CANCEL_POINTS = ("started", "retrieved")
+
+
+class ScanCancelled(Exception):
+    """Raised in a worker when the scan was cancelled before its LLM call"""
+
+
+class ScanProgress:
+    """Turns component stages into progress events and tracks cancellation
+
+    Each event is passed to the callback as a dictionary with "event",
+    "path", "timestamp" (time.time()), "elapsed" (seconds since the
+    component started) and "duration" (seconds since its previous event),
+    plus event-specific details such as "chunks" for "retrieved",
+    "cached" and "prompt_tokens" for "llm_done" and "error" and
+    "requirements" for "parsed".
+
+    Events are emitted from the threads that validate the components, so
+    the callback must be thread-safe. Setting the cancel event (from any
+    thread, including the callback itself) stops components that have not
+    reached their LLM call yet; calls already in flight are not interrupted.
+    """
+
+    def __init__(self, callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 cancel: Optional[threading.Event] = None):
+        """Initialize the tracker
+
+        Args:
+            callback: Function called with every progress event
+            cancel: Event that cancels the scan once set
+        """
+        self.callback = callback
+        self.cancel = cancel or threading.Event()
+        self._started: Dict[str, float] = {}
+        self._last: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the scan was cancelled"""
+        return self.cancel.is_set()
+
+    def emit(self, event: str, component_path: str, **details: Any) -> None:
+        """Report that a component reached a stage
+
+        Args:
+            event: One of PROGRESS_EVENTS
+            component_path: Path to the component
+            **details: Event-specific details
+
+        Raises:
+            ScanCancelled: If the scan was cancelled and the event is a
+                cancellation point
+        """
+        now = time.monotonic()
+        with self._lock:
+            if event == "started":
+                self._started[component_path] = now
+            started = self._started.get(component_path, now)
+            previous = self._last.get(component_path, now)
+            self._last[component_path] = now
+            if event == "parsed":
+                self._started.pop(component_path, None)
+                self._last.pop(component_path, None)
+
+        if self.callback is not None:
+            payload = {
+                "event": event,
+                "path": component_path,
+                "timestamp": time.time(),
+                "elapsed": round(now - started, 4),
+                "duration": round(now - previous, 4)
+            }
+            payload.update(details)
+            self.callback(payload)
+
+        if event in CANCEL_POINTS and self.cancelled:
+            raise ScanCancelled(component_path)
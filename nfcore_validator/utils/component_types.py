@@ -0,0 +1,46 @@
+"""
+Classification of pipeline components by path
+"""
+import os
+from typing import Optional
+
+# Pipeline-level documentation files
+DOCUMENTATION_FILES = ["README.md", "CHANGELOG.md", "CITATIONS.md", "LICENSE"]
+
+
+def determine_component_type(path: str, is_dir: Optional[bool] = None) -> str:
+    """Determine the type of a component based on its path
+
+    Args:
+        path: Path to the component
+        is_dir: Whether the path is a directory; checked on disk when None
+
+    Returns:
+        Component type string
+    """
+    if is_dir is None:
+        is_dir = os.path.isdir(path)
+    if is_dir:
+        if path.endswith('/tests'):
+            return "test_data"
+        return "directory"
+
+    filename = os.path.basename(path)
+    if '/modules/' in path and filename == 'main.nf':
+        return "module"
+    elif '/subworkflows/' in path and filename.endswith('.nf'):
+        return "subworkflow"
+    elif '/workflows/' in path and filename.endswith('.nf'):
+        return "workflow"
+    elif filename == 'main.nf':
+        return "main_workflow"
+    elif filename == 'nextflow.config':
+        return "nextflow_config"
+    elif filename.endswith('.config'):
+        return "config_file"
+    elif filename == 'nextflow_schema.json':
+        return "schema_file"
+    elif filename in DOCUMENTATION_FILES:
+        return "documentation_file"
+    else:
+        return "other_file"
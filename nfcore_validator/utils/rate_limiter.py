@@ -0,0 +1,340 @@
+"""
+Shared rate-limit-aware scheduler for OpenAI API calls
+"""
+import re
+import time
+import random
+import asyncio
+import threading
+from typing import Dict, Any, Callable, Optional
+
+# Budgets for the default schedulers; override with configure_scheduler
+DEFAULT_BUDGETS = {
+    "chat": {"requests_per_minute": 500, "tokens_per_minute": 40000, "completion_tokens": 1000},
+    "embeddings": {"requests_per_minute": 3000, "tokens_per_minute": 1000000, "completion_tokens": 0},
+}
+
+_schedulers: Dict[str, "RateLimitScheduler"] = {}
+_schedulers_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text
+
+    Uses the common rule of thumb of roughly four characters per token,
+    which is close enough for budgeting requests.
+
+    Args:
+        text: Prompt or document text
+
+    Returns:
+        Estimated token count
+    """
+    return len(text) // 4 + 1
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an exception is an API rate limit (HTTP 429) error
+
+    Args:
+        error: Exception raised by an API call
+
+    Returns:
+        True if the call was rejected because of rate limiting
+    """
+    status = getattr(error, "http_status", None) or getattr(error, "status_code", None)
+    if status == 429:
+        return True
+    if "RateLimit" in type(error).__name__:
+        return True
+    return "Rate limit reached" in str(error)
+
+
+def retry_after_hint(error: Exception) -> Optional[float]:
+    """Extract the suggested wait time from a rate limit error message
+
+    Args:
+        error: Rate limit exception
+
+    Returns:
+        Seconds to wait, or None if the message has no hint
+    """
+    match = re.search(r"Please try again in (\d+(?:\.\d+)?)(ms|s)", str(error))
+    if not match:
+        return None
+    wait = float(match.group(1))
+    return wait / 1000 if match.group(2) == "ms" else wait
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute: float):
+        """Initialize the bucket
+
+        Args:
+            per_minute: Budget per minute; also the bucket capacity
+        """
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Get how long to wait until ``amount`` can be taken from the bucket
+
+        Args:
+            amount: Amount to take
+            now: Current monotonic time
+
+        Returns:
+            Seconds to wait, 0 if the amount is available now
+        """
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # Requests bigger than the whole budget go through once the bucket is full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Take an amount that wait_time reported as available"""
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimitScheduler:
+    """Schedules API calls within request and token budgets
+
+    Every call first reserves one request and its estimated tokens from
+    per-minute token buckets. Calls rejected with a rate limit error are
+    retried with exponential backoff and jitter, and all callers pause
+    together until the backoff has passed. The number of calls in flight
+    adapts AIMD-style: it grows by one step per window of successful calls
+    and is halved on a rate limit error or when latency exceeds its target.
+
+    A scheduler is thread-safe and can be shared by synchronous and
+    asynchronous callers.
+    """
+
+    def __init__(self, requests_per_minute: float = 500, tokens_per_minute: float = 40000,
+                 completion_tokens: int = 0, max_concurrency: int = 16, min_concurrency: int = 1,
+                 max_retries: int = 6, base_delay: float = 1.0, max_delay: float = 60.0,
+                 target_latency: float = 60.0):
+        """Initialize the scheduler
+
+        Args:
+            requests_per_minute: Request budget
+            tokens_per_minute: Token budget
+            completion_tokens: Tokens reserved per call for the response
+            max_concurrency: Upper bound for calls in flight
+            min_concurrency: Lower bound for calls in flight
+            max_retries: Retries after a rate limit error before giving up
+            base_delay: Initial backoff delay in seconds
+            max_delay: Maximum backoff delay in seconds
+            target_latency: Calls slower than this shrink the concurrency
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.completion_tokens = completion_tokens
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.target_latency = target_latency
+
+        self.concurrency = float(max(min_concurrency, min(4, max_concurrency)))
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.counters = {"calls": 0, "retries": 0, "rate_limited": 0}
+        self._lock = threading.Lock()
+
+    def run(self, fn: Callable, *args, prompt_text: str = "", **kwargs) -> Any:
+        """Call a function within the budgets, retrying on rate limit errors
+
+        Args:
+            fn: Function that performs the API call
+            args: Positional arguments for fn
+            prompt_text: Prompt text used to estimate the token cost
+            kwargs: Keyword arguments for fn
+
+        Returns:
+            Return value of fn
+        """
+        tokens = estimate_tokens(prompt_text) + self.completion_tokens
+        for attempt in range(self.max_retries + 1):
+            wait = self._try_acquire(tokens)
+            while wait > 0:
+                time.sleep(wait)
+                wait = self._try_acquire(tokens)
+
+            started = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._release_failed(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # Cancellation (asyncio.CancelledError, KeyboardInterrupt) must free the slot too
+                self._release_cancelled()
+                raise
+            self._release_succeeded(time.monotonic() - started)
+            return result
+
+    async def arun(self, fn: Callable, *args, prompt_text: str = "", **kwargs) -> Any:
+        """Await a coroutine function within the budgets, retrying on rate limit errors
+
+        Args:
+            fn: Coroutine function that performs the API call
+            args: Positional arguments for fn
+            prompt_text: Prompt text used to estimate the token cost
+            kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of the awaited call
+        """
+        tokens = estimate_tokens(prompt_text) + self.completion_tokens
+        for attempt in range(self.max_retries + 1):
+            wait = self._try_acquire(tokens)
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self._try_acquire(tokens)
+
+            started = time.monotonic()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._release_failed(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancellation (asyncio.CancelledError, KeyboardInterrupt) must free the slot too
+                self._release_cancelled()
+                raise
+            self._release_succeeded(time.monotonic() - started)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get scheduler counters
+
+        Returns:
+            Dictionary with call, retry and rate limit counts and the
+            current concurrency limit
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats["concurrency"] = round(self.concurrency, 2)
+            return stats
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Reserve a slot and budget for one call
+
+        Args:
+            tokens: Estimated tokens of the call
+
+        Returns:
+            0 if the call may start, otherwise seconds to wait before trying again
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.in_flight >= int(self.concurrency):
+                return 0.05
+
+            wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+            if wait > 0:
+                return wait
+
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.in_flight += 1
+            self.counters["calls"] += 1
+            return 0.0
+
+    def _release_succeeded(self, latency: float) -> None:
+        """Release the slot of a successful call and adapt concurrency"""
+        with self._lock:
+            self.in_flight -= 1
+            if latency > self.target_latency:
+                self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            else:
+                # Additive increase: about +1 per window of successful calls
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+
+    def _release_cancelled(self) -> None:
+        """Release the slot of a call that was cancelled before it finished"""
+        with self._lock:
+            self.in_flight -= 1
+
+    def _release_failed(self, error: Exception, attempt: int) -> Optional[float]:
+        """Release the slot of a failed call and decide whether to retry
+
+        Args:
+            error: Exception raised by the call
+            attempt: Zero-based attempt number
+
+        Returns:
+            Seconds to back off before retrying, or None to give up
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if not is_rate_limit_error(error):
+                return None
+
+            self.counters["rate_limited"] += 1
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            if attempt >= self.max_retries:
+                return None
+
+            # Exponential backoff with full jitter, but never shorter than the API hint
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            hint = retry_after_hint(error)
+            if hint is not None:
+                delay = max(delay, hint)
+
+            # Pause every caller so the whole process backs off together
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            self.counters["retries"] += 1
+
+        print(f"Rate limited. Retrying in {delay:.1f} seconds "
+              f"(attempt {attempt + 1}/{self.max_retries}, concurrency {int(self.concurrency)})")
+        return delay
+
+
+def get_scheduler(name: str = "chat") -> RateLimitScheduler:
+    """Get the process-wide scheduler for an API
+
+    Args:
+        name: Scheduler name, "chat" or "embeddings"
+
+    Returns:
+        Shared RateLimitScheduler instance
+    """
+    with _schedulers_lock:
+        if name not in _schedulers:
+            _schedulers[name] = RateLimitScheduler(**DEFAULT_BUDGETS.get(name, {}))
+        return _schedulers[name]
+
+
+def configure_scheduler(name: str = "chat", **kwargs) -> RateLimitScheduler:
+    """Replace the process-wide scheduler for an API
+
+    Args:
+        name: Scheduler name, "chat" or "embeddings"
+        kwargs: RateLimitScheduler arguments overriding the defaults
+
+    Returns:
+        The new shared RateLimitScheduler instance
+    """
+    settings = dict(DEFAULT_BUDGETS.get(name, {}))
+    settings.update({key: value for key, value in kwargs.items() if value is not None})
+    with _schedulers_lock:
+        _schedulers[name] = RateLimitScheduler(**settings)
+        return _schedulers[name]
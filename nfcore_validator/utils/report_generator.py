@@ -70,7 +70,13 @@ class ReportGenerator:
         md.append(f"- **Requirements Checked:** {summary.get('total_requirements', 0)}\n")
         md.append(f"- **Passed Requirements:** {summary.get('passed_requirements', 0)}\n")
         md.append(f"- **Failed Requirements:** {summary.get('total_requirements', 0) - summary.get('passed_requirements', 0)}\n")
-        md.append(f"- **Compliance Score:** {summary.get('compliance_score', 0)}%\n\n")
+        md.append(f"- **Compliance Score:** {summary.get('compliance_score', 0)}%\n")
+        if 'cache' in summary:
+            cache = summary['cache']
+            md.append(f"- **Cached Results:** {cache.get('hits', 0)} hits, {cache.get('misses', 0)} misses\n")
+        if 'inherited_modules' in summary:
+            md.append(f"- **Inherited nf-core Modules:** {summary['inherited_modules']}\n")
+        md.append("\n")
         
         # Component type breakdown
         md.append("## Component Type Breakdown\n")
@@ -0,0 +1,168 @@
+"""
+Structural digest of nextflow.config and conf/*.config files
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .nextflow_digest import strip_comments, find_string_end, find_matching_brace, fit_to_budget
+
+# Process settings that control resources and retries, marked in the digest
+RESOURCE_SETTINGS = ["cpus", "memory", "time", "disk", "accelerator", "maxRetries", "maxErrors", "errorStrategy"]
+
+_BLOCK_START_RE = re.compile(
+    r"""\s*(?:(withName|withLabel)\s*:\s*(?:(["'])(.*?)\2|([^\s{]+))|([A-Za-z_][\w.]*|["'][^"'\n]+["']))\s*\{"""
+)
+_SELECTOR_RE = re.compile(r"^process\.(with(?:Name|Label):[^.]+)\.(.+)$")
+
+
+def _statement_end(text: str, start: int) -> int:
+    """Find the end of the statement starting at ``start`` (a newline outside brackets and strings)"""
+    depth = 0
+    i = start
+    n = len(text)
+    while i < n:
+        char = text[i]
+        if char in "\"'":
+            i = find_string_end(text, i)
+            continue
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char in "\n;" and depth <= 0:
+            return i
+        i += 1
+    return n
+
+
+def parse_config(code: str) -> List[Tuple[str, str]]:
+    """Flatten a Nextflow config into dotted settings
+
+    Blocks become key prefixes, so ``process { withLabel: big { cpus = 8 } }``
+    yields ``("process.withLabel:big.cpus", "8")``. ``includeConfig``
+    statements are reported with the key ``<scope>.includeConfig`` and
+    function definitions with the key ``<scope>.def``.
+
+    Args:
+        code: Config file content
+
+    Returns:
+        List of (key, value) tuples in file order
+    """
+    settings = []
+
+    def parse_block(text: str, prefix: str) -> None:
+        i = 0
+        n = len(text)
+        while i < n:
+            if text[i] in " \t\r\n;":
+                i += 1
+                continue
+
+            match = _BLOCK_START_RE.match(text, i)
+            if match:
+                if match.group(1):
+                    name = f"{match.group(1)}:{match.group(3) if match.group(2) else match.group(4)}"
+                else:
+                    name = match.group(5).strip("\"'")
+                open_brace = match.end() - 1
+                close = find_matching_brace(text, open_brace)
+                parse_block(text[open_brace + 1:close], f"{prefix}{name}.")
+                i = close + 1
+                continue
+
+            end = _statement_end(text, i)
+            statement = re.sub(r"\s+", " ", text[i:end]).strip()
+            i = end + 1
+            if not statement:
+                continue
+            function = re.match(r"def\s+(?:\w+\s+)?(\w+)\s*\(", statement)
+            if function:
+                settings.append((prefix + "def", function.group(1)))
+                continue
+            assignment = re.match(r"([A-Za-z_][\w.]*)\s*=\s*(.*)$", statement)
+            if assignment:
+                settings.append((prefix + assignment.group(1), assignment.group(2)))
+            else:
+                parts = statement.split(None, 1)
+                settings.append((prefix + parts[0], parts[1] if len(parts) > 1 else ""))
+
+    parse_block(strip_comments(code), "")
+    return settings
+
+
+def _entry(key: str, value: str, resource: bool) -> str:
+    """Format a setting for the digest, shortening long values"""
+    value = value if len(value) <= 80 else value[:77] + "..."
+    return f"{key} = {value}  [resource]" if resource else f"{key} = {value}"
+
+
+def build_config_digest(code: str, max_tokens: int = 3000) -> Optional[str]:
+    """Build a compact digest of a Nextflow config file
+
+    Settings are grouped into includes, params, process defaults, process
+    selectors, profiles and other scopes; resource settings (cpus, memory,
+    time, ...) are marked so they stand out.
+
+    Args:
+        code: Config file content
+        max_tokens: Token budget of the digest
+
+    Returns:
+        Digest text, or None if no settings were found
+    """
+    settings = parse_config(code)
+    if not settings:
+        return None
+
+    includes, params, process, functions, other = [], [], [], [], []
+    selectors: Dict[str, List[str]] = {}
+    profiles: Dict[str, List[str]] = {}
+
+    for key, value in settings:
+        name = key.rsplit(".", 1)[-1]
+        resource = name in RESOURCE_SETTINGS and (key.startswith("process.") or ".process." in key)
+        selector = _SELECTOR_RE.match(key)
+
+        if key.startswith("profiles."):
+            profile, _, rest = key[len("profiles."):].partition(".")
+            profiles.setdefault(profile, []).append(_entry(rest, value, resource))
+        elif name == "def":
+            functions.append(value)
+        elif name == "includeConfig":
+            scope = key.rpartition(".")[0]
+            includes.append(f"{value} (in {scope})" if scope else value)
+        elif key.startswith("params."):
+            params.append(_entry(key[len("params."):], value, resource))
+        elif selector:
+            selectors.setdefault(selector.group(1), []).append(_entry(selector.group(2), value, resource))
+        elif key.startswith("process."):
+            process.append(_entry(key[len("process."):], value, resource))
+        else:
+            other.append(_entry(key, value, resource))
+
+    lines = []
+    sections = [("includeConfig", includes), ("params", params), ("process defaults", process)]
+    for title, entries in sections:
+        if entries:
+            lines.append(f"{title}:")
+            lines.extend(f"  {entry}" for entry in entries)
+    if selectors:
+        lines.append("process selectors:")
+        for selector, entries in selectors.items():
+            lines.append(f"  {selector}:")
+            lines.extend(f"    {entry}" for entry in entries)
+    if profiles:
+        lines.append(f"profiles ({', '.join(profiles)}):")
+        for profile, entries in profiles.items():
+            lines.append(f"  {profile}:")
+            lines.extend(f"    {entry}" for entry in entries)
+    if other:
+        lines.append("other settings:")
+        lines.extend(f"  {entry}" for entry in other)
+    if functions:
+        lines.append("functions: " + ", ".join(functions))
+
+    return fit_to_budget(
+        f"Nextflow config digest ({len(settings)} settings, comments removed):", lines, max_tokens
+    )
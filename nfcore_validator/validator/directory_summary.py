@@ -0,0 +1,139 @@
+"""
+Bounded summaries of directory components such as tests/
+"""
+import os
+import fnmatch
+import itertools
+from collections import Counter, deque
+from typing import Dict, List, Optional
+
+# Directory names that are never descended into: run outputs and caches
+DEFAULT_IGNORE_PATTERNS = ["work", ".nf-test", "results", ".git"]
+
+# Maximum number of entries examined before the walk stops
+DEFAULT_MAX_ENTRIES = 2000
+
+# Maximum number of entries read from any single directory, so one huge
+# data directory cannot use up the whole budget
+DEFAULT_MAX_DIRECTORY_ENTRIES = 500
+
+# Maximum length of the summary text
+DEFAULT_MAX_CHARS = 7500
+
+# Extensions made of several suffixes, checked before os.path.splitext
+COMPOUND_EXTENSIONS = (".nf.test.snap", ".nf.test", ".fastq.gz", ".fq.gz", ".vcf.gz", ".tar.gz")
+
+
+def is_nf_test_file(name: str) -> bool:
+    """Check whether a file belongs to nf-test (tests, snapshots or config)"""
+    return name.endswith((".nf.test", ".nf.test.snap")) or name == "nf-test.config"
+
+
+def file_extension(name: str) -> str:
+    """Get the extension a file is counted under, e.g. ".nf.test" for main.nf.test"""
+    for extension in COMPOUND_EXTENSIONS:
+        if name.endswith(extension):
+            return extension
+    return os.path.splitext(name)[1] or "(none)"
+
+
+def _format_counts(counts: Counter) -> str:
+    """Format extension counts as "2 .nf.test, 1 .config", most common first"""
+    ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return ", ".join(f"{count} {extension}" for extension, count in ordered)
+
+
+def summarize_directory(directory: str, ignore_patterns: Optional[List[str]] = None,
+                        max_entries: int = DEFAULT_MAX_ENTRIES,
+                        max_directory_entries: int = DEFAULT_MAX_DIRECTORY_ENTRIES,
+                        max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    """Summarize the layout of a directory within a fixed budget
+
+    Subdirectories matching an ignore pattern are pruned without being
+    entered. The walk is breadth-first, reads at most max_directory_entries
+    entries of any directory and stops for good after max_entries entries,
+    so checked-in test outputs and data trees cost next to nothing. Files are
+    aggregated by extension, per directory and overall; nf-test files are
+    listed by path since they are what the test guidelines are about.
+
+    Args:
+        directory: Path to the directory
+        ignore_patterns: fnmatch patterns of directory names to prune
+            (defaults to DEFAULT_IGNORE_PATTERNS)
+        max_entries: Maximum number of entries examined
+        max_directory_entries: Maximum number of entries read per directory
+        max_chars: Maximum length of the summary
+
+    Returns:
+        Summary text
+    """
+    if ignore_patterns is None:
+        ignore_patterns = DEFAULT_IGNORE_PATTERNS
+    root_name = os.path.basename(os.path.normpath(directory))
+
+    totals: Counter = Counter()
+    per_directory: Dict[str, Counter] = {}
+    nf_test_files: List[str] = []
+    pruned: List[str] = []
+    capped: List[str] = []
+    examined = 0
+    truncated = False
+
+    # Breadth-first walk in name order, so the summary is deterministic
+    queue = deque([""])
+    while queue and not truncated:
+        rel_dir = queue.popleft()
+        counts: Counter = Counter()
+        per_directory[rel_dir] = counts
+        try:
+            with os.scandir(os.path.join(directory, rel_dir)) as it:
+                entries = list(itertools.islice(it, max_directory_entries + 1))
+        except OSError:
+            continue
+        if len(entries) > max_directory_entries:
+            entries = entries[:max_directory_entries]
+            capped.append(rel_dir)
+        entries.sort(key=lambda entry: entry.name)
+
+        subdirs = []
+        for entry in entries:
+            examined += 1
+            if examined > max_entries:
+                truncated = True
+                break
+            rel_path = os.path.join(rel_dir, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                if any(fnmatch.fnmatch(entry.name, pattern) for pattern in ignore_patterns):
+                    pruned.append(rel_path + "/")
+                else:
+                    subdirs.append(rel_path)
+                continue
+            counts[file_extension(entry.name)] += 1
+            totals[file_extension(entry.name)] += 1
+            if is_nf_test_file(entry.name):
+                nf_test_files.append(rel_path)
+        queue.extend(subdirs)
+
+    lines = [f"Directory summary of {root_name}/ ({len(per_directory)} directories, {sum(totals.values())} files)"]
+    if truncated:
+        lines.append(f"(walk stopped after {max_entries} entries; counts are partial)")
+    if pruned:
+        lines.append("Ignored directories (not walked): " + ", ".join(pruned))
+    if nf_test_files:
+        lines.append("nf-test files:")
+        lines.extend(f"    {path}" for path in nf_test_files)
+    if totals:
+        lines.append("Files by extension: " + _format_counts(totals))
+    lines.append("Directories:")
+    for rel_dir, counts in per_directory.items():
+        label = os.path.join(root_name, rel_dir).rstrip(os.sep) + "/"
+        more = f", first {max_directory_entries} entries only" if rel_dir in capped else ""
+        lines.append(f"    {label} ({_format_counts(counts)}{more})" if counts else f"    {label}")
+
+    summary = ""
+    for index, line in enumerate(lines):
+        if len(summary) + len(line) + 1 > max_chars:
+            summary += f"... ({len(lines) - index} more lines truncated)\n"
+            break
+        summary += line + "\n"
+    return summary
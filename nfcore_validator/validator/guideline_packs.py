@@ -0,0 +1,222 @@
+"""
+Precomputed guideline packs and requirement catalogs per component type
+"""
+import os
+import re
+import json
+import hashlib
+from typing import Any, Dict, Iterable, List, Tuple
+
+from langchain.docstore.document import Document
+
+from ..utils.rate_limiter import estimate_tokens
+
+GUIDELINE_PACKS_NAME = "guideline_packs.json"
+
+# Guideline pages (URL path suffixes, most important first) and a keyword
+# query per component type; the query ranks chunks when none of the pages
+# were harvested
+PACK_SPECS: Dict[str, Dict[str, Any]] = {
+    "module": {
+        "pages": ["guidelines/components/modules", "guidelines/components/overview"],
+        "query": "module process inputs outputs versions.yml meta.yml environment.yml tag label container conda ext.args prefix stub"
+    },
+    "subworkflow": {
+        "pages": ["guidelines/components/subworkflows", "guidelines/components/overview"],
+        "query": "subworkflow take emit main versions meta.yml include modules channels"
+    },
+    "workflow": {
+        "pages": ["guidelines/pipelines/requirements/workflow_size", "guidelines/pipelines/requirements/workflow_specificity",
+                  "guidelines/pipelines/requirements/use_the_template", "guidelines/pipelines/overview"],
+        "query": "workflow pipeline template include modules subworkflows channels versions multiqc"
+    },
+    "main_workflow": {
+        "pages": ["guidelines/pipelines/requirements/use_the_template", "guidelines/pipelines/requirements/single_command",
+                  "guidelines/pipelines/requirements/minimum_inputs", "guidelines/pipelines/overview"],
+        "query": "main.nf entry workflow template single command params input samplesheet"
+    },
+    "nextflow_config": {
+        "pages": ["guidelines/pipelines/requirements/parameters", "guidelines/pipelines/requirements/nextflow",
+                  "guidelines/pipelines/recommendations/cloud_compatible", "contributing/pipelines/pipeline_file_structure"],
+        "query": "nextflow.config params profiles manifest process resources cpus memory time includeConfig"
+    },
+    "config_file": {
+        "pages": ["guidelines/pipelines/requirements/parameters", "guidelines/pipelines/recommendations/cloud_compatible",
+                  "contributing/pipelines/pipeline_file_structure"],
+        "query": "config process withName withLabel resources ext.args profiles test"
+    },
+    "schema_file": {
+        "pages": ["guidelines/pipelines/nextflow_schema", "guidelines/pipelines/requirements/parameters"],
+        "query": "nextflow_schema.json parameters schema description help_text fa_icon default type"
+    },
+    "documentation_file": {
+        "pages": ["guidelines/pipelines/requirements/docs", "guidelines/pipelines/requirements/acknowledgements",
+                  "guidelines/pipelines/requirements/mit_license", "guidelines/pipelines/recommendations/publication_credit"],
+        "query": "documentation README CHANGELOG CITATIONS LICENSE usage output docs credits"
+    },
+    "test_data": {
+        "pages": ["guidelines/components/test_data", "guidelines/pipelines/requirements/ci_testing",
+                  "guidelines/pipelines/recommendations/testing"],
+        "query": "test data nf-test snapshot tests CI test profile minimal dataset"
+    },
+    "directory": {
+        "pages": ["contributing/pipelines/pipeline_file_structure", "guidelines/pipelines/overview"],
+        "query": "pipeline directory structure files template"
+    },
+    "other_file": {
+        "pages": ["contributing/pipelines/pipeline_file_structure", "guidelines/pipelines/overview"],
+        "query": "pipeline file structure template files"
+    }
+}
+
+# Sentences stating a requirement, and the keywords that make it a MUST
+REQUIREMENT_PATTERN = re.compile(r"\b(must|should|required|never|always)\b", re.IGNORECASE)
+MUST_PATTERN = re.compile(r"\b(must|required|never|always)\b", re.IGNORECASE)
+
+
+def _page_rank(source: str, pages: List[str]) -> int:
+    """Get the position of a chunk's page in a pack spec, or -1"""
+    path = source.split("#", 1)[0].rstrip("/")
+    for rank, page in enumerate(pages):
+        if path.endswith(page):
+            return rank
+    return -1
+
+
+def _terms(text: str) -> set:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+def extract_requirements(component_type: str, documents: List[Document],
+                         max_requirements: int = 40) -> List[Dict[str, str]]:
+    """Extract discrete requirements from guideline chunks
+
+    Sentences with requirement keywords (must, should, required, ...) become
+    requirements; numbered section headings such as "1.5 Each command must
+    have an $args variable" start a new sentence. IDs hash the sentence, so
+    they stay stable across harvests as long as the guideline text does not
+    change.
+
+    Args:
+        component_type: Component type the requirements are for
+        documents: Guideline chunks, most important first
+        max_requirements: Maximum number of requirements
+
+    Returns:
+        Requirements with id, level ("must" or "should"), text and source
+    """
+    requirements = []
+    for doc in documents:
+        text = re.sub(r"\s+", " ", doc.page_content)
+        for sentence in re.split(r"(?<=[.!?])\s+(?=[A-Z`])|\s+(?=\d+\.\d+\s+[A-Z])", text):
+            sentence = sentence.strip(" -*•")
+            if len(sentence) < 20 or len(sentence) > 300 or not REQUIREMENT_PATTERN.search(sentence):
+                continue
+            # Chunks overlap, so sentences repeat, sometimes cut at a chunk boundary
+            key = sentence.lower()
+            if any(key in req["text"].lower() for req in requirements):
+                continue
+            requirements = [req for req in requirements if req["text"].lower() not in key]
+            digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+            requirements.append({
+                "id": f"{component_type}_{digest}",
+                "level": "must" if MUST_PATTERN.search(sentence) else "should",
+                "text": sentence,
+                "source": doc.metadata.get("source", "")
+            })
+            if len(requirements) >= max_requirements:
+                return requirements
+    return requirements
+
+
+def build_guideline_packs(chunks: Iterable[Tuple[int, str, str, Dict[str, Any]]],
+                          max_tokens: int = 1000) -> Dict[str, Dict[str, Any]]:
+    """Build a guideline pack for every component type
+
+    A pack holds the chunks of the guideline pages for its component type,
+    in page and index order, up to a token budget, and the requirements
+    stated anywhere on those pages. When none of the pages are in the
+    store, chunks are ranked by their overlap with the type's keyword query
+    instead, and requirements come from the selected chunks only.
+
+    Args:
+        chunks: (index position, chunk ID, text, metadata) tuples of the store
+        max_tokens: Token budget of each pack's guideline text
+
+    Returns:
+        Dictionary mapping component type to a pack with "chunks" (text and
+        source) and "requirements"
+    """
+    chunks = sorted(chunks)
+    packs = {}
+    for component_type, spec in PACK_SPECS.items():
+        ranked = []
+        for position, _, text, metadata in chunks:
+            rank = _page_rank(metadata.get("source", ""), spec["pages"])
+            if rank >= 0:
+                ranked.append(((rank, position), text, metadata))
+        from_pages = bool(ranked)
+        if not from_pages:
+            query = _terms(spec["query"])
+            for position, _, text, metadata in chunks:
+                overlap = len(query & _terms(text))
+                if overlap:
+                    ranked.append(((-overlap, position), text, metadata))
+        ranked.sort(key=lambda item: item[0])
+
+        selected = []
+        tokens = 0
+        for _, text, metadata in ranked:
+            cost = estimate_tokens(text)
+            if selected and tokens + cost > max_tokens:
+                break
+            selected.append(Document(page_content=text, metadata={"source": metadata.get("source", "")}))
+            tokens += cost
+
+        packs[component_type] = {
+            "chunks": [{"text": doc.page_content, "source": doc.metadata["source"]} for doc in selected],
+            "requirements": extract_requirements(component_type, [
+                Document(page_content=text, metadata={"source": metadata.get("source", "")})
+                for _, text, metadata in ranked
+            ] if from_pages else selected)
+        }
+    return packs
+
+
+def save_guideline_packs(packs: Dict[str, Dict[str, Any]], vectorstore_path: str) -> None:
+    """Write guideline packs next to a vector store
+
+    Args:
+        packs: Output of build_guideline_packs
+        vectorstore_path: Path to the vector store directory
+    """
+    with open(os.path.join(vectorstore_path, GUIDELINE_PACKS_NAME), "w") as f:
+        json.dump(packs, f, indent=2)
+
+
+def load_guideline_packs(vectorstore_path: str) -> Dict[str, Dict[str, Any]]:
+    """Load the guideline packs of a vector store
+
+    Args:
+        vectorstore_path: Path to the vector store directory
+
+    Returns:
+        Dictionary mapping component type to a pack with "documents" and
+        "requirements"; empty if the store has no packs
+    """
+    packs_path = os.path.join(vectorstore_path, GUIDELINE_PACKS_NAME)
+    if not os.path.exists(packs_path):
+        return {}
+    with open(packs_path, "r") as f:
+        data = json.load(f)
+    return {
+        component_type: {
+            "documents": [
+                Document(page_content=chunk["text"], metadata={"source": chunk["source"]})
+                for chunk in pack["chunks"]
+            ],
+            "requirements": pack["requirements"]
+        }
+        for component_type, pack in data.items()
+        if pack["chunks"]
+    }
@@ -3,36 +3,90 @@ LLM-based validator for nf-core pipeline components
 """
 import os
 import json
-from typing import Dict, Any, List, Optional
+import hashlib
+from typing import Dict, Any, Callable, List, Optional
 
 from langchain.chat_models import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.vectorstores import FAISS
+
+from .result_cache import ResultCache, DEFAULT_CACHE_DIR
+from .static_rules import StaticRuleEngine, summarize_requirements
+from .nextflow_digest import build_digest
+from .schema_digest import build_schema_digest
+from .config_digest import build_config_digest
+from .directory_summary import DEFAULT_IGNORE_PATTERNS, summarize_directory
+from .guideline_packs import load_guideline_packs
+from ..vectorstore.embeddings import is_local_backend
+from ..vectorstore.loader import load_vectorstore, store_embeddings
+from ..vectorstore.retrieval import GuidelineRetriever
+from ..utils.component_types import determine_component_type
+from ..utils.rate_limiter import RateLimitScheduler, estimate_tokens, get_scheduler
 
 class NfCoreValidator:
     """LLM-based validator for nf-core pipeline components"""
     
-    def __init__(self, vectorstore_path: str = "nfcore_vectorstore", openai_api_key: str = None):
+    def __init__(self, vectorstore_path: str = "nfcore_vectorstore", openai_api_key: str = None,
+                 use_cache: bool = True, cache_dir: str = DEFAULT_CACHE_DIR,
+                 scheduler: Optional[RateLimitScheduler] = None, static_only: bool = False,
+                 retrieval_mode: str = "vector", use_guideline_packs: bool = True):
         """Initialize the validator
         
         Args:
             vectorstore_path: Path to the vector store with nf-core documentation
             openai_api_key: OpenAI API key for LLM and embeddings
+            use_cache: Whether to reuse results of previous identical validations
+            cache_dir: Directory of the persistent result cache
+            scheduler: Scheduler for LLM calls (defaults to the shared "chat" scheduler)
+            static_only: Only evaluate the static rules; no LLM, vector store
+                or API key is needed
+            retrieval_mode: How guidelines are retrieved: "lexical" (BM25,
+                no query embedding), "vector" or "hybrid"
+            use_guideline_packs: Use the store's precomputed guideline pack
+                and requirement list of each component type (see
+                guideline_packs) instead of retrieving guidelines per component
         """
         self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
+        self.static_only = static_only
         
-        if not self.openai_api_key:
+        if not self.openai_api_key and not static_only:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it directly.")
             
-        self.llm = ChatOpenAI(
-            temperature=0, 
-            model="gpt-4",
-            openai_api_key=self.openai_api_key
-        )
+        self.scheduler = scheduler or get_scheduler("chat")
+        self.embedding_scheduler = get_scheduler("embeddings")
+        self.rule_engine = StaticRuleEngine()
+        self.model_name = "gpt-4"
         
-        self.embeddings = OpenAIEmbeddings(openai_api_key=self.openai_api_key)
-        self.vectorstore = FAISS.load_local(vectorstore_path, self.embeddings)
+        if static_only:
+            self.llm = None
+            self.embeddings = None
+            self.vectorstore = None
+            self.retriever = None
+            self.guideline_packs = {}
+        else:
+            # Retries are handled by the shared scheduler
+            self.llm = ChatOpenAI(
+                temperature=0, 
+                model=self.model_name,
+                openai_api_key=self.openai_api_key,
+                max_retries=1
+            )
+            
+            self.embeddings = store_embeddings(vectorstore_path, self.openai_api_key)
+            self.vectorstore = load_vectorstore(vectorstore_path, self.embeddings)
+            self.retriever = GuidelineRetriever(
+                self.vectorstore,
+                retrieval_mode,
+                embeddings=self.embeddings,
+                scheduler=None if is_local_backend(self.embeddings) else self.embedding_scheduler
+            )
+            self.guideline_packs = load_guideline_packs(vectorstore_path) if use_guideline_packs else {}
+        
+        self.cache = ResultCache(cache_dir) if use_cache and not static_only else None
+        self.retrieval_k = 5
+        self.embedding_batch_size = 100
+        self.digest_token_budget = 3000
+        self.raw_content_limit = 8000
+        self.directory_ignore_patterns = list(DEFAULT_IGNORE_PATTERNS)
         
         self.system_prompt = """You are an nf-core pipeline compliance expert. Your task is to analyze the provided pipeline component against the official nf-core guidelines.
 
@@ -70,33 +124,161 @@ Return your analysis in this exact JSON format:
 
 Be thorough and check against ALL relevant nf-core requirements for the component type."""
 
-    def validate_component(self, component_path: str) -> Dict[str, Any]:
+    def validate_component(self, component_path: str, docs: Optional[List[Any]] = None,
+                           progress: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
         """Validate a single pipeline component
         
         Args:
             component_path: Path to the component file
+            docs: Guideline chunks retrieved up front (see prefetch_guidelines);
+                taken from the component type's guideline pack or retrieved
+                from the vector store when None
+            progress: Called as progress(event, component_path, **details)
+                once the guidelines are retrieved ("retrieved") and once the
+                LLM answered or the result cache hit ("llm_done"); exceptions
+                it raises abort the validation
             
         Returns:
             Dictionary with validation results
         """
+        prepared = self._prepare_component(component_path)
+        if "error" in prepared:
+            return prepared
+        if self.static_only:
+            return self._merge_static(prepared, {})
+        
+        # Get relevant guidelines from the guideline pack or vector store
+        if docs is None:
+            pack = self.guideline_packs.get(prepared["file_type"])
+            docs = pack["documents"] if pack else self.retriever.search(prepared["query"], self.retrieval_k)
+        if progress is not None:
+            progress("retrieved", component_path, chunks=len(docs))
+        
+        # Return the stored result if this exact request was validated before
+        cache_key, cached = self._lookup_cache(prepared, docs)
+        if cached is not None:
+            if progress is not None:
+                progress("llm_done", component_path, cached=True, prompt_tokens=0)
+            return cached
+        
+        # Query LLM
+        messages = self._build_messages(prepared, docs)
+        prompt_text = self._messages_text(messages)
+        response = self.scheduler.run(self.llm, messages, prompt_text=prompt_text)
+        if progress is not None:
+            progress("llm_done", component_path, cached=False, prompt_tokens=estimate_tokens(prompt_text))
+        
+        return self._parse_response(prepared, response.content, cache_key)
+    
+    async def avalidate_component(self, component_path: str, docs: Optional[List[Any]] = None,
+                                  progress: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
+        """Validate a single pipeline component without blocking the event loop
+        
+        Same as validate_component, but the query embedding (if any) and the
+        LLM call are awaited, so many components can be validated concurrently.
+        
+        Args:
+            component_path: Path to the component file
+            docs: Guideline chunks retrieved up front (see prefetch_guidelines);
+                taken from the component type's guideline pack or retrieved
+                from the vector store when None
+            progress: Progress callback, as for validate_component
+            
+        Returns:
+            Dictionary with validation results
+        """
+        prepared = self._prepare_component(component_path)
+        if "error" in prepared:
+            return prepared
+        if self.static_only:
+            return self._merge_static(prepared, {})
+        
+        # Get relevant guidelines from the guideline pack or vector store
+        if docs is None:
+            pack = self.guideline_packs.get(prepared["file_type"])
+            if pack:
+                docs = pack["documents"]
+            else:
+                docs = await self.retriever.asearch(prepared["query"], self.retrieval_k)
+        if progress is not None:
+            progress("retrieved", component_path, chunks=len(docs))
+        
+        # Return the stored result if this exact request was validated before
+        cache_key, cached = self._lookup_cache(prepared, docs)
+        if cached is not None:
+            if progress is not None:
+                progress("llm_done", component_path, cached=True, prompt_tokens=0)
+            return cached
+        
+        # Query LLM
+        messages = self._build_messages(prepared, docs)
+        prompt_text = self._messages_text(messages)
+        response = await self.scheduler.arun(
+            self.llm.agenerate,
+            [messages],
+            prompt_text=prompt_text
+        )
+        if progress is not None:
+            progress("llm_done", component_path, cached=False, prompt_tokens=estimate_tokens(prompt_text))
+        
+        return self._parse_response(prepared, response.generations[0][0].text, cache_key)
+    
+    def prefetch_guidelines(self, component_paths: List[str]) -> Dict[str, List[Any]]:
+        """Retrieve the guidelines for many components at once
+        
+        Builds every retrieval query up front, embeds them in a few batched
+        calls and searches the FAISS index with the stacked query matrix in
+        a single call, instead of one embedding round trip per component.
+        In lexical mode no embeddings are requested at all, and components
+        covered by a guideline pack need no retrieval, so they are not even
+        read here.
+        
+        Args:
+            component_paths: Paths to the components
+            
+        Returns:
+            Dictionary mapping component path to its guideline chunks;
+            components without a pack that cannot be read are left out
+        """
+        if self.static_only:
+            return {}
+        
+        guidelines = {}
+        prepared = []
+        for path in component_paths:
+            pack = self.guideline_packs.get(self._determine_component_type(path))
+            if pack:
+                guidelines[path] = pack["documents"]
+                continue
+            p = self._prepare_component(path)
+            if "error" not in p:
+                prepared.append(p)
+        if not prepared:
+            return guidelines
+        
+        queries = [p["query"] for p in prepared]
+        results = self.retriever.search_many(queries, self.retrieval_k, self.embedding_batch_size)
+        guidelines.update((p["path"], docs) for p, docs in zip(prepared, results))
+        return guidelines
+    
+    def _prepare_component(self, component_path: str) -> Dict[str, Any]:
+        """Read a component and build its retrieval query
+        
+        Args:
+            component_path: Path to the component file
+            
+        Returns:
+            Dictionary with path, file_type, code, content (what the LLM is
+            shown), query and static results, or an error dictionary
+        """
         try:
             # Determine file type for specialized handling
             file_type = self._determine_component_type(component_path)
             
             # Read file content
             if os.path.isdir(component_path):
-                # For directories (like test directories), get a listing
-                code = f"Directory structure:\n"
-                for root, dirs, files in os.walk(component_path, topdown=True):
-                    level = root.replace(component_path, '').count(os.sep)
-                    indent = ' ' * 4 * level
-                    code += f"{indent}{os.path.basename(root)}/\n"
-                    sub_indent = ' ' * 4 * (level + 1)
-                    for f in files:
-                        code += f"{sub_indent}{f}\n"
-                        if len(code) > 7500:  # Avoid token limits
-                            code += "... (directory listing truncated)"
-                            break
+                # For directories (like test directories), get a bounded summary
+                code = summarize_directory(component_path, self.directory_ignore_patterns)
             else:
                 # For regular files, read content
                 with open(component_path, 'r') as f:
@@ -107,45 +289,223 @@ Be thorough and check against ALL relevant nf-core requirements for the componen
                 "path": component_path
             }
         
-        # Get relevant guidelines from vector store
-        docs = self.vectorstore.similarity_search(
-            f"{file_type} {os.path.basename(component_path)} {code[:500]}", 
-            k=5
-        )
+        return {
+            "path": component_path,
+            "file_type": file_type,
+            "code": code,
+            "content": self._build_content(component_path, file_type, code),
+            "query": f"{file_type} {os.path.basename(component_path)} {code[:500]}",
+            "static": self.rule_engine.evaluate(component_path, file_type, code)
+        }
+    
+    def _build_content(self, component_path: str, file_type: str, code: str) -> str:
+        """Build the component content shown to the LLM
+        
+        Nextflow files, schemas and configs are sent as structural digests so
+        the whole file fits the prompt; everything else is sent as (truncated)
+        raw text.
+        
+        Args:
+            component_path: Path to the component
+            file_type: Component type from _determine_component_type
+            code: Component content
+            
+        Returns:
+            Content for the prompt
+        """
+        content = None
+        if file_type == "schema_file":
+            content = build_schema_digest(code, max_tokens=self.digest_token_budget)
+        elif file_type in ("nextflow_config", "config_file"):
+            content = build_config_digest(code, max_tokens=self.digest_token_budget)
+        elif component_path.endswith(".nf"):
+            content = build_digest(code, max_tokens=self.digest_token_budget)
+        return content if content is not None else code[:self.raw_content_limit]
+    
+    def _lookup_cache(self, prepared: Dict[str, Any], docs: List[Any]):
+        """Look up a previous result for a prepared component
+        
+        Args:
+            prepared: Output of _prepare_component
+            docs: Guideline chunks retrieved for the component
+            
+        Returns:
+            Tuple of (cache key, cached result); the key is None when caching
+            is disabled and the result is None on a miss
+        """
+        if self.cache is None:
+            return None, None
+        
+        cache_key = self._cache_key(prepared["content"], prepared["file_type"], docs, prepared["static"])
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached["path"] = prepared["path"]
+            cached = self._merge_static(prepared, cached)
+        return cache_key, cached
+    
+    def _build_messages(self, prepared: Dict[str, Any], docs: List[Any]) -> List[Any]:
+        """Build the LLM messages for a prepared component
+        
+        Args:
+            prepared: Output of _prepare_component
+            docs: Guideline chunks retrieved for the component
+            
+        Returns:
+            List of chat messages
+        """
         guidelines = "\n".join([d.page_content for d in docs])
+        catalog = self._requirement_catalog(prepared["file_type"])
         
         # Prepare prompt for LLM
         prompt = f"""
-        Component Path: {component_path}
-        Component Type: {file_type}
+        Component Path: {prepared["path"]}
+        Component Type: {prepared["file_type"]}
         
         Component Content:
         ```
-        {code[:8000]}  # Limit code size to avoid token limits
+        {prepared["content"]}
         ```
         
         Relevant Guidelines:
         {guidelines}
         """
         
-        # Query LLM
-        response = self.llm([
+        if catalog:
+            prompt += f"""
+        Requirement Catalog (check these requirements and report each by its ID):
+{catalog}
+        """
+        
+        if prepared["static"]:
+            checked = "\n".join(
+                f"- {req['id']}: {req['description']} ({req['status']})" for req in prepared["static"]
+            )
+            prompt += f"""
+        Already Checked Requirements (decided by static rules; do not include them in your answer):
+{checked}
+        """
+        
+        return [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=prompt)
-        ])
+        ]
+    
+    def _requirement_catalog(self, file_type: str) -> str:
+        """Format the requirements of a component type's guideline pack
         
-        # Parse response
+        Args:
+            file_type: Component type from _determine_component_type
+            
+        Returns:
+            One line per requirement, or "" if the type has no pack requirements
+        """
+        pack = self.guideline_packs.get(file_type)
+        if not pack or not pack["requirements"]:
+            return ""
+        return "\n".join(
+            f"- {req['id']} [{req['level'].upper()}]: {req['text']}" for req in pack["requirements"]
+        )
+    
+    def _messages_text(self, messages: List[Any]) -> str:
+        """Join message contents for token estimation"""
+        return "\n".join(m.content for m in messages)
+    
+    def _parse_response(self, prepared: Dict[str, Any], content: str, cache_key: Optional[str]) -> Dict[str, Any]:
+        """Parse the LLM response into a validation result
+        
+        Args:
+            prepared: Output of _prepare_component
+            content: Raw LLM response text
+            cache_key: Key to store the result under, or None
+            
+        Returns:
+            Dictionary with validation results
+        """
         try:
-            result = json.loads(response.content)
-            result["path"] = component_path  # Ensure path is included
-            return result
+            result = json.loads(content)
+            result["path"] = prepared["path"]  # Ensure path is included
+            if cache_key is not None:
+                self.cache.put(cache_key, result)
+            return self._merge_static(prepared, result)
         except json.JSONDecodeError:
             return {
                 "error": "Failed to parse LLM response as JSON",
-                "raw_response": response.content,
-                "path": component_path
+                "raw_response": content,
+                "path": prepared["path"]
             }
             
+    def refresh_static_rules(self, component_path: str, code: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Re-evaluate the static rules of a result obtained elsewhere
+        
+        Used for results reused from the module catalog, whose static rules
+        (e.g. whether meta.yml exists) depend on the pipeline checkout.
+        
+        Args:
+            component_path: Path to the component
+            code: Component content
+            result: Previously computed result
+            
+        Returns:
+            Result with fresh static rule outcomes and summary
+        """
+        file_type = self._determine_component_type(component_path)
+        prepared = {
+            "path": component_path,
+            "file_type": file_type,
+            "static": self.rule_engine.evaluate(component_path, file_type, code)
+        }
+        return self._merge_static(prepared, result)
+    
+    def _merge_static(self, prepared: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine static rule results with an LLM result
+        
+        Static results take precedence over LLM results with the same ID,
+        and the summary is recomputed over all requirements.
+        
+        Args:
+            prepared: Output of _prepare_component
+            result: Parsed LLM result, or an empty dictionary
+            
+        Returns:
+            Component result in the usual JSON shape
+        """
+        static = prepared["static"]
+        static_ids = {req["id"] for req in static}
+        requirements = static + [
+            req for req in result.get("requirements", []) if req.get("id") not in static_ids
+        ]
+        
+        merged = dict(result)
+        merged.setdefault("component_type", prepared["file_type"])
+        merged["path"] = prepared["path"]
+        merged["requirements"] = requirements
+        merged["summary"] = summarize_requirements(requirements)
+        return merged
+    
+    def _cache_key(self, code: str, file_type: str, docs: List[Any], static: List[Dict[str, Any]]) -> str:
+        """Build the result cache key for a validation request
+        
+        Args:
+            code: Component content sent to the LLM
+            file_type: Component type from _determine_component_type
+            docs: Guideline chunks retrieved for the component
+            static: Static rule results included in the prompt
+            
+        Returns:
+            Cache key string; it changes with the requirement catalog of the
+            type's guideline pack, which is part of the prompt
+        """
+        chunk_ids = [hashlib.sha1(d.page_content.encode("utf-8")).hexdigest() for d in docs]
+        return ResultCache.make_key(
+            code,
+            file_type,
+            ",".join(chunk_ids),
+            self._requirement_catalog(file_type),
+            json.dumps(static, sort_keys=True),
+            self.system_prompt,
+            self.model_name
+        )
+            
     def _determine_component_type(self, path: str) -> str:
         """Determine the type of component based on path
         
@@ -155,27 +515,4 @@ Be thorough and check against ALL relevant nf-core requirements for the componen
         Returns:
             Component type string
         """
-        if os.path.isdir(path):
-            if path.endswith('/tests'):
-                return "test_data"
-            return "directory"
-            
-        filename = os.path.basename(path)
-        if '/modules/' in path and filename == 'main.nf':
-            return "module"
-        elif '/subworkflows/' in path and filename.endswith('.nf'):
-            return "subworkflow"
-        elif '/workflows/' in path and filename.endswith('.nf'):
-            return "workflow"
-        elif filename == 'main.nf':
-            return "main_workflow"
-        elif filename == 'nextflow.config':
-            return "nextflow_config"
-        elif filename.endswith('.config'):
-            return "config_file"
-        elif filename == 'nextflow_schema.json':
-            return "schema_file"
-        elif filename in ['README.md', 'CHANGELOG.md', 'CITATIONS.md', 'LICENSE']:
-            return "documentation_file"
-        else:
-            return "other_file"
+        return determine_component_type(path)
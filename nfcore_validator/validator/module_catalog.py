@@ -0,0 +1,222 @@
+"""
+Fingerprint catalog of validated upstream nf-core modules
+"""
+import os
+import json
+import glob
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional
+
+from .nextflow_digest import strip_comments
+
+DEFAULT_CATALOG_PATH = "nfcore_module_catalog.json"
+
+
+def module_fingerprint(code: str) -> str:
+    """Hash a module's main.nf independent of comments and whitespace
+
+    Args:
+        code: Module source
+
+    Returns:
+        Hex digest of the normalized source
+    """
+    lines = [line.strip() for line in strip_comments(code).splitlines()]
+    normalized = "\n".join(line for line in lines if line)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def upstream_module_name(component_path: str) -> Optional[str]:
+    """Get the nf-core module name of a component, e.g. ``samtools/sort``
+
+    Args:
+        component_path: Path to a component
+
+    Returns:
+        Module name, or None if the component is not an nf-core module
+    """
+    parts = os.path.normpath(component_path).split(os.sep)
+    if parts[-1] != "main.nf":
+        return None
+    for i in range(len(parts) - 2):
+        if parts[i] == "modules" and parts[i + 1] == "nf-core":
+            return "/".join(parts[i + 2:-1]) or None
+    return None
+
+
+def validator_name(validator) -> str:
+    """Get what the results of a validator depend on, as recorded in catalogs
+
+    Args:
+        validator: NfCoreValidator instance
+
+    Returns:
+        "static" for static-only validators, otherwise the model name
+    """
+    return "static" if validator.static_only else validator.model_name
+
+
+class ModuleCatalog:
+    """Maps normalized module fingerprints to stored validation results
+
+    The catalog is built offline from a checkout of nf-core/modules, so
+    pipeline scans can reuse the result of every module that was installed
+    unmodified instead of validating it again.
+    """
+
+    def __init__(self, modules: Optional[Dict[str, Dict[str, Any]]] = None, validated_with: str = ""):
+        """Initialize the catalog
+
+        Args:
+            modules: Existing entries keyed by fingerprint
+            validated_with: Model name used to build the catalog, or
+                "static" for catalogs built with the static rules only
+        """
+        self.modules = modules or {}
+        self.validated_with = validated_with
+
+    @classmethod
+    def load(cls, catalog_path: str) -> "ModuleCatalog":
+        """Load a catalog from disk
+
+        Args:
+            catalog_path: Path to the catalog file
+
+        Returns:
+            ModuleCatalog instance
+        """
+        if not os.path.exists(catalog_path):
+            raise ValueError(f"Module catalog does not exist: {catalog_path}")
+
+        with open(catalog_path, "r") as f:
+            data = json.load(f)
+        return cls(data.get("modules", {}), data.get("validated_with", ""))
+
+    def save(self, catalog_path: str) -> None:
+        """Write the catalog to disk
+
+        Args:
+            catalog_path: Path to the catalog file
+        """
+        with open(catalog_path, "w") as f:
+            json.dump({"validated_with": self.validated_with, "modules": self.modules}, f, indent=2)
+
+    def matches(self, validator) -> bool:
+        """Check whether the catalog was built with the same kind of validator
+
+        Catalogs that do not record their validator are assumed to match.
+
+        Args:
+            validator: NfCoreValidator that would use the catalog
+
+        Returns:
+            True if the catalogued results are comparable to the validator's
+        """
+        return not self.validated_with or self.validated_with == validator_name(validator)
+
+    def for_validator(self, validator) -> Optional["ModuleCatalog"]:
+        """Get the catalog if it matches a validator, warning if it does not
+
+        Args:
+            validator: NfCoreValidator that would use the catalog
+
+        Returns:
+            This catalog, or None if it was built with another validator
+        """
+        if self.matches(validator):
+            return self
+        print(f"Warning: Module catalog was built with {self.validated_with}, not "
+              f"{validator_name(validator)}; ignoring it")
+        return None
+
+    def lookup(self, component_path: str, code: str) -> Optional[Dict[str, Any]]:
+        """Get the stored result of an unmodified upstream module
+
+        Args:
+            component_path: Path to the module's main.nf in the pipeline
+            code: Module source
+
+        Returns:
+            Result marked as inherited, or None if the module is not an
+            nf-core module or does not match any catalog entry
+        """
+        if upstream_module_name(component_path) is None:
+            return None
+        entry = self.modules.get(module_fingerprint(code))
+        if entry is None:
+            return None
+
+        result = dict(entry["result"])
+        result["path"] = component_path
+        result["inherited"] = True
+        result["inherited_from"] = entry["name"]
+        return result
+
+    def add(self, name: str, code: str, result: Dict[str, Any]) -> None:
+        """Store the result of an upstream module
+
+        Args:
+            name: Module name, e.g. ``samtools/sort``
+            code: Module source
+            result: Validation result
+        """
+        result = {key: value for key, value in result.items() if key != "path"}
+        self.modules[module_fingerprint(code)] = {"name": name, "result": result}
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+
+def build_catalog(modules_repo: str, validator, catalog: Optional[ModuleCatalog] = None,
+                  max_workers: int = 4) -> ModuleCatalog:
+    """Validate all modules of an nf-core/modules checkout into a catalog
+
+    Modules whose fingerprint is already in the catalog are skipped, so an
+    existing catalog can be updated after pulling the modules repository.
+
+    Args:
+        modules_repo: Path to a checkout of nf-core/modules
+        validator: NfCoreValidator used to validate the modules
+        catalog: Catalog to update (defaults to a new one)
+        max_workers: Maximum number of modules validated concurrently
+
+    Returns:
+        The updated catalog
+    """
+    module_paths = sorted(glob.glob(os.path.join(modules_repo, "modules", "nf-core", "**", "main.nf"), recursive=True))
+    if not module_paths:
+        raise ValueError(f"No nf-core modules found under {modules_repo}/modules/nf-core")
+
+    if catalog is not None and not catalog.matches(validator):
+        # Results of different validators must not be mixed in one catalog
+        print(f"Rebuilding the module catalog, which was built with {catalog.validated_with}")
+        catalog = None
+    if catalog is None:
+        catalog = ModuleCatalog()
+    catalog.validated_with = validator_name(validator)
+
+    pending = {}
+    for path in module_paths:
+        with open(path, "r") as f:
+            code = f.read()
+        if module_fingerprint(code) not in catalog.modules:
+            pending[path] = code
+    print(f"Found {len(module_paths)} modules, {len(pending)} not yet in the catalog")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_path = {executor.submit(validator.validate_component, path): path for path in pending}
+        for future in as_completed(future_to_path):
+            path = future_to_path[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error validating {path}: {str(e)}")
+                continue
+            if "error" in result:
+                print(f"Error validating {path}: {result['error']}")
+                continue
+            catalog.add(upstream_module_name(path), pending[path], result)
+            print(f"Catalogued module: {upstream_module_name(path)}")
+
+    return catalog
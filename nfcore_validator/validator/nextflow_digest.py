@@ -0,0 +1,313 @@
+"""
+Structural digest of Nextflow DSL2 source files
+"""
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..utils.rate_limiter import estimate_tokens
+
+# Section labels inside process and workflow bodies
+PROCESS_SECTIONS = ["input", "output", "when", "script", "shell", "exec", "stub"]
+WORKFLOW_SECTIONS = ["take", "main", "emit", "publish"]
+
+# Process directives shown first in the digest
+KEY_DIRECTIVES = ["tag", "label", "container", "conda"]
+
+_SECTION_RE = re.compile(r"(?m)^[ \t]*(%s)\s*:(?!:)" % "|".join(PROCESS_SECTIONS + WORKFLOW_SECTIONS))
+_BLOCK_RE = re.compile(r"(?m)^[ \t]*(process|workflow)\b[ \t]*([A-Za-z_][A-Za-z0-9_]*)?[ \t]*\{")
+
+
+def find_string_end(code: str, start: int) -> int:
+    """Find the end of the string literal starting at ``start``
+
+    Handles single-, double- and triple-quoted strings, including ``${...}``
+    interpolations in double-quoted strings that span several lines.
+
+    Args:
+        code: Source text
+        start: Index of the opening quote
+
+    Returns:
+        Index just past the closing quote
+    """
+    n = len(code)
+    if code.startswith('"""', start) or code.startswith("'''", start):
+        end = code.find(code[start:start + 3], start + 3)
+        return n if end == -1 else end + 3
+
+    quote = code[start]
+    i = start + 1
+    while i < n:
+        char = code[i]
+        if char == "\\":
+            i += 2
+        elif char == quote or char == "\n":
+            return i + 1
+        elif quote == '"' and code.startswith("${", i):
+            depth = 0
+            while i < n:
+                if code[i] == "'":
+                    i = find_string_end(code, i)
+                    continue
+                if code[i] == "{":
+                    depth += 1
+                elif code[i] == "}":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            i += 1
+        else:
+            i += 1
+    return n
+
+
+def strip_comments(code: str) -> str:
+    """Remove comments from Groovy/Nextflow source, leaving string literals intact
+
+    Args:
+        code: Source text
+
+    Returns:
+        Source without ``//`` and ``/* */`` comments
+    """
+    out = []
+    i = 0
+    n = len(code)
+    while i < n:
+        if code[i] in "\"'":
+            end = find_string_end(code, i)
+            out.append(code[i:end])
+            i = end
+        elif code.startswith("//", i):
+            end = code.find("\n", i)
+            i = n if end == -1 else end
+        elif code.startswith("/*", i):
+            end = code.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+        else:
+            out.append(code[i])
+            i += 1
+    return "".join(out)
+
+
+def find_matching_brace(code: str, start: int) -> int:
+    """Find the closing brace of the block opened at ``start``, skipping strings
+
+    Args:
+        code: Source text
+        start: Index of the opening brace
+
+    Returns:
+        Index of the closing brace, or the length of the text if unbalanced
+    """
+    depth = 0
+    i = start
+    n = len(code)
+    while i < n:
+        char = code[i]
+        if char in "\"'":
+            i = find_string_end(code, i)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return n
+
+
+def _statements(text: str) -> List[str]:
+    """Split a block section into statements, joining lines inside open brackets or strings"""
+    statements = []
+    current = []
+    depth = 0
+    i = 0
+    n = len(text)
+    while i < n:
+        char = text[i]
+        if char in "\"'":
+            end = find_string_end(text, i)
+            current.append(text[i:end])
+            i = end
+            continue
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        if char == "\n" and depth <= 0:
+            statements.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    statements.append("".join(current))
+    return [re.sub(r"\s+", " ", stmt).strip() for stmt in statements if stmt.strip()]
+
+
+def _split_sections(body: str) -> Tuple[str, Dict[str, str]]:
+    """Split a block body into its leading part and labelled sections"""
+    matches = list(_SECTION_RE.finditer(body))
+    if not matches:
+        return body, {}
+    sections = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(body)
+        sections[match.group(1)] = body[match.end():end]
+    return body[:matches[0].start()], sections
+
+
+def parse_nextflow(code: str) -> Dict[str, Any]:
+    """Extract the structure of a Nextflow DSL2 file
+
+    Args:
+        code: Nextflow source
+
+    Returns:
+        Dictionary with includes, params, functions, processes and workflows
+    """
+    code = strip_comments(code)
+    structure = {
+        "includes": [
+            re.sub(r"\s+", " ", include).strip()
+            for include in re.findall(r"(?m)^[ \t]*include\s*\{[^}]*\}\s*from\s*\S+", code)
+        ],
+        "params": sorted(set(re.findall(r"\bparams\.([A-Za-z_][A-Za-z0-9_]*)", code))),
+        "functions": re.findall(r"(?m)^[ \t]*def\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(", code),
+        "processes": [],
+        "workflows": []
+    }
+
+    for match in _BLOCK_RE.finditer(code):
+        open_brace = match.end() - 1
+        body = code[open_brace + 1:find_matching_brace(code, open_brace)]
+        head, sections = _split_sections(body)
+
+        if match.group(1) == "process":
+            script = sections.get("script") or sections.get("shell") or sections.get("exec") or ""
+            directives = {}
+            for line in _statements(head):
+                name = line.split(None, 1)[0].rstrip("(")
+                directives.setdefault(name, []).append(line)
+            structure["processes"].append({
+                "name": match.group(2),
+                "directives": directives,
+                "inputs": _statements(sections.get("input", "")),
+                "outputs": _statements(sections.get("output", "")),
+                "when": _statements(sections.get("when", "")),
+                "script": {
+                    "lines": sum(1 for line in script.splitlines() if line.strip()),
+                    "writes_versions_yml": "versions.yml" in script,
+                    "uses_ext_args": "task.ext.args" in script,
+                    "uses_ext_prefix": "task.ext.prefix" in script,
+                    "has_stub": "stub" in sections
+                }
+            })
+        else:
+            main = sections.get("main", head if not sections else "")
+            structure["workflows"].append({
+                "name": match.group(2) or "(entry workflow)",
+                "take": _statements(sections.get("take", "")),
+                "emit": _statements(sections.get("emit", "")),
+                "calls": sorted(set(re.findall(r"\b([A-Z][A-Z0-9_]*)\s*\(", main))),
+                "main_statements": len(_statements(main))
+            })
+
+    return structure
+
+
+def _render(structure: Dict[str, Any], detailed: bool) -> List[str]:
+    """Render a parsed structure as digest lines"""
+    out = []
+    if structure["includes"]:
+        out.append("Includes:")
+        out.extend(f"  {line}" for line in structure["includes"])
+    if structure["params"]:
+        out.append("Params used: " + ", ".join(structure["params"]))
+    if structure["functions"]:
+        out.append("Functions: " + ", ".join(structure["functions"]))
+
+    for process in structure["processes"]:
+        out.append(f"process {process['name']}:")
+        directives = process["directives"]
+        names = KEY_DIRECTIVES + [name for name in directives if name not in KEY_DIRECTIVES]
+        for name in names:
+            if name not in directives:
+                if name in KEY_DIRECTIVES:
+                    out.append(f"  directive {name}: (missing)")
+                continue
+            if detailed or name in KEY_DIRECTIVES:
+                out.extend(f"  directive {line}" for line in directives[name])
+        for label in ["inputs", "outputs", "when"]:
+            if process[label]:
+                out.append(f"  {label}:")
+                out.extend(f"    {line}" for line in process[label])
+        script = process["script"]
+        out.append(
+            f"  script: {script['lines']} lines; writes versions.yml: {script['writes_versions_yml']}; "
+            f"uses task.ext.args: {script['uses_ext_args']}; uses task.ext.prefix: {script['uses_ext_prefix']}; "
+            f"stub: {script['has_stub']}"
+        )
+
+    for workflow in structure["workflows"]:
+        out.append(f"workflow {workflow['name']}:")
+        if workflow["take"]:
+            out.append("  take: " + "; ".join(workflow["take"]))
+        if workflow["emit"]:
+            out.append("  emit:")
+            out.extend(f"    {line}" for line in workflow["emit"])
+        if workflow["calls"]:
+            out.append("  main calls: " + ", ".join(workflow["calls"]))
+        out.append(f"  main: {workflow['main_statements']} statements")
+    return out
+
+
+def build_digest(code: str, max_tokens: int = 3000) -> Optional[str]:
+    """Build a compact structural digest of a Nextflow DSL2 file
+
+    All directives are included while the digest fits the token budget;
+    otherwise only key directives are kept, and as a last resort the digest
+    is cut at the budget with a note saying how much was left out.
+
+    Args:
+        code: Nextflow source
+        max_tokens: Token budget of the digest
+
+    Returns:
+        Digest text, or None if the file has no processes or workflows
+    """
+    structure = parse_nextflow(code)
+    if not structure["processes"] and not structure["workflows"]:
+        return None
+
+    lines = _render(structure, detailed=True)
+    if estimate_tokens("\n".join(lines)) > max_tokens:
+        lines = _render(structure, detailed=False)
+
+    return fit_to_budget(
+        "Nextflow DSL2 structural digest (comments removed, script bodies summarized):", lines, max_tokens
+    )
+
+
+def fit_to_budget(header: str, lines: List[str], max_tokens: int) -> str:
+    """Join digest lines, cutting them off at a token budget
+
+    Args:
+        header: First line of the digest
+        lines: Digest lines in priority order
+        max_tokens: Token budget of the digest
+
+    Returns:
+        Digest text, ending with a note if lines were left out
+    """
+    digest = [header]
+    used = estimate_tokens(header)
+    for i, line in enumerate(lines):
+        used += estimate_tokens(line)
+        if used > max_tokens:
+            digest.append(f"... ({len(lines) - i} more lines omitted to fit the token budget)")
+            break
+        digest.append(line)
+    return "\n".join(digest)
@@ -0,0 +1,146 @@
+"""
+Persistent on-disk cache for component validation results
+"""
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+DEFAULT_CACHE_DIR = ".nfcore_validator_cache"
+
+
+class ResultCache:
+    """Content-addressed, size-bounded LRU cache for validation results
+
+    Each entry is stored as a JSON file named after its key. The file
+    modification time doubles as the last-access time, so the least
+    recently used entries are evicted first once the cache grows past
+    ``max_entries``.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = 5000):
+        """Initialize the cache
+
+        Args:
+            cache_dir: Directory holding the cached results
+            max_entries: Maximum number of results kept on disk
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._entry_count = len(self._list_entries())
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the given parts
+
+        Args:
+            parts: Strings that together identify a validation request
+
+        Returns:
+            Hex digest identifying the request
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8", errors="replace"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached result
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r") as f:
+                result = json.load(f)
+            # Touch the entry so it counts as recently used
+            os.utime(entry_path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result in the cache
+
+        Args:
+            key: Cache key from make_key
+            result: Validation result to store
+        """
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        is_new = not os.path.exists(entry_path)
+
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, entry_path)
+
+        with self._lock:
+            if is_new:
+                self._entry_count += 1
+            needs_eviction = self._entry_count > self.max_entries
+        if needs_eviction:
+            self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters
+
+        Returns:
+            Dictionary with hits, misses and current number of entries
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": self._entry_count
+            }
+
+    def _entry_path(self, key: str) -> str:
+        """Get the file path for a cache key"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _list_entries(self):
+        """List all cache entry files"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for f in files:
+                if f.endswith(".json"):
+                    entries.append(os.path.join(root, f))
+        return entries
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits again"""
+        with self._lock:
+            entries = []
+            for entry_path in self._list_entries():
+                try:
+                    entries.append((os.path.getmtime(entry_path), entry_path))
+                except OSError:
+                    continue
+            entries.sort()
+
+            # Evict down to 90% of the limit so we don't rescan on every put
+            target = int(self.max_entries * 0.9)
+            excess = max(0, len(entries) - target)
+            for _, entry_path in entries[:excess]:
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    pass
+            self._entry_count = len(entries) - excess
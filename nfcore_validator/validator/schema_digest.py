@@ -0,0 +1,132 @@
+"""
+Structural digest of nextflow_schema.json files
+"""
+import json
+from typing import Dict, Any, Optional
+
+from .nextflow_digest import fit_to_budget
+
+
+def _format_default(value: Any) -> str:
+    """Format a parameter default for the digest table"""
+    if value is None:
+        return "-"
+    text = json.dumps(value)
+    return text if len(text) <= 40 else text[:37] + "..."
+
+
+def parse_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the parameter groups of a parsed nextflow_schema.json
+
+    Both the draft-07 ``definitions`` and the 2020-12 ``$defs`` layouts are
+    supported; top-level ``properties`` are reported as the "(ungrouped)"
+    group.
+
+    Args:
+        schema: Parsed schema
+
+    Returns:
+        Dictionary with the schema header fields and a list of groups
+    """
+    definitions = schema.get("$defs") or schema.get("definitions") or {}
+    referenced = [
+        entry["$ref"].rsplit("/", 1)[-1]
+        for entry in schema.get("allOf", [])
+        if isinstance(entry, dict) and "$ref" in entry
+    ]
+
+    groups = []
+    sources = list(definitions.items())
+    if schema.get("properties"):
+        sources.append(("(ungrouped)", schema))
+    for group_id, group in sources:
+        if not isinstance(group, dict):
+            continue
+        required = set(group.get("required", []))
+        params = []
+        for name, prop in (group.get("properties") or {}).items():
+            if not isinstance(prop, dict):
+                continue
+            params.append({
+                "name": name,
+                "type": prop.get("type", "-"),
+                "default": prop.get("default"),
+                "required": name in required,
+                "description": bool(prop.get("description")),
+                "help_text": bool(prop.get("help_text")),
+                "fa_icon": bool(prop.get("fa_icon")),
+                "hidden": bool(prop.get("hidden")),
+                "constraints": [key for key in ("enum", "pattern", "format", "minimum", "maximum") if key in prop]
+            })
+        groups.append({
+            "id": group_id,
+            "title": group.get("title", ""),
+            "fa_icon": bool(group.get("fa_icon")),
+            "description": bool(group.get("description")),
+            "referenced": group_id == "(ungrouped)" or group_id in referenced,
+            "params": params
+        })
+
+    return {
+        "schema": schema.get("$schema", ""),
+        "id": schema.get("$id", ""),
+        "title": schema.get("title", ""),
+        "description": bool(schema.get("description")),
+        "unknown_refs": [ref for ref in referenced if ref not in definitions],
+        "groups": groups
+    }
+
+
+def build_schema_digest(code: str, max_tokens: int = 3000) -> Optional[str]:
+    """Build a compact table of all parameters in a nextflow_schema.json
+
+    Args:
+        code: Schema file content
+        max_tokens: Token budget of the digest
+
+    Returns:
+        Digest text, or None if the content is not a JSON object
+    """
+    try:
+        schema = json.loads(code)
+    except ValueError:
+        return None
+    if not isinstance(schema, dict):
+        return None
+
+    structure = parse_schema(schema)
+    lines = [
+        f"$schema: {structure['schema'] or '(missing)'}",
+        f"$id: {structure['id'] or '(missing)'}",
+        f"title: {structure['title'] or '(missing)'}; description: {'yes' if structure['description'] else 'no'}"
+    ]
+    if structure["unknown_refs"]:
+        lines.append("allOf references undefined groups: " + ", ".join(structure["unknown_refs"]))
+    lines.append("columns: param | type | default | required | description | help_text | fa_icon | hidden "
+                 "| constraints (y = yes, n = no)")
+
+    for group in structure["groups"]:
+        flags = [
+            f"fa_icon: {'yes' if group['fa_icon'] else 'no'}",
+            f"description: {'yes' if group['description'] else 'no'}"
+        ]
+        if not group["referenced"]:
+            flags.append("NOT referenced in allOf")
+        lines.append(f"group {group['id']} \"{group['title']}\" ({'; '.join(flags)}):")
+        for param in group["params"]:
+            lines.append("  " + " | ".join([
+                param["name"],
+                str(param["type"]),
+                _format_default(param["default"]),
+                "y" if param["required"] else "n",
+                "y" if param["description"] else "n",
+                "y" if param["help_text"] else "n",
+                "y" if param["fa_icon"] else "n",
+                "y" if param["hidden"] else "n",
+                ",".join(param["constraints"]) or "-"
+            ]))
+
+    total = sum(len(group["params"]) for group in structure["groups"])
+    return fit_to_budget(
+        f"nextflow_schema.json digest ({len(structure['groups'])} groups, {total} parameters):", lines, max_tokens
+    )
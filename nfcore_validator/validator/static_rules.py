@@ -0,0 +1,200 @@
+"""
+Deterministic rule engine for mechanical nf-core requirements
+"""
+import os
+import re
+import json
+from typing import Callable, Dict, Any, List, NamedTuple
+
+
+class StaticRule(NamedTuple):
+    """A requirement that can be decided without an LLM"""
+    id: str
+    component_types: List[str]
+    description: str
+    fix: str
+    check: Callable[[str, str], bool]
+
+
+RULES: List[StaticRule] = []
+
+
+def rule(rule_id: str, component_types: List[str], description: str, fix: str):
+    """Register a check function as a static rule
+
+    The check function takes the component path and content and returns
+    True if the requirement is met.
+
+    Args:
+        rule_id: Requirement ID used in reports
+        component_types: Component types the rule applies to
+        description: Requirement description
+        fix: Suggested fix if the requirement fails
+    """
+    def register(check: Callable[[str, str], bool]) -> Callable[[str, str], bool]:
+        RULES.append(StaticRule(rule_id, component_types, description, fix, check))
+        return check
+    return register
+
+
+def _sibling_exists(path: str, filename: str) -> bool:
+    """Check whether a file exists next to a component"""
+    return os.path.isfile(os.path.join(os.path.dirname(path), filename))
+
+
+def _strip_comments(code: str) -> str:
+    """Remove Groovy line and block comments"""
+    code = re.sub(r"/\*.*?\*/", "", code, flags=re.DOTALL)
+    return re.sub(r"(?m)^\s*//.*$", "", code)
+
+
+# Module rules
+
+@rule("module_tag", ["module"],
+      "Module process declares a tag directive",
+      "Add a `tag \"$meta.id\"` directive to the process")
+def _module_tag(path: str, code: str) -> bool:
+    return re.search(r"(?m)^\s*tag\s", _strip_comments(code)) is not None
+
+
+@rule("module_label", ["module"],
+      "Module process declares a resource label",
+      "Add a standard label such as `label 'process_single'` to the process")
+def _module_label(path: str, code: str) -> bool:
+    return re.search(r"(?m)^\s*label\s", _strip_comments(code)) is not None
+
+
+@rule("module_versions_output", ["module"],
+      "Module emits a versions.yml file on the `versions` channel",
+      "Add `path \"versions.yml\", emit: versions` to the process outputs")
+def _module_versions_output(path: str, code: str) -> bool:
+    pattern = r"path\s*\(?\s*[\"']versions\.yml[\"']\s*\)?\s*,\s*emit\s*:\s*versions"
+    return re.search(pattern, _strip_comments(code)) is not None
+
+
+@rule("module_meta_yml", ["module"],
+      "Module has a meta.yml file next to main.nf",
+      "Add a meta.yml documenting the module's tools, inputs and outputs")
+def _module_meta_yml(path: str, code: str) -> bool:
+    return _sibling_exists(path, "meta.yml")
+
+
+@rule("module_environment_yml", ["module"],
+      "Module has an environment.yml file next to main.nf",
+      "Add an environment.yml with the module's conda dependencies")
+def _module_environment_yml(path: str, code: str) -> bool:
+    return _sibling_exists(path, "environment.yml")
+
+
+# Subworkflow rules
+
+@rule("subworkflow_meta_yml", ["subworkflow"],
+      "Subworkflow has a meta.yml file next to main.nf",
+      "Add a meta.yml documenting the subworkflow's inputs and outputs")
+def _subworkflow_meta_yml(path: str, code: str) -> bool:
+    return _sibling_exists(path, "meta.yml")
+
+
+@rule("subworkflow_versions_emit", ["subworkflow"],
+      "Subworkflow emits a `versions` channel",
+      "Collect the versions of all included components and emit them as `versions`")
+def _subworkflow_versions_emit(path: str, code: str) -> bool:
+    emit = re.search(r"(?s)\bemit\s*:(.*)", _strip_comments(code))
+    return emit is not None and re.search(r"\bversions\b", emit.group(1)) is not None
+
+
+# Pipeline-level rules, attached to the pipeline's main.nf
+
+@rule("pipeline_changelog", ["main_workflow"],
+      "Pipeline has a CHANGELOG.md",
+      "Add a CHANGELOG.md to the pipeline root")
+def _pipeline_changelog(path: str, code: str) -> bool:
+    return _sibling_exists(path, "CHANGELOG.md")
+
+
+@rule("pipeline_license", ["main_workflow"],
+      "Pipeline has a LICENSE file",
+      "Add the MIT LICENSE file to the pipeline root")
+def _pipeline_license(path: str, code: str) -> bool:
+    return _sibling_exists(path, "LICENSE")
+
+
+@rule("pipeline_readme", ["main_workflow"],
+      "Pipeline has a README.md",
+      "Add a README.md to the pipeline root")
+def _pipeline_readme(path: str, code: str) -> bool:
+    return _sibling_exists(path, "README.md")
+
+
+@rule("pipeline_schema", ["main_workflow"],
+      "Pipeline has a nextflow_schema.json",
+      "Create nextflow_schema.json with `nf-core pipelines schema build`")
+def _pipeline_schema(path: str, code: str) -> bool:
+    return _sibling_exists(path, "nextflow_schema.json")
+
+
+# Schema rules
+
+@rule("schema_valid_json", ["schema_file"],
+      "nextflow_schema.json is valid JSON",
+      "Fix the JSON syntax errors in nextflow_schema.json")
+def _schema_valid_json(path: str, code: str) -> bool:
+    try:
+        json.loads(code)
+    except ValueError:
+        return False
+    return True
+
+
+class StaticRuleEngine:
+    """Evaluates static rules and reports them in the requirement JSON shape"""
+
+    def __init__(self, rules: List[StaticRule] = None):
+        """Initialize the engine
+
+        Args:
+            rules: Rules to evaluate (defaults to all registered rules)
+        """
+        self.rules = rules if rules is not None else RULES
+
+    def evaluate(self, component_path: str, component_type: str, code: str) -> List[Dict[str, Any]]:
+        """Evaluate all rules that apply to a component
+
+        Args:
+            component_path: Path to the component
+            component_type: Component type from _determine_component_type
+            code: Component content
+
+        Returns:
+            List of requirement dictionaries
+        """
+        requirements = []
+        for static_rule in self.rules:
+            if component_type not in static_rule.component_types:
+                continue
+            passed = static_rule.check(component_path, code)
+            requirement = {
+                "id": static_rule.id,
+                "description": static_rule.description,
+                "status": "passed" if passed else "failed",
+                "source": "static"
+            }
+            if not passed:
+                requirement["fix"] = static_rule.fix
+            requirements.append(requirement)
+        return requirements
+
+
+def summarize_requirements(requirements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the summary block of a component result
+
+    Args:
+        requirements: Requirement dictionaries
+
+    Returns:
+        Dictionary with passed, failed and compliance_score
+    """
+    passed = sum(1 for req in requirements if req.get("status") == "passed")
+    failed = len(requirements) - passed
+    score = round(passed / len(requirements) * 100, 2) if requirements else 0
+    return {"passed": passed, "failed": failed, "compliance_score": score}
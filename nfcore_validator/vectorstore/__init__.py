@@ -0,0 +1,3 @@
+"""
+Vector store loading and storage for nf-core documentation
+"""
@@ -0,0 +1,303 @@
+"""
+SQLite chunk store holding the text and metadata of indexed chunks
+"""
+import os
+import re
+import json
+import pickle
+import sqlite3
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from langchain.docstore.base import Docstore
+from langchain.docstore.document import Document
+
+CHUNK_DB_NAME = "chunks.sqlite"
+LEGACY_DOCSTORE_NAME = "index.pkl"
+
+# Longest lexical query, in distinct terms
+MAX_QUERY_TERMS = 64
+
+
+def lexical_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching any of its terms
+
+    Args:
+        text: Query text, e.g. a question or the start of a component
+
+    Returns:
+        FTS5 query string, or None if the text has no searchable terms
+    """
+    terms = []
+    for term in re.findall(r"\w+", text.lower()):
+        if len(term) > 1 and term not in terms:
+            terms.append(term)
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in terms[:MAX_QUERY_TERMS])
+
+
+class ChunkStore:
+    """Read-only access to a chunk database, one row per index position
+
+    Rows are looked up by FAISS index position or chunk ID, so only the
+    chunks of search hits are ever read from disk. An FTS5 table over the
+    chunk text serves BM25 lexical search without any embedding call.
+
+    The database is opened lazily by each process that queries it, since a
+    SQLite connection must not be used across fork(); a store created in a
+    parent process can be used by its forked workers.
+    """
+
+    def __init__(self, db_path: str):
+        """Open a chunk database
+
+        Args:
+            db_path: Path to the SQLite database
+        """
+        if not os.path.exists(db_path):
+            raise ValueError(f"Chunk store does not exist: {db_path}")
+        self.db_path = db_path
+        self._state: Optional[Tuple[int, sqlite3.Connection, threading.Lock]] = None
+
+    @staticmethod
+    def write(db_path: str, rows: Iterable[Tuple[int, str, str, Dict[str, Any]]]) -> None:
+        """Write a chunk database, replacing any existing one atomically
+
+        Args:
+            db_path: Path to the SQLite database
+            rows: (index position, chunk ID, text, metadata) tuples
+        """
+        tmp_path = db_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute(
+                "CREATE TABLE chunks (position INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, "
+                "text TEXT NOT NULL, metadata TEXT NOT NULL)"
+            )
+            conn.executemany(
+                "INSERT INTO chunks VALUES (?, ?, ?, ?)",
+                ((position, chunk_id, text, json.dumps(metadata)) for position, chunk_id, text, metadata in rows)
+            )
+            conn.execute(
+                "CREATE VIRTUAL TABLE chunks_fts USING fts5(text, content='chunks', content_rowid='position')"
+            )
+            conn.execute("INSERT INTO chunks_fts(chunks_fts) VALUES ('rebuild')")
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, db_path)
+
+    def __len__(self) -> int:
+        return self._query_one("SELECT COUNT(*) FROM chunks")[0]
+
+    def id_at(self, position: int) -> Optional[str]:
+        """Get the chunk ID at an index position
+
+        Args:
+            position: FAISS index position
+
+        Returns:
+            Chunk ID, or None if there is no such position
+        """
+        row = self._query_one("SELECT id FROM chunks WHERE position = ?", (int(position),))
+        return row[0] if row else None
+
+    def document(self, chunk_id: str) -> Optional[Document]:
+        """Get a chunk by ID
+
+        Args:
+            chunk_id: Chunk ID
+
+        Returns:
+            Document, or None if there is no such chunk
+        """
+        row = self._query_one("SELECT text, metadata FROM chunks WHERE id = ?", (chunk_id,))
+        return Document(page_content=row[0], metadata=json.loads(row[1])) if row else None
+
+    def documents_at(self, positions: List[int]) -> List[Optional[Document]]:
+        """Get the chunks at several index positions in one query
+
+        Args:
+            positions: FAISS index positions
+
+        Returns:
+            Documents in the order of the positions; None for unknown positions
+        """
+        positions = [int(position) for position in positions]
+        if not positions:
+            return []
+        placeholders = ",".join("?" * len(positions))
+        conn, lock = self._connection()
+        with lock:
+            rows = conn.execute(
+                f"SELECT position, text, metadata FROM chunks WHERE position IN ({placeholders})", positions
+            ).fetchall()
+        found = {row[0]: Document(page_content=row[1], metadata=json.loads(row[2])) for row in rows}
+        return [found.get(position) for position in positions]
+
+    def has_lexical_index(self) -> bool:
+        """Check whether the store has the full-text table used by lexical_search"""
+        row = self._query_one("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chunks_fts'")
+        return row is not None
+
+    def lexical_search(self, query: str, k: int) -> List[int]:
+        """Rank chunks against a query with BM25
+
+        Args:
+            query: Query text
+            k: Maximum number of results
+
+        Returns:
+            Index positions of the best matching chunks, best first
+        """
+        match = lexical_query(query)
+        if match is None:
+            return []
+        conn, lock = self._connection()
+        with lock:
+            rows = conn.execute(
+                "SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH ? ORDER BY bm25(chunks_fts) LIMIT ?",
+                (match, int(k))
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def entries(self) -> Iterator[Tuple[int, str, str, Dict[str, Any]]]:
+        """Iterate over all chunks in index order
+
+        Yields:
+            (index position, chunk ID, text, metadata) tuples
+        """
+        conn, lock = self._connection()
+        with lock:
+            rows = conn.execute("SELECT position, id, text, metadata FROM chunks ORDER BY position").fetchall()
+        for position, chunk_id, text, metadata in rows:
+            yield position, chunk_id, text, json.loads(metadata)
+
+    def close(self) -> None:
+        """Close the database connection of the current process"""
+        state, self._state = self._state, None
+        if state is not None and state[0] == os.getpid():
+            state[1].close()
+
+    def _connection(self) -> Tuple[sqlite3.Connection, threading.Lock]:
+        """Get the connection of the current process, opening it on first use
+
+        A connection or lock inherited from the parent process is never
+        used: the lock may have been held by another thread at fork time.
+        """
+        state = self._state
+        if state is None or state[0] != os.getpid():
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            state = (os.getpid(), conn, threading.Lock())
+            self._state = state
+        return state[1], state[2]
+
+    def _query_one(self, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        """Run a query and fetch its first row"""
+        conn, lock = self._connection()
+        with lock:
+            return conn.execute(sql, params).fetchone()
+
+
+class ChunkDocstore(Docstore):
+    """LangChain docstore that reads chunks from a ChunkStore on demand"""
+
+    def __init__(self, store: ChunkStore):
+        """Initialize the docstore
+
+        Args:
+            store: Chunk store to read from
+        """
+        self.store = store
+
+    def search(self, search: str) -> Union[str, Document]:
+        """Get a chunk by ID
+
+        Args:
+            search: Chunk ID
+
+        Returns:
+            Document, or an error string like the in-memory docstore
+        """
+        document = self.store.document(search)
+        return document if document is not None else f"ID {search} not found."
+
+
+class PositionMap(Mapping):
+    """Lazy mapping from FAISS index positions to chunk IDs"""
+
+    def __init__(self, store: ChunkStore):
+        """Initialize the mapping
+
+        Args:
+            store: Chunk store to read from
+        """
+        self.store = store
+
+    def __getitem__(self, position: int) -> str:
+        chunk_id = self.store.id_at(position)
+        if chunk_id is None:
+            raise KeyError(position)
+        return chunk_id
+
+    def __iter__(self) -> Iterator[int]:
+        return (position for position, _, _, _ in self.store.entries())
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+
+def docstore_rows(docstore: Any, index_to_docstore_id: Dict[int, str]) -> Iterator[Tuple[int, str, str, Dict[str, Any]]]:
+    """Get the chunk rows of a LangChain docstore in index order
+
+    Args:
+        docstore: Docstore with a search(id) method
+        index_to_docstore_id: Mapping from index position to chunk ID
+
+    Yields:
+        (index position, chunk ID, text, metadata) tuples
+    """
+    for position, chunk_id in sorted(index_to_docstore_id.items()):
+        document = docstore.search(chunk_id)
+        if not isinstance(document, Document):
+            raise ValueError(f"Chunk {chunk_id} is missing from the docstore")
+        yield position, chunk_id, document.page_content, document.metadata
+
+
+def convert_vectorstore(vectorstore_path: str, remove_pickle: bool = False) -> int:
+    """Convert a vector store to the current chunk store format
+
+    Stores with a pickled docstore get a chunk store; existing chunk stores
+    are rewritten, which adds the lexical index to stores created before it.
+    Only load stores you trust: the legacy index.pkl is unpickled here.
+
+    Args:
+        vectorstore_path: Path to the vector store directory
+        remove_pickle: Delete index.pkl after converting
+
+    Returns:
+        Number of converted chunks
+    """
+    pickle_path = os.path.join(vectorstore_path, LEGACY_DOCSTORE_NAME)
+    db_path = os.path.join(vectorstore_path, CHUNK_DB_NAME)
+    if os.path.exists(pickle_path):
+        with open(pickle_path, "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        rows = list(docstore_rows(docstore, index_to_docstore_id))
+    elif os.path.exists(db_path):
+        store = ChunkStore(db_path)
+        try:
+            rows = list(store.entries())
+        finally:
+            store.close()
+    else:
+        raise ValueError(f"No docstore to convert in {vectorstore_path}")
+
+    ChunkStore.write(db_path, rows)
+    if remove_pickle and os.path.exists(pickle_path):
+        os.remove(pickle_path)
+    return len(rows)
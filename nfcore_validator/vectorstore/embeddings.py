@@ -0,0 +1,151 @@
+"""
+Embedding backends for harvesting and querying vector stores
+"""
+import re
+import zlib
+from typing import Any, List, Optional
+
+import numpy as np
+from langchain.embeddings import OpenAIEmbeddings
+from langchain.embeddings.base import Embeddings
+
+from .options import EMBEDDING_BACKENDS
+
+# Dimension of the hashing backend's vectors
+HASHING_DIMENSION = 1024
+
+# Weight of character trigrams relative to words and word pairs
+CHAR_NGRAM_WEIGHT = 0.5
+
+
+class HashingEmbeddings(Embeddings):
+    """Local, deterministic embeddings from hashed text features
+
+    Words, adjacent word pairs and character trigrams of each word are
+    hashed into a fixed number of signed buckets, counts are damped with
+    log1p and vectors are L2-normalized, so nearest neighbours approximate
+    TF cosine similarity. No model, network or API key is needed, and the
+    same text always gets the same vector.
+    """
+
+    def __init__(self, dimension: int = HASHING_DIMENSION):
+        """Initialize the backend
+
+        Args:
+            dimension: Number of hash buckets (vector dimension)
+        """
+        if dimension < 2:
+            raise ValueError(f"Invalid embedding dimension: {dimension}")
+        self.dimension = dimension
+
+    @property
+    def backend_name(self) -> str:
+        """Identity of the backend, recorded with the vector stores it builds"""
+        return f"hashing:{self.dimension}"
+
+    def _features(self, text: str) -> List[tuple]:
+        """Get the (feature, weight) pairs of a text"""
+        words = re.findall(r"\w+", text.lower())
+        features = [(word, 1.0) for word in words]
+        features.extend((f"{first} {second}", 1.0) for first, second in zip(words, words[1:]))
+        for word in words:
+            padded = f"<{word}>"
+            features.extend((padded[i:i + 3], CHAR_NGRAM_WEIGHT) for i in range(len(padded) - 2))
+        return features
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts
+
+        The features of all texts are hashed first and scattered into the
+        batch matrix in one vectorized step.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text
+        """
+        rows, buckets, weights = [], [], []
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                rows.append(row)
+                buckets.append(digest % self.dimension)
+                weights.append(weight if digest & 0x80000000 else -weight)
+
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        np.add.at(matrix, (np.array(rows, dtype=np.int64), np.array(buckets, dtype=np.int64)),
+                  np.array(weights, dtype=np.float32))
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1.0)
+        return matrix.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query vector
+        """
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+
+def create_embeddings(backend: str = "openai", openai_api_key: Optional[str] = None) -> Embeddings:
+    """Create the embeddings of a backend
+
+    Args:
+        backend: One of EMBEDDING_BACKENDS, optionally with a parameter as
+            recorded in store metadata, e.g. "hashing:1024"
+        openai_api_key: OpenAI API key, needed for the "openai" backend
+
+    Returns:
+        Embeddings instance
+    """
+    name, _, parameter = backend.partition(":")
+    if name == "openai":
+        if not openai_api_key:
+            raise ValueError("OpenAI API key is required for OpenAI embeddings. Set OPENAI_API_KEY environment variable or pass it directly.")
+        # Retries are handled by the shared scheduler
+        embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key, max_retries=1)
+        if parameter:
+            embeddings.model = parameter
+        return embeddings
+    if name == "hashing":
+        return HashingEmbeddings(int(parameter)) if parameter else HashingEmbeddings()
+    raise ValueError(f"Unknown embedding backend: {backend}. Choose from {', '.join(EMBEDDING_BACKENDS)}")
+
+
+def embedding_backend_name(embeddings: Any) -> str:
+    """Get the identity of an embeddings instance, e.g. "openai:text-embedding-ada-002"
+
+    Args:
+        embeddings: Embeddings instance
+
+    Returns:
+        Backend name that create_embeddings accepts
+    """
+    if hasattr(embeddings, "backend_name"):
+        return embeddings.backend_name
+    model = getattr(embeddings, "model", None)
+    return f"openai:{model}" if model else type(embeddings).__name__
+
+
+def is_local_backend(embeddings: Any) -> bool:
+    """Check whether embeddings are computed locally, outside any API rate limits
+
+    Args:
+        embeddings: Embeddings instance
+
+    Returns:
+        True for local backends
+    """
+    return isinstance(embeddings, HashingEmbeddings)
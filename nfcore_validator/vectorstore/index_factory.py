@@ -0,0 +1,171 @@
+"""
+Compact FAISS index types and their recall/latency trade-off
+"""
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+import faiss
+import numpy as np
+
+from .options import INDEX_TYPES
+
+# Number of neighbours per HNSW node and search breadth
+HNSW_M = 32
+HNSW_EF_SEARCH = 64
+
+# Preferred numbers of product quantizer sub-vectors, largest first
+PQ_SUBQUANTIZERS = [64, 48, 32, 24, 16, 12, 8, 4, 2, 1]
+
+# Training vectors FAISS needs per k-means centroid (IVF list or PQ code)
+MIN_POINTS_PER_CENTROID = 39
+
+
+def index_description(index_type: str, count: int, dimension: int) -> Dict[str, Any]:
+    """Choose the FAISS factory string and search parameters of an index type
+
+    IVF-PQ is sized from the number of vectors: about sqrt(n) lists, and
+    PQ codebooks of at most 2^8 codes, each with at least
+    MIN_POINTS_PER_CENTROID training vectors per list or code. Small stores
+    get fewer bits per code (down to 1 bit below 156 vectors) instead of
+    undertrained codebooks, and stores too small to train even 1-bit codes
+    get a flat index.
+
+    Args:
+        index_type: One of INDEX_TYPES
+        count: Number of vectors the index is trained on
+        dimension: Vector dimension
+
+    Returns:
+        Dictionary with "factory" and "search_params"
+    """
+    if index_type == "flat":
+        return {"factory": "Flat", "search_params": {}}
+    if index_type == "hnsw":
+        return {"factory": f"HNSW{HNSW_M},Flat", "search_params": {"efSearch": HNSW_EF_SEARCH}}
+    if index_type == "sq8":
+        return {"factory": "SQ8", "search_params": {}}
+    if index_type == "fp16":
+        return {"factory": "SQfp16", "search_params": {}}
+    if index_type == "ivfpq":
+        if count < 2 * MIN_POINTS_PER_CENTROID:
+            return {"factory": "Flat", "search_params": {}}
+        nlist = max(1, min(int(math.sqrt(count)), count // MIN_POINTS_PER_CENTROID))
+        subquantizers = next(m for m in PQ_SUBQUANTIZERS if dimension % m == 0)
+        nbits = max(1, min(8, int(math.log2(max(count // MIN_POINTS_PER_CENTROID, 2)))))
+        return {
+            "factory": f"IVF{nlist},PQ{subquantizers}x{nbits}",
+            "search_params": {"nprobe": min(nlist, max(8, nlist // 16))}
+        }
+    raise ValueError(f"Unknown index type: {index_type}. Choose from {', '.join(INDEX_TYPES)}")
+
+
+def apply_search_params(index: Any, search_params: Dict[str, Any]) -> None:
+    """Set search-time parameters (nprobe, efSearch) on an index
+
+    Args:
+        index: FAISS index
+        search_params: Parameters recorded with the index
+    """
+    if "nprobe" in search_params:
+        faiss.extract_index_ivf(index).nprobe = int(search_params["nprobe"])
+    if "efSearch" in search_params and hasattr(index, "hnsw"):
+        index.hnsw.efSearch = int(search_params["efSearch"])
+
+
+def build_index(vectors: np.ndarray, index_type: str) -> Dict[str, Any]:
+    """Build and train an index of the given type over a set of vectors
+
+    Args:
+        vectors: Float32 matrix with one vector per row, in index order
+        index_type: One of INDEX_TYPES
+
+    Returns:
+        Dictionary with the "index" and its "factory" and "search_params"
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    description = index_description(index_type, len(vectors), vectors.shape[1])
+
+    index = faiss.index_factory(vectors.shape[1], description["factory"])
+    if hasattr(index, "do_polysemous_training"):
+        index.do_polysemous_training = False  # Very slow and unused by our searches
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    apply_search_params(index, description["search_params"])
+
+    description["index"] = index
+    return description
+
+
+def index_vectors(index: Any) -> np.ndarray:
+    """Get the vectors stored in an index, in index order
+
+    Vectors of compressed indexes are approximate.
+
+    Args:
+        index: FAISS index
+
+    Returns:
+        Float32 matrix with one vector per row
+    """
+    if isinstance(index, faiss.IndexIVF):
+        index.make_direct_map()
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def recall_report(vectors: np.ndarray, index_types: Optional[List[str]] = None, k: int = 5,
+                  holdout: float = 0.1, seed: int = 0) -> List[Dict[str, Any]]:
+    """Compare index types against the flat index on held-out queries
+
+    A random share of the vectors is held out as queries; every index type
+    is built on the remaining vectors, and its top-k results are compared
+    with the exact top-k of the flat index.
+
+    Args:
+        vectors: Float32 matrix of chunk embeddings
+        index_types: Index types to compare (defaults to all)
+        k: Number of neighbours per query
+        holdout: Share of vectors used as queries
+        seed: Random seed of the holdout split
+
+    Returns:
+        One dictionary per index type with recall@k, mean query latency in
+        milliseconds, build time in seconds and serialized size in bytes
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    num_queries = max(1, int(len(vectors) * holdout))
+    if len(vectors) - num_queries < k:
+        raise ValueError(f"Need more than {num_queries + k} vectors for a recall report")
+
+    order = np.random.RandomState(seed).permutation(len(vectors))
+    queries = vectors[order[:num_queries]]
+    base = vectors[order[num_queries:]]
+
+    exact = faiss.IndexFlatL2(base.shape[1])
+    exact.add(base)
+    _, truth = exact.search(queries, k)
+
+    report = []
+    for index_type in index_types or INDEX_TYPES:
+        started = time.perf_counter()
+        built = build_index(base, index_type)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for query in queries:
+            built["index"].search(query[None, :], k)
+        latency_ms = (time.perf_counter() - started) / num_queries * 1000
+
+        _, found = built["index"].search(queries, k)
+        hits = sum(len(set(row) & set(expected)) for row, expected in zip(found, truth))
+
+        report.append({
+            "index_type": index_type,
+            "factory": built["factory"],
+            "recall_at_k": round(hits / (num_queries * k), 4),
+            "latency_ms": round(latency_ms, 3),
+            "build_seconds": round(build_seconds, 3),
+            "size_bytes": int(faiss.serialize_index(built["index"]).size)
+        })
+    return report
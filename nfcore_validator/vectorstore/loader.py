@@ -0,0 +1,240 @@
+"""
+Memory-mapped, load-once access to saved FAISS vector stores
+"""
+import os
+import json
+import pickle
+import threading
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+import faiss
+from langchain.docstore.document import Document
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.embeddings.base import Embeddings
+from langchain.vectorstores import FAISS
+
+from .chunk_store import (
+    CHUNK_DB_NAME, LEGACY_DOCSTORE_NAME, ChunkStore, ChunkDocstore, PositionMap, docstore_rows
+)
+from .embeddings import create_embeddings, embedding_backend_name
+from .index_factory import apply_search_params, build_index, index_vectors
+
+STORE_METADATA_NAME = "store.json"
+
+# Map the index file read-only instead of copying it into process memory
+MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+
+class LoadedStore(NamedTuple):
+    """Parts of a saved vector store that are shared within a process"""
+    stamp: Tuple[float, float]
+    index: Any
+    docstore: Any
+    index_to_docstore_id: Mapping[int, str]
+
+
+_stores: Dict[Tuple[str, bool], LoadedStore] = {}
+_lock = threading.Lock()
+
+
+def read_index(index_path: str, mmap: bool = True) -> Any:
+    """Read a FAISS index, memory-mapping it when the index type allows
+
+    Args:
+        index_path: Path to the index file
+        mmap: Whether to memory-map the index
+
+    Returns:
+        FAISS index
+    """
+    if mmap:
+        try:
+            return faiss.read_index(index_path, MMAP_FLAGS)
+        except RuntimeError:
+            pass  # Index type without mmap support
+    return faiss.read_index(index_path)
+
+
+def preload_vectorstore(vectorstore_path: str, mmap: bool = True) -> LoadedStore:
+    """Load the index and docstore of a vector store once per process
+
+    Chunks are read from the chunk store on demand; stores that still have
+    a pickled docstore (index.pkl) are loaded eagerly until converted with
+    convert_vectorstore.
+
+    Later calls with the same path return the same objects until the files
+    on disk change, e.g. after a harvest. Call this in a parent process
+    before forking workers, or pass it as the ``initializer`` of a process
+    pool: memory-mapped indexes are backed by the page cache, so all
+    processes share the same pages instead of holding private copies. The
+    chunk store opens its SQLite database separately in every process that
+    reads from it, so no connection is shared across fork().
+
+    Args:
+        vectorstore_path: Path to the saved vector store
+        mmap: Whether to memory-map the index
+
+    Returns:
+        LoadedStore with the shared index and docstore
+    """
+    index_path = os.path.join(vectorstore_path, "index.faiss")
+    docstore_path = _docstore_path(vectorstore_path)
+
+    key = (os.path.realpath(vectorstore_path), mmap)
+    stamp = (os.path.getmtime(index_path), os.path.getmtime(docstore_path))
+    with _lock:
+        loaded = _stores.get(key)
+        if loaded is None or loaded.stamp != stamp:
+            index = read_index(index_path, mmap)
+            apply_search_params(index, read_store_metadata(vectorstore_path).get("search_params", {}))
+            if docstore_path.endswith(CHUNK_DB_NAME):
+                store = ChunkStore(docstore_path)
+                docstore, index_to_docstore_id = ChunkDocstore(store), PositionMap(store)
+            else:
+                with open(docstore_path, "rb") as f:
+                    docstore, index_to_docstore_id = pickle.load(f)
+            loaded = LoadedStore(stamp, index, docstore, index_to_docstore_id)
+            _stores[key] = loaded
+    return loaded
+
+
+def load_vectorstore(vectorstore_path: str, embeddings: Embeddings, mmap: bool = True) -> FAISS:
+    """Load a vector store for searching
+
+    The index and docstore are shared by all callers in the process (see
+    preload_vectorstore); only the lightweight FAISS wrapper is created per
+    caller, so each can use its own embeddings. The returned store is meant
+    for searching only; use load_writable_vectorstore to update a store.
+
+    Args:
+        vectorstore_path: Path to the saved vector store
+        embeddings: Embeddings used to embed search queries; must be the
+            backend the store was built with (see store_embeddings)
+        mmap: Whether to memory-map the index
+
+    Returns:
+        FAISS vector store
+    """
+    recorded = read_store_metadata(vectorstore_path).get("embedding_backend")
+    if recorded and recorded != embedding_backend_name(embeddings):
+        raise ValueError(
+            f"Vector store {vectorstore_path} was built with {recorded} embeddings, "
+            f"not {embedding_backend_name(embeddings)}"
+        )
+    loaded = preload_vectorstore(vectorstore_path, mmap)
+    return FAISS(embeddings.embed_query, loaded.index, loaded.docstore, loaded.index_to_docstore_id)
+
+
+def load_writable_vectorstore(vectorstore_path: str, embeddings: Embeddings) -> FAISS:
+    """Load a vector store fully into memory so it can be updated
+
+    Args:
+        vectorstore_path: Path to the saved vector store
+        embeddings: Embeddings used by the store
+
+    Returns:
+        FAISS vector store with an in-memory docstore
+    """
+    index_path = os.path.join(vectorstore_path, "index.faiss")
+    docstore_path = _docstore_path(vectorstore_path)
+    if not docstore_path.endswith(CHUNK_DB_NAME):
+        return FAISS.load_local(vectorstore_path, embeddings)
+
+    store = ChunkStore(docstore_path)
+    try:
+        documents = {}
+        index_to_docstore_id = {}
+        for position, chunk_id, text, metadata in store.entries():
+            documents[chunk_id] = Document(page_content=text, metadata=metadata)
+            index_to_docstore_id[position] = chunk_id
+    finally:
+        store.close()
+    return FAISS(embeddings.embed_query, faiss.read_index(index_path), InMemoryDocstore(documents), index_to_docstore_id)
+
+
+def read_store_metadata(vectorstore_path: str) -> Dict[str, Any]:
+    """Read the metadata recorded with a vector store
+
+    Args:
+        vectorstore_path: Path to the saved vector store
+
+    Returns:
+        Metadata dictionary; stores without metadata are flat indexes
+    """
+    metadata_path = os.path.join(vectorstore_path, STORE_METADATA_NAME)
+    if not os.path.exists(metadata_path):
+        return {"index_type": "flat"}
+    with open(metadata_path, "r") as f:
+        return json.load(f)
+
+
+def store_embeddings(vectorstore_path: str, openai_api_key: Optional[str] = None) -> Any:
+    """Create the embeddings a vector store was built with
+
+    Stores without a recorded backend were built with OpenAI embeddings.
+
+    Args:
+        vectorstore_path: Path to the saved vector store
+        openai_api_key: OpenAI API key, needed for stores built with OpenAI
+
+    Returns:
+        Embeddings instance for querying the store
+    """
+    backend = read_store_metadata(vectorstore_path).get("embedding_backend", "openai")
+    return create_embeddings(backend, openai_api_key)
+
+
+def save_vectorstore(vectorstore: FAISS, vectorstore_path: str, index_type: str = "flat",
+                     embedding_backend: Optional[str] = None) -> None:
+    """Save a vector store as a FAISS index and a chunk store
+
+    The index type, its parameters and the embedding backend are recorded
+    in store.json, so loaders pick them up without being told. A pickled
+    docstore left over from the legacy format is removed.
+
+    Args:
+        vectorstore: Vector store to save, with a flat index
+        vectorstore_path: Directory to save it to
+        index_type: Index type to save (see index_factory.INDEX_TYPES);
+            anything but "flat" is built and trained from the flat index
+        embedding_backend: Embedding backend the vectors come from (see
+            embeddings.embedding_backend_name)
+    """
+    os.makedirs(vectorstore_path, exist_ok=True)
+    index = vectorstore.index
+    metadata = {"index_type": "flat", "factory": "Flat", "search_params": {}}
+    if index_type != "flat":
+        metadata = build_index(index_vectors(index), index_type)
+        index = metadata.pop("index")
+        metadata["index_type"] = index_type
+    metadata.update({"dimension": index.d, "count": index.ntotal})
+    if embedding_backend:
+        metadata["embedding_backend"] = embedding_backend
+
+    faiss.write_index(index, os.path.join(vectorstore_path, "index.faiss"))
+    ChunkStore.write(
+        os.path.join(vectorstore_path, CHUNK_DB_NAME),
+        docstore_rows(vectorstore.docstore, vectorstore.index_to_docstore_id)
+    )
+    with open(os.path.join(vectorstore_path, STORE_METADATA_NAME), "w") as f:
+        json.dump(metadata, f, indent=2)
+    legacy_path = os.path.join(vectorstore_path, LEGACY_DOCSTORE_NAME)
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
+
+
+def clear_vectorstore_cache() -> None:
+    """Forget all vector stores loaded in this process"""
+    with _lock:
+        _stores.clear()
+
+
+def _docstore_path(vectorstore_path: str) -> str:
+    """Get the chunk store of a vector store, or its legacy pickled docstore"""
+    if not os.path.exists(os.path.join(vectorstore_path, "index.faiss")):
+        raise ValueError(f"Vector store does not exist: {vectorstore_path}")
+    for name in (CHUNK_DB_NAME, LEGACY_DOCSTORE_NAME):
+        path = os.path.join(vectorstore_path, name)
+        if os.path.exists(path):
+            return path
+    raise ValueError(f"Vector store has no chunk store: {vectorstore_path}")
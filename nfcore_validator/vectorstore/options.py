@@ -0,0 +1,12 @@
+"""
+Names of the vector store options, importable without FAISS or LangChain
+"""
+
+# Embedding backends, see embeddings.create_embeddings
+EMBEDDING_BACKENDS = ["openai", "hashing"]
+
+# FAISS index types, see index_factory.index_description
+INDEX_TYPES = ["flat", "hnsw", "ivfpq", "sq8", "fp16"]
+
+# Guideline retrieval modes, see retrieval.GuidelineRetriever
+RETRIEVAL_MODES = ["lexical", "vector", "hybrid"]
@@ -0,0 +1,177 @@
+"""
+Lexical, vector and hybrid retrieval of guideline chunks
+"""
+from typing import Any, Dict, List, Optional
+
+import faiss
+import numpy as np
+from langchain.docstore.document import Document
+from langchain.vectorstores import FAISS
+
+from ..utils.rate_limiter import RateLimitScheduler
+from .options import RETRIEVAL_MODES
+
+# Damping constant of reciprocal-rank fusion
+RRF_K = 60
+
+# Candidates taken from each ranking in hybrid mode, per requested result
+HYBRID_DEPTH = 4
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int, rrf_k: int = RRF_K) -> List[int]:
+    """Fuse several rankings of index positions into one
+
+    Every ranking contributes 1 / (rrf_k + rank) to the score of each of its
+    positions, so chunks ranked well by both retrievers come first.
+
+    Args:
+        rankings: Index positions ordered best first, one list per retriever
+        k: Number of fused results
+        rrf_k: Damping constant
+
+    Returns:
+        Fused index positions, best first
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, position in enumerate(ranking):
+            scores[position] = scores.get(position, 0.0) + 1.0 / (rrf_k + rank + 1)
+    return sorted(scores, key=lambda position: -scores[position])[:k]
+
+
+class GuidelineRetriever:
+    """Retrieves guideline chunks from a vector store
+
+    In "lexical" mode chunks are ranked with BM25 over the chunk store's
+    full-text table, entirely locally and without embedding the query. In
+    "vector" mode the query is embedded and searched in the FAISS index.
+    "hybrid" runs both and fuses the rankings with reciprocal-rank fusion.
+    """
+
+    def __init__(self, vectorstore: FAISS, mode: str = "vector", embeddings: Any = None,
+                 scheduler: Optional[RateLimitScheduler] = None):
+        """Initialize the retriever
+
+        Args:
+            vectorstore: Vector store loaded with load_vectorstore
+            mode: One of RETRIEVAL_MODES
+            embeddings: Embeddings used for query vectors (vector and hybrid modes)
+            scheduler: Scheduler for embedding calls; calls are made directly when None
+        """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}. Choose from {', '.join(RETRIEVAL_MODES)}")
+
+        self.vectorstore = vectorstore
+        self.mode = mode
+        self.embeddings = embeddings
+        self.scheduler = scheduler
+        self.chunk_store = getattr(vectorstore.docstore, "store", None)
+
+        if mode != "vector" and (self.chunk_store is None or not self.chunk_store.has_lexical_index()):
+            raise ValueError(
+                f"The vector store has no lexical index, which {mode} retrieval needs. "
+                "Add it with convert-store or run the harvest again."
+            )
+        if mode != "lexical" and embeddings is None:
+            raise ValueError(f"Embeddings are required for {mode} retrieval")
+
+    def search(self, query: str, k: int) -> List[Document]:
+        """Retrieve the chunks most relevant to a query
+
+        Args:
+            query: Query text
+            k: Number of chunks
+
+        Returns:
+            Documents, best first
+        """
+        if self.mode == "lexical":
+            return self._documents(self.chunk_store.lexical_search(query, k))
+        if self.scheduler is not None:
+            vector = self.scheduler.run(self.embeddings.embed_query, query, prompt_text=query)
+        else:
+            vector = self.embeddings.embed_query(query)
+        return self._documents(self._rank(query, self._search_vectors([vector], k)[0], k))
+
+    async def asearch(self, query: str, k: int) -> List[Document]:
+        """Retrieve the chunks most relevant to a query, awaiting the query embedding
+
+        Args:
+            query: Query text
+            k: Number of chunks
+
+        Returns:
+            Documents, best first
+        """
+        if self.mode == "lexical":
+            return self._documents(self.chunk_store.lexical_search(query, k))
+        if self.scheduler is not None:
+            vector = await self.scheduler.arun(self.embeddings.aembed_query, query, prompt_text=query)
+        else:
+            vector = await self.embeddings.aembed_query(query)
+        return self._documents(self._rank(query, self._search_vectors([vector], k)[0], k))
+
+    def search_many(self, queries: List[str], k: int, batch_size: int = 100) -> List[List[Document]]:
+        """Retrieve chunks for many queries at once
+
+        Query embeddings are requested in batches and searched in the FAISS
+        index with one stacked query matrix.
+
+        Args:
+            queries: Query texts
+            k: Number of chunks per query
+            batch_size: Maximum number of queries per embedding call
+
+        Returns:
+            Documents for each query, best first
+        """
+        if self.mode == "lexical":
+            return [self._documents(self.chunk_store.lexical_search(query, k)) for query in queries]
+
+        vectors = []
+        for start in range(0, len(queries), batch_size):
+            batch = queries[start:start + batch_size]
+            if self.scheduler is not None:
+                vectors.extend(self.scheduler.run(self.embeddings.embed_documents, batch, prompt_text="".join(batch)))
+            else:
+                vectors.extend(self.embeddings.embed_documents(batch))
+
+        rankings = self._search_vectors(vectors, k)
+        return [self._documents(self._rank(query, ranking, k)) for query, ranking in zip(queries, rankings)]
+
+    def _search_vectors(self, vectors: List[List[float]], k: int) -> List[List[int]]:
+        """Search the FAISS index for query vectors
+
+        Args:
+            vectors: Query embeddings
+            k: Number of results per query
+
+        Returns:
+            Index positions for each query, best first
+        """
+        depth = k * HYBRID_DEPTH if self.mode == "hybrid" else k
+        matrix = np.array(vectors, dtype=np.float32)
+        if getattr(self.vectorstore, "_normalize_L2", False):
+            faiss.normalize_L2(matrix)
+        _, indices = self.vectorstore.index.search(matrix, depth)
+        return [[int(i) for i in row if i != -1] for row in indices]
+
+    def _rank(self, query: str, vector_ranking: List[int], k: int) -> List[int]:
+        """Combine a vector ranking with the lexical ranking in hybrid mode"""
+        if self.mode != "hybrid":
+            return vector_ranking[:k]
+        lexical_ranking = self.chunk_store.lexical_search(query, k * HYBRID_DEPTH)
+        return reciprocal_rank_fusion([vector_ranking, lexical_ranking], k)
+
+    def _documents(self, positions: List[int]) -> List[Document]:
+        """Look up the chunks at index positions, skipping unknown ones"""
+        if self.chunk_store is not None:
+            return [doc for doc in self.chunk_store.documents_at(positions) if doc is not None]
+
+        docs = []
+        for position in positions:
+            chunk_id = self.vectorstore.index_to_docstore_id.get(position)
+            doc = self.vectorstore.docstore.search(chunk_id) if chunk_id is not None else None
+            if isinstance(doc, Document):  # The docstore returns an error string for unknown IDs
+                docs.append(doc)
+        return docs
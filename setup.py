@@ -13,6 +13,7 @@ setup(
         "langchain>=0.0.267",
         "openai>=0.27.0",
         "faiss-cpu>=1.7.4",
+        "numpy>=1.21.0",
         "beautifulsoup4>=4.12.0",
         "requests>=2.28.0",
     ],
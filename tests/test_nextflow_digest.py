@@ -0,0 +1,25 @@
+"""
+Tests for the structural digest of Nextflow files
+"""
+from nfcore_validator.validator.nextflow_digest import parse_nextflow
+
+
+def test_includes_spanning_several_lines_are_kept():
+    code = """
+include { FASTQC } from '../modules/nf-core/fastqc/main'
+include {
+    MULTIQC;
+    MULTIQC as MULTIQC_RAW
+} from '../modules/nf-core/multiqc/main'
+include { paramsSummaryMap
+        } from 'plugin/nf-validation'
+
+workflow PIPELINE {
+    FASTQC(ch_reads)
+}
+"""
+    assert parse_nextflow(code)["includes"] == [
+        "include { FASTQC } from '../modules/nf-core/fastqc/main'",
+        "include { MULTIQC; MULTIQC as MULTIQC_RAW } from '../modules/nf-core/multiqc/main'",
+        "include { paramsSummaryMap } from 'plugin/nf-validation'"
+    ]
@@ -0,0 +1,119 @@
+"""
+Tests for streaming scans with PipelineScanner
+"""
+import json
+import asyncio
+
+from nfcore_validator.scanner.pipeline_scanner import PipelineScanner
+from nfcore_validator.utils.rate_limiter import RateLimitScheduler
+
+
+class SlowValidator:
+    """Validator stand-in whose LLM call is a short sleep through a scheduler"""
+
+    static_only = False
+    cache = None
+
+    def __init__(self):
+        self.scheduler = RateLimitScheduler(max_concurrency=4)
+
+    def prefetch_guidelines(self, components):
+        return {}
+
+    async def avalidate_component(self, component, docs=None, progress=None):
+        if progress is not None:
+            progress("retrieved", component, chunks=0)
+        await self.scheduler.arun(asyncio.sleep, 0.05)
+        if progress is not None:
+            progress("llm_done", component, cached=False, prompt_tokens=0)
+        return {"path": component, "requirements": [{"id": "r1", "status": "passed"}]}
+
+
+def make_pipeline(root, modules=8):
+    for i in range(modules):
+        module_dir = root / "modules" / "local" / f"m{i}"
+        module_dir.mkdir(parents=True)
+        (module_dir / "main.nf").write_text(f"process M{i} {{}}\n")
+    (root / "main.nf").write_text("workflow {}\n")
+    return str(root)
+
+
+def test_ascan_iter_can_scan_again_after_stopping_early(tmp_path):
+    validator = SlowValidator()
+    scanner = PipelineScanner(make_pipeline(tmp_path), validator=validator)
+
+    async def scan_twice():
+        scan = scanner.ascan_iter(max_workers=4)
+        async for _ in scan:
+            break
+        await scan.aclose()
+
+        results = []
+        async for result in scanner.ascan_iter(max_workers=4):
+            results.append(result)
+        return results
+
+    results = asyncio.run(asyncio.wait_for(scan_twice(), timeout=30))
+    assert len(results) == 9
+    assert validator.scheduler.in_flight == 0
+
+
+def test_incremental_scan_refreshes_static_rules_of_reused_results(tmp_path):
+    from nfcore_validator.validator.llm_validator import NfCoreValidator
+
+    pipeline = tmp_path / "pipeline"
+    pipeline.mkdir()
+    make_pipeline(pipeline, modules=1)
+    report = str(tmp_path / "report.json")
+    scanner = PipelineScanner(str(pipeline), validator=NfCoreValidator(static_only=True))
+
+    def meta_yml_status():
+        with open(report) as f:
+            components = json.load(f)["components"]
+        module = next(c for c in components if c["component_type"] == "module")
+        return next(r["status"] for r in module["requirements"] if r["id"] == "module_meta_yml")
+
+    scanner.generate_report(report, incremental=True)
+    assert meta_yml_status() == "failed"
+
+    (pipeline / "modules" / "local" / "m0" / "meta.yml").write_text("name: m0\n")
+    scanner.generate_report(report, incremental=True)
+    assert meta_yml_status() == "passed"
+
+
+def test_full_scan_is_not_reported_as_incremental(tmp_path, capsys):
+    from nfcore_validator.validator.llm_validator import NfCoreValidator
+
+    pipeline = tmp_path / "pipeline"
+    pipeline.mkdir()
+    make_pipeline(pipeline, modules=1)
+    report = str(tmp_path / "report.json")
+    scanner = PipelineScanner(str(pipeline), validator=NfCoreValidator(static_only=True))
+
+    scanner.generate_report(report)
+    with open(report) as f:
+        assert "incremental" not in json.load(f)["summary"]
+    assert "Incremental scan" not in capsys.readouterr().out
+
+    scanner.generate_report(report, incremental=True)
+    with open(report) as f:
+        assert json.load(f)["summary"]["incremental"] == {"revalidated": 0, "reused": 2}
+    assert "Incremental scan" in capsys.readouterr().out
+
+
+def test_module_catalog_of_another_validator_is_ignored(tmp_path):
+    from nfcore_validator.validator.llm_validator import NfCoreValidator
+    from nfcore_validator.validator.module_catalog import ModuleCatalog
+
+    pipeline = tmp_path / "pipeline"
+    pipeline.mkdir()
+    make_pipeline(pipeline, modules=1)
+    validator = NfCoreValidator(static_only=True)
+
+    matching = PipelineScanner(str(pipeline), validator=validator,
+                               module_catalog=ModuleCatalog(validated_with="static"))
+    assert matching.catalog is not None
+
+    other = PipelineScanner(str(pipeline), validator=validator,
+                            module_catalog=ModuleCatalog(validated_with="gpt-4o"))
+    assert other.catalog is None
@@ -0,0 +1,38 @@
+"""
+Tests for the rate-limit-aware scheduler
+"""
+import asyncio
+
+from nfcore_validator.utils.rate_limiter import RateLimitScheduler
+
+
+def test_cancelled_arun_releases_its_slot():
+    scheduler = RateLimitScheduler()
+
+    async def hang():
+        await asyncio.sleep(60)
+
+    async def cancel_calls():
+        tasks = [asyncio.ensure_future(scheduler.arun(hang)) for _ in range(4)]
+        await asyncio.sleep(0.1)
+        assert scheduler.in_flight == 4
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(cancel_calls())
+    assert scheduler.in_flight == 0
+
+
+def test_interrupted_run_releases_its_slot():
+    scheduler = RateLimitScheduler()
+
+    def interrupt():
+        raise KeyboardInterrupt
+
+    try:
+        scheduler.run(interrupt)
+    except KeyboardInterrupt:
+        pass
+    assert scheduler.in_flight == 0
+    assert scheduler.run(lambda: "done") == "done"